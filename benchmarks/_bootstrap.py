@@ -0,0 +1,46 @@
+"""
+Shared setup for the scripts in this directory.
+
+Benchmarks run against a throwaway test database (created and migrated like
+``manage.py test`` does) unless ``--use-configured-db`` is passed, in which
+case they read whatever ``DATABASES['default']`` points at.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmanager.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+
+@contextmanager
+def benchmark_database(use_configured=False):
+    """Yield inside a freshly migrated test database (or the configured one)."""
+    if use_configured:
+        yield
+        return
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def best_of(func, repeat=5, number=1):
+    """Return the best wall-clock time in seconds for ``number`` calls of ``func``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
@@ -0,0 +1,149 @@
+"""
+Slow clients against sync WSGI workers and the ASGI server with async views.
+
+Each client requests a page of ``GET /api/tasks/`` and then reads the
+response slowly, over about ``--delay`` seconds, the way a client on a slow
+link would. Tasks are seeded with large descriptions so a page is bigger
+than the kernel socket buffers (up to 4 MB on Linux). A sync worker is then
+stuck writing to one client until it has read nearly everything, while the
+ASGI worker keeps serving other connections. Both
+servers get the same number of worker processes and read from a temporary
+SQLite database.
+
+    python benchmarks/concurrency.py --clients 20 --delay 1 --workers 1
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DATABASE_DIR = tempfile.mkdtemp(prefix='tasks-bench-')
+os.environ['DATABASE_URL'] = f'sqlite:///{Path(DATABASE_DIR) / "db.sqlite3"}'
+os.environ['DEBUG'] = 'True'
+
+from _bootstrap import ROOT  # noqa: E402
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+
+from tasks.models import Task  # noqa: E402
+
+SERVERS = {
+    'sync (gunicorn sync workers)': ['taskmanager.wsgi:application'],
+    'async (gunicorn + uvicorn workers)': [
+        'taskmanager.asgi:application', '--worker-class', 'uvicorn.workers.UvicornWorker',
+    ],
+}
+
+
+def seed(tasks, description_size):
+    call_command('migrate', verbosity=0)
+    user = User.objects.create_user(username='bench', password='bench')
+    Task.objects.bulk_create(
+        Task(name=f'Task {i}', description='x' * description_size, created_by=user)
+        for i in range(tasks)
+    )
+    client = Client()
+    client.force_login(user)
+    return client.cookies['sessionid'].value
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, port, workers, async_views):
+    env = dict(os.environ, TASKS_ASYNC_VIEWS=str(async_views))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *args, '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--timeout', '120', '--log-level', 'warning'],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError('server did not start')
+
+
+async def slow_request(port, session, delay, chunk_size=65536):
+    sock = socket.socket()
+    # A small receive window keeps the server from pushing the whole
+    # response to the client up front.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, chunk_size)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=chunk_size)
+    writer.write(
+        f'GET /api/tasks/ HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        f'Cookie: sessionid={session}\r\nConnection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    length = next(
+        int(line.split(b':', 1)[1])
+        for line in head.split(b'\r\n')
+        if line.lower().startswith(b'content-length:')
+    )
+    received = 0
+    while received < length:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        received += len(chunk)
+        await asyncio.sleep(delay * len(chunk) / length)
+    writer.close()
+    return head.split(b' ', 2)[1] == b'200' and received == length
+
+
+async def run_clients(port, session, clients, delay):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(slow_request(port, session, delay) for _ in range(clients)))
+    return time.perf_counter() - start, sum(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--delay', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--description-size', type=int, default=600_000)
+    args = parser.parse_args()
+
+    session = seed(args.tasks, args.description_size)
+    print(
+        f'{args.clients} clients reading for ~{args.delay}s each, '
+        f'{args.workers} worker process(es)'
+    )
+    for label, server_args in SERVERS.items():
+        port = free_port()
+        process = start_server(server_args, port, args.workers, async_views='uvicorn' in label)
+        try:
+            elapsed, ok = asyncio.run(run_clients(port, session, args.clients, args.delay))
+        finally:
+            process.terminate()
+            process.wait()
+        concurrent = args.clients * args.delay / elapsed
+        print(f'  {label:<36} {elapsed:7.2f} s  {ok}/{args.clients} ok  '
+              f'~{concurrent / args.workers:.1f} concurrent connections per process')
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        shutil.rmtree(DATABASE_DIR, ignore_errors=True)
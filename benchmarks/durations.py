@@ -0,0 +1,93 @@
+"""
+Compare the duration report with computing ``Task.duration`` per instance.
+
+    python benchmarks/durations.py --rows 1000000 --group-by task_type
+"""
+import argparse
+import random
+from collections import defaultdict
+from datetime import timedelta
+
+from _bootstrap import benchmark_database, best_of
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from tasks.analytics import GROUP_BY_CHOICES, duration_report
+from tasks.models import Task
+
+
+def seed(rows, batch_size=10_000):
+    users = User.objects.bulk_create(User(username=f'bench{i}') for i in range(20))
+    task_types = [choice for choice, _ in Task.TaskType.choices]
+    rng = random.Random(0)
+    for offset in range(0, rows, batch_size):
+        # created_at is auto_now_add, so durations are spread via completed_at.
+        now = timezone.now()
+        Task.objects.bulk_create(
+            Task(
+                name='Benchmark task',
+                description='x',
+                task_type=rng.choice(task_types),
+                status=Task.Status.COMPLETED,
+                created_by=rng.choice(users),
+                completed_at=now + timedelta(seconds=rng.expovariate(1 / 86400)),
+            )
+            for _ in range(offset, min(offset + batch_size, rows))
+        )
+
+
+def property_report(group_by):
+    """The same statistics from model instances and ``Task.duration``."""
+    groups = defaultdict(list)
+    attribute = 'created_by_id' if group_by == 'created_by' else group_by
+    for task in Task.objects.filter(completed_at__isnull=False).iterator(chunk_size=10_000):
+        key = None if group_by is None else getattr(task, attribute)
+        groups[key].append(task.duration.total_seconds())
+    report = {}
+    for key, seconds in groups.items():
+        seconds.sort()
+        report[key] = {
+            'count': len(seconds),
+            'mean': sum(seconds) / len(seconds),
+            'p50': seconds[int(0.5 * (len(seconds) - 1))],
+            'p90': seconds[int(0.9 * (len(seconds) - 1))],
+            'p99': seconds[int(0.99 * (len(seconds) - 1))],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--group-by', choices=[c for c in GROUP_BY_CHOICES if c != 'window'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        seed(args.rows)
+        baseline = property_report(args.group_by)
+        report = duration_report(group_by=args.group_by)
+        for group in report['groups']:
+            expected = baseline[group['key']]
+            assert group['count'] == expected['count']
+            assert abs(group['mean'] - expected['mean']) < 1e-3 * max(expected['mean'], 1)
+
+        results = {
+            'Task.duration per instance': best_of(
+                lambda: property_report(args.group_by), args.repeat
+            ),
+            'duration_report': best_of(
+                lambda: duration_report(group_by=args.group_by), args.repeat
+            ),
+        }
+
+    print(f'{args.rows} completed tasks, group_by={args.group_by}')
+    for label, seconds in results.items():
+        print(f'  {label:<30} {seconds * 1000:10.1f} ms')
+    speedup = results['Task.duration per instance'] / results['duration_report']
+    print(f'  speedup: {speedup:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+Replay a mixed read/write workload through the WSGI application.
+
+Requests are built up front from a seeded RNG (the same arguments replay the
+same requests) and sent straight to ``taskmanager.wsgi.application``, so
+every middleware, authentication and the response cache are on the path but
+no network or server is. Users act with DRF tokens. Both the users who act
+and the users whose task lists are read are picked with the same skew the
+seeder uses, so heavy users dominate as they would in production.
+
+Prints (or writes to ``--output``) a JSON report with throughput and
+p50/p95/p99 latency per endpoint; ``--compare`` prints the change against an
+earlier report. Without ``--use-configured-db`` a temporary SQLite database
+is seeded first; with it, run against data from ``manage.py seed_tasks``
+(``assign`` requests modify it):
+
+    python manage.py seed_tasks --tasks 1000000 --users 10000
+    python benchmarks/load.py --use-configured-db --requests 5000 --output before.json
+    python benchmarks/load.py --use-configured-db --requests 5000 --compare before.json
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+USE_CONFIGURED_DB = '--use-configured-db' in sys.argv
+DATABASE_DIR = None
+if not USE_CONFIGURED_DB:
+    DATABASE_DIR = tempfile.mkdtemp(prefix='tasks-load-')
+    os.environ['DATABASE_URL'] = f'sqlite:///{Path(DATABASE_DIR) / "db.sqlite3"}'
+
+from _bootstrap import ROOT  # noqa: E402
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Max, Min  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from taskmanager.wsgi import application  # noqa: E402
+from tasks.models import Task  # noqa: E402
+from tasks.seeding import WORDS, seed_tasks, skew_weights  # noqa: E402
+
+HOST = 'loadtest'
+DEFAULT_MIX = 'list=35,detail=25,assign=10,user_tasks=15,username_tasks=15'
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in PLANNERS:
+            raise argparse.ArgumentTypeError(
+                f'unknown endpoint {name!r}; choose from {", ".join(PLANNERS)}'
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Population:
+    """Seeded users, some of them holding tokens, and the task id range."""
+
+    def __init__(self, prefix, skew, actors, rng):
+        users = list(
+            User.objects.filter(username__startswith=prefix)
+            .order_by('id').values_list('id', 'username')
+        )
+        if not users:
+            sys.exit(f'no users named {prefix}*; run manage.py seed_tasks first')
+        self.users = users
+        self.cum_weights = skew_weights(len(users), skew)
+        bounds = Task.objects.aggregate(low=Min('id'), high=Max('id'))
+        self.task_ids = (bounds['low'] or 0, bounds['high'] or 0)
+
+        self.tokens, self.owned = {}, {}
+        for user_id, _ in dict.fromkeys(self.pick(rng) for _ in range(actors)):
+            self.tokens[user_id] = Token.objects.get_or_create(user_id=user_id)[0].key
+            self.owned[user_id] = list(
+                Task.objects.filter(created_by_id=user_id)
+                .order_by('id').values_list('id', flat=True)[:100]
+            )
+        self.actors = list(self.tokens)
+        self.owners = [user_id for user_id in self.actors if self.owned[user_id]]
+
+    def pick(self, rng):
+        return rng.choices(self.users, cum_weights=self.cum_weights)[0]
+
+
+def plan_list(population, rng):
+    query = rng.choice([
+        '', f'page={rng.randint(2, 10)}', f'status={rng.choice(Task.Status.values)}',
+        f'task_type={rng.choice(Task.TaskType.values)}', f'q={rng.choice(WORDS)}',
+    ])
+    return 'GET', '/api/tasks/', query, None, rng.choice(population.actors)
+
+
+def plan_detail(population, rng):
+    task_id = rng.randint(*population.task_ids)
+    return 'GET', f'/api/tasks/{task_id}/', '', None, rng.choice(population.actors)
+
+
+def plan_assign(population, rng):
+    actor = rng.choice(population.owners)
+    user_ids = sorted({population.pick(rng)[0] for _ in range(rng.randint(1, 3))})
+    body = json.dumps({'user_ids': user_ids}).encode()
+    return 'POST', f'/api/tasks/{rng.choice(population.owned[actor])}/assign/', '', body, actor
+
+
+def plan_user_tasks(population, rng):
+    user_id, _ = population.pick(rng)
+    return 'GET', f'/api/users/{user_id}/tasks/', '', None, rng.choice(population.actors)
+
+
+def plan_username_tasks(population, rng):
+    _, username = population.pick(rng)
+    return 'GET', f'/api/users/{username}/tasks/', '', None, rng.choice(population.actors)
+
+
+PLANNERS = {
+    'list': plan_list,
+    'detail': plan_detail,
+    'assign': plan_assign,
+    'user_tasks': plan_user_tasks,
+    'username_tasks': plan_username_tasks,
+}
+
+
+def plan(population, mix, count, rng):
+    if 'assign' in mix and not population.owners:
+        mix = {name: weight for name, weight in mix.items() if name != 'assign'}
+    names = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    return [(name, *PLANNERS[name](population, rng)) for name in names]
+
+
+def send(request, tokens):
+    """Run one planned request through the WSGI app; return (endpoint, status, seconds)."""
+    name, method, path, query, body, actor = request
+    body = body or b''
+    environ = {
+        'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query, 'SCRIPT_NAME': '',
+        'SERVER_NAME': HOST, 'SERVER_PORT': '443', 'SERVER_PROTOCOL': 'HTTP/1.1', 'HTTP_HOST': HOST,
+        'HTTP_X_FORWARDED_PROTO': 'https', 'HTTP_ACCEPT': 'application/json',
+        'HTTP_AUTHORIZATION': f'Token {tokens[actor]}',
+        'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'https',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    statuses = []
+    start = time.perf_counter()
+    result = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    try:
+        for _ in result:
+            pass
+    finally:
+        result.close()
+    return name, int(statuses[0].split()[0]), time.perf_counter() - start
+
+
+def run(requests, tokens, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(lambda request: send(request, tokens), requests))
+    return results, time.perf_counter() - start
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of a sorted list."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def summarize(timings, statuses, elapsed):
+    ordered = sorted(timings)
+    summary = {
+        'requests': len(ordered),
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput': round(len(ordered) / elapsed, 2),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+    }
+    summary.update({f'p{p}_ms': round(percentile(ordered, p) * 1000, 3) for p in PERCENTILES})
+    return summary
+
+
+def report(results, elapsed, meta):
+    timings, statuses = defaultdict(list), defaultdict(Counter)
+    for name, status, seconds in results:
+        timings[name].append(seconds)
+        statuses[name][status] += 1
+    return {
+        'meta': meta,
+        'total': summarize(
+            [seconds for _, _, seconds in results],
+            sum(statuses.values(), Counter()),
+            elapsed,
+        ),
+        'endpoints': {
+            name: summarize(timings[name], statuses[name], elapsed) for name in sorted(timings)
+        },
+    }
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('-dirty' if dirty else '')
+
+
+def compare(base, current):
+    keys = ('throughput', *(f'p{p}_ms' for p in PERCENTILES))
+    print(f'{"endpoint":<16}' + ''.join(f'{key:>24}' for key in keys), file=sys.stderr)
+    for name, now in [('total', current['total']), *current['endpoints'].items()]:
+        before = base['total'] if name == 'total' else base['endpoints'].get(name)
+        if before is None:
+            continue
+        cells = []
+        for key in keys:
+            change = (now[key] - before[key]) / before[key] * 100 if before[key] else 0
+            cells.append(f'{before[key]:>9.2f} ->{now[key]:>9.2f} {change:+4.0f}%')
+        print(f'{name:<16}' + ''.join(f'{cell:>24}' for cell in cells), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--use-configured-db', action='store_true')
+    parser.add_argument('--tasks', type=int, default=20_000,
+                        help='Tasks to seed in the temporary database.')
+    parser.add_argument('--users', type=int, default=500,
+                        help='Users to seed in the temporary database.')
+    parser.add_argument('--prefix', default='seed', help='Username prefix of the seeded users.')
+    parser.add_argument('--skew', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--actors', type=int, default=50, help='Distinct users sending requests.')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help=f'Endpoint weights (default {DEFAULT_MIX}).')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    parser.add_argument('--compare', help='Earlier JSON report to print changes against.')
+    args = parser.parse_args()
+    mix = args.mix
+
+    if not USE_CONFIGURED_DB:
+        call_command('migrate', verbosity=0)
+        print(f'Seeding {args.tasks} tasks and {args.users} users...', file=sys.stderr)
+        seed_tasks(args.tasks, args.users, seed=args.seed, skew=args.skew, prefix=args.prefix)
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, HOST]
+
+    rng = random.Random(args.seed)
+    population = Population(args.prefix, args.skew, args.actors, rng)
+    warmup = plan(population, mix, args.warmup, rng)
+    requests = plan(population, mix, args.requests, rng)
+
+    run(warmup, population.tokens, args.threads)
+    results, elapsed = run(requests, population.tokens, args.threads)
+
+    result = report(results, elapsed, {
+        'revision': git_revision(),
+        'database': connection.vendor,
+        'tasks': Task.objects.count(),
+        'users': len(population.users),
+        'seed': args.seed,
+        'skew': args.skew,
+        'threads': args.threads,
+        'mix': mix,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+    })
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), result)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        if DATABASE_DIR:
+            shutil.rmtree(DATABASE_DIR, ignore_errors=True)
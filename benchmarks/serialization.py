@@ -0,0 +1,81 @@
+"""
+Compare ``TaskSerializer`` with the fast representation path on one page.
+
+    python benchmarks/serialization.py --page-size 100 --assignees 3
+"""
+import argparse
+
+from _bootstrap import benchmark_database, best_of
+
+from django.contrib.auth.models import User
+from rest_framework.renderers import JSONRenderer
+
+from tasks.api.representations import (
+    assignees_prefetch, fetch_assignees, render_tasks, serialize_tasks, task_rows,
+)
+from tasks.api.serializers import TaskSerializer
+from tasks.models import Task
+
+
+def seed(page_size, assignees):
+    users = User.objects.bulk_create(
+        User(
+            username=f'bench{i}', email=f'bench{i}@example.com',
+            first_name='Bench', last_name=str(i),
+        )
+        for i in range(max(assignees, 1) * 4)
+    )
+    tasks = Task.objects.bulk_create(
+        Task(name=f'Task {i}', description='Benchmark task', created_by=users[i % len(users)])
+        for i in range(page_size)
+    )
+    through = Task.assigned_to.through
+    through.objects.bulk_create(
+        through(task_id=task.id, user_id=users[(i + j) % len(users)].id)
+        for i, task in enumerate(tasks)
+        for j in range(assignees)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--assignees', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    renderer = JSONRenderer()
+    with benchmark_database():
+        seed(args.page_size, args.assignees)
+
+        queryset = Task.objects.select_related('created_by').prefetch_related(assignees_prefetch())
+        instances = list(queryset)
+        rows = list(task_rows(Task.objects.all()))
+        assignees = fetch_assignees([row['id'] for row in rows])
+        assert renderer.render(TaskSerializer(instances, many=True).data) == renderer.render(
+            render_tasks(rows, assignees)
+        )
+
+        results = {
+            'serializer (serialize only)': best_of(
+                lambda: TaskSerializer(instances, many=True).data, args.repeat),
+            'fast path (serialize only)': best_of(
+                lambda: render_tasks(rows, assignees), args.repeat),
+            'serializer (queries + serialize + render)': best_of(
+                lambda: renderer.render(TaskSerializer(list(queryset.all()), many=True).data),
+                args.repeat),
+            'fast path (queries + serialize + render)': best_of(
+                lambda: renderer.render(serialize_tasks(task_rows(Task.objects.all()))),
+                args.repeat),
+        }
+
+    print(f'{args.page_size} tasks, {args.assignees} assignees each')
+    for label, seconds in results.items():
+        print(f'  {label:<45} {seconds * 1000:8.2f} ms')
+    for kind in ('serialize only', 'queries + serialize + render'):
+        speedup = results[f'serializer ({kind})'] / results[f'fast path ({kind})']
+        print(f'  speedup ({kind}): {speedup:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
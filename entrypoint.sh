@@ -4,5 +4,19 @@ set -euo pipefail
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput || true
 
-exec gunicorn taskmanager.wsgi:application --bind 0.0.0.0:8080 --workers ${WEB_CONCURRENCY:-2} --timeout 60
+# Metrics of every worker are written here and merged by /metrics.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# SERVER_MODE=asgi runs uvicorn workers under gunicorn and serves the task
+# read endpoints with native async views; the default is sync WSGI workers.
+# Event streams (ASGI only) are woken by writes from every worker (tasks.events).
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    export TASKS_ASYNC_VIEWS=True
+    export TASKS_EVENT_BACKEND="${TASKS_EVENT_BACKEND:-database}"
+    exec gunicorn taskmanager.asgi:application --worker-class uvicorn.workers.UvicornWorker \
+        --bind 0.0.0.0:8080 --workers ${WEB_CONCURRENCY:-2} --timeout 60
+fi
 
+exec gunicorn taskmanager.wsgi:application --bind 0.0.0.0:8080 --workers ${WEB_CONCURRENCY:-2} --timeout 60
@@ -0,0 +1,9 @@
+"""Gunicorn hooks; picked up from the working directory in both server modes."""
+import os
+
+
+def child_exit(server, worker):
+    # Drop the live-process metrics files of workers that exited.
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -60,12 +60,14 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     'drf_yasg',
     'tasks',
 ]
 
 MIDDLEWARE = [
+    'tasks.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -101,13 +103,19 @@ WSGI_APPLICATION = 'taskmanager.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Serve the task read endpoints with native async views (tasks.api.async_views).
+# entrypoint.sh turns this on when it starts the ASGI server.
+TASKS_ASYNC_VIEWS = os.environ.get('TASKS_ASYNC_VIEWS', 'False') == 'True'
+
 # Use PostgreSQL on Fly.io, SQLite locally
 if os.environ.get('DATABASE_URL'):
     # Production: Use PostgreSQL from Fly.io
     DATABASES = {
         'default': dj_database_url.config(
             default=os.environ.get('DATABASE_URL'),
-            conn_max_age=600,
+            # Async views run their queries in per-request threads, which would
+            # each keep a persistent connection open.
+            conn_max_age=0 if TASKS_ASYNC_VIEWS else 600,
             conn_health_checks=True,
         )
     }
@@ -119,6 +127,83 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+    # The task list indexes carry updated_at as an INCLUDE column for
+    # PostgreSQL; SQLite builds them without it, which is all models.W040 says.
+    SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared backend
+# (e.g. Redis or memcached) so all workers share cached task lists.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'taskmanager'),
+    }
+}
+# Whether every worker sees the same cache. Caches that must agree across
+# processes are only turned on by default when they do.
+CACHE_IS_SHARED = CACHE_BACKEND not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Seconds a cached per-user task list response is kept; 0 disables the cache.
+# Writes invalidate it through counters kept in CACHES, which other processes
+# (more workers, management commands) only reach when the cache is shared.
+TASKS_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get('TASKS_RESPONSE_CACHE_TIMEOUT', 300 if CACHE_IS_SHARED else 0)
+)
+
+# Admin changelists show the planner's row estimate instead of COUNT(*) above this size.
+TASKS_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get('TASKS_ESTIMATED_COUNT_THRESHOLD', 10000))
+
+# manage.py archive_tasks moves tasks completed more than this many days ago to
+# the archive table; ?include_archived=true reads them back.
+TASKS_ARCHIVE_AFTER_DAYS = int(os.environ.get('TASKS_ARCHIVE_AFTER_DAYS', 90))
+
+# Verified API credentials and session users are remembered per process for this
+# many seconds (0, the default, disables), up to TASKS_AUTH_CACHE_SIZE entries.
+# Revocations reach other processes through CACHES, so only enable it with a
+# shared CACHE_BACKEND; otherwise they take up to this long.
+TASKS_AUTH_CACHE_TIMEOUT = int(os.environ.get('TASKS_AUTH_CACHE_TIMEOUT', 0))
+TASKS_AUTH_CACHE_SIZE = int(os.environ.get('TASKS_AUTH_CACHE_SIZE', 10000))
+
+# /api/tasks/changes/ returns at most TASKS_CHANGE_FEED_BATCH_SIZE log entries
+# per request and waits this many seconds for a gap in the sequence to fill
+# before passing it. manage.py compact_task_changes drops older entries.
+TASKS_CHANGE_FEED_BATCH_SIZE = int(os.environ.get('TASKS_CHANGE_FEED_BATCH_SIZE', 500))
+TASKS_CHANGE_FEED_SETTLE_SECONDS = int(os.environ.get('TASKS_CHANGE_FEED_SETTLE_SECONDS', 10))
+TASKS_CHANGE_LOG_RETENTION_DAYS = int(os.environ.get('TASKS_CHANGE_LOG_RETENTION_DAYS', 30))
+
+# /api/tasks/events/ streams are woken by the "local" backend (writes in this
+# process) or the "database" one, which also polls the change log every
+# TASKS_EVENT_POLL_SECONDS to pick up writes from other processes. Streams send
+# a keepalive after TASKS_EVENT_STREAM_HEARTBEAT_SECONDS without events and end
+# after TASKS_EVENT_STREAM_MAX_SECONDS; clients reconnect with Last-Event-ID.
+TASKS_EVENT_BACKEND = os.environ.get('TASKS_EVENT_BACKEND', 'local')
+TASKS_EVENT_POLL_SECONDS = int(os.environ.get('TASKS_EVENT_POLL_SECONDS', 1))
+TASKS_EVENT_STREAM_HEARTBEAT_SECONDS = int(
+    os.environ.get('TASKS_EVENT_STREAM_HEARTBEAT_SECONDS', 15)
+)
+TASKS_EVENT_STREAM_MAX_SECONDS = int(os.environ.get('TASKS_EVENT_STREAM_MAX_SECONDS', 300))
+
+AUTHENTICATION_BACKENDS = ['tasks.utils.authentication.CachedModelBackend']
+
+# With a shared cache, sessions are read from it and only written through to the
+# database. A per-process cache would keep a logged-out session valid on the
+# other workers, so they stay in the database otherwise.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cached_db' if CACHE_IS_SHARED
+    else 'django.contrib.sessions.backends.db'
+)
+
+# Server-Timing headers and per-endpoint histograms at /metrics. Set
+# TASKS_METRICS_TOKEN to require "Authorization: Bearer <token>" for scrapes;
+# without it, only staff sessions can read /metrics unless DEBUG is on.
+TASKS_INSTRUMENTATION = os.environ.get('TASKS_INSTRUMENTATION', 'True') == 'True'
+TASKS_METRICS_TOKEN = os.environ.get('TASKS_METRICS_TOKEN', '')
 
 
 # Password validation
@@ -179,16 +264,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'tasks.utils.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
+        'tasks.utils.authentication.CachedBasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.api.renderers.InstrumentedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'UNAUTHENTICATED_USER': None,
     'EXCEPTION_HANDLER': 'tasks.utils.exceptions.custom_exception_handler',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'tasks.api.pagination.TaskPagination',
     'PAGE_SIZE': 10,
 }
 
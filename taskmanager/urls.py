@@ -22,6 +22,9 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from tasks.api.async_views import task_events_view
+from tasks.instrumentation import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Task Manager API",
@@ -34,12 +37,16 @@ schema_view = get_schema_view(
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    # Ahead of tasks.urls, where the task detail route would take "events"
+    # for a task id.
+    path('api/tasks/events/', task_events_view, name='task-events'),
     path('api/', include('tasks.urls')),
     # Explicit auth routes using admin login template to avoid missing templates
     path('accounts/login/', LoginView.as_view(template_name='admin/login.html'), name='login'),
     path('accounts/logout/', LogoutView.as_view(next_page='/swagger/'), name='logout'),
     path('accounts/', include('django.contrib.auth.urls')),
     path('api-auth/', include('rest_framework.urls')),
+    path('metrics', metrics_view, name='metrics'),
 
     # Swagger URLs
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
@@ -0,0 +1,154 @@
+"""
+Completion-time analytics.
+
+``Task.duration`` needs a model instance per task. Reports here instead let
+the database compute ``completed_at - created_at`` in seconds, stream that
+single float column (plus a grouping key) in batches, and aggregate it with
+NumPy: histograms and sums are accumulated per batch, and only the float64
+durations (8 bytes per task) are kept for exact percentiles.
+"""
+from itertools import islice
+
+import numpy as np
+from django.db import NotSupportedError
+from django.db.models import F, FloatField, Func
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from .models import Task
+
+GROUP_BY_CHOICES = ('task_type', 'created_by', 'window')
+WINDOW_FUNCTIONS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+PERCENTILES = (50, 90, 99)
+DEFAULT_BATCH_SIZE = 50_000
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+# Upper edges of the histogram buckets, in seconds; the last bucket is open.
+HISTOGRAM_EDGES = (
+    0, MINUTE, 5 * MINUTE, 15 * MINUTE, HOUR, 4 * HOUR, DAY, 3 * DAY, 7 * DAY,
+    14 * DAY, 30 * DAY, float('inf'),
+)
+
+
+class DurationSeconds(Func):
+    """``end - start`` in seconds as a float, computed by the database."""
+    output_field = FloatField()
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def _compile_args(self, compiler):
+        end, end_params = compiler.compile(self.source_expressions[0])
+        start, start_params = compiler.compile(self.source_expressions[1])
+        return end, start, (*end_params, *start_params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f'DurationSeconds is not implemented for {connection.vendor}')
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        end, start, params = self._compile_args(compiler)
+        return f'((julianday({end}) - julianday({start})) * 86400.0)', params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        end, start, params = self._compile_args(compiler)
+        return f'EXTRACT(EPOCH FROM ({end} - {start}))::double precision', params
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        end, start, params = self._compile_args(compiler)
+        return f'(TIMESTAMPDIFF(MICROSECOND, {start}, {end}) / 1000000.0)', params
+
+
+class _GroupAccumulator:
+    """Running aggregates for one group; durations are kept as float64 chunks."""
+
+    def __init__(self):
+        self.chunks = []
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.chunks.append(seconds)
+        self.histogram += np.histogram(seconds, bins=HISTOGRAM_EDGES)[0]
+        self.total += float(seconds.sum())
+
+    def result(self, key):
+        seconds = np.concatenate(self.chunks)
+        percentiles = np.percentile(seconds, PERCENTILES)
+        return {
+            'key': key,
+            'count': int(seconds.size),
+            'mean': self.total / seconds.size,
+            'min': float(seconds.min()),
+            'max': float(seconds.max()),
+            **{f'p{p}': float(value) for p, value in zip(PERCENTILES, percentiles)},
+            'histogram': self.histogram.tolist(),
+        }
+
+
+def _group_expression(group_by, window):
+    if group_by == 'task_type':
+        return F('task_type')
+    if group_by == 'created_by':
+        return F('created_by_id')
+    if group_by == 'window':
+        return WINDOW_FUNCTIONS[window]('completed_at')
+    return None
+
+
+def duration_report(queryset=None, group_by=None, window='day', batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Completion-time statistics for the completed tasks in ``queryset``.
+
+    ``group_by`` is ``None`` or one of ``GROUP_BY_CHOICES``; ``window`` picks
+    the completion-time bucket (day/week/month) when grouping by window.
+    """
+    if group_by is not None and group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f'group_by must be one of {GROUP_BY_CHOICES}')
+    if group_by == 'window' and window not in WINDOW_FUNCTIONS:
+        raise ValueError(f'window must be one of {tuple(WINDOW_FUNCTIONS)}')
+
+    queryset = Task.objects.all() if queryset is None else queryset
+    queryset = (
+        queryset.filter(completed_at__isnull=False)
+        .select_related(None)
+        .prefetch_related(None)
+        .order_by()
+        .annotate(seconds=DurationSeconds('completed_at', 'created_at'))
+    )
+    group_expression = _group_expression(group_by, window)
+    if group_expression is not None:
+        queryset = queryset.annotate(group_key=group_expression)
+        rows = queryset.values_list('seconds', 'group_key')
+    else:
+        rows = queryset.values_list('seconds', flat=True)
+
+    groups = {}
+    iterator = rows.iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            break
+        if group_expression is None:
+            groups.setdefault(None, _GroupAccumulator()).add(np.asarray(batch, dtype=np.float64))
+            continue
+        seconds = np.fromiter((row[0] for row in batch), dtype=np.float64, count=len(batch))
+        keys = [row[1] for row in batch]
+        index = {}
+        inverse = np.fromiter(
+            (index.setdefault(key, len(index)) for key in keys), dtype=np.int64, count=len(keys)
+        )
+        for key, position in index.items():
+            groups.setdefault(key, _GroupAccumulator()).add(seconds[inverse == position])
+
+    results = [accumulator.result(key) for key, accumulator in groups.items()]
+    results.sort(key=lambda item: (item['key'] is None, str(item['key'])))
+    for item in results:
+        if hasattr(item['key'], 'isoformat'):
+            item['key'] = item['key'].isoformat()
+    return {
+        'group_by': group_by,
+        'window': window if group_by == 'window' else None,
+        'unit': 'seconds',
+        'percentiles': list(PERCENTILES),
+        'histogram_edges': [edge if edge != float('inf') else None for edge in HISTOGRAM_EDGES],
+        'groups': results,
+    }
@@ -0,0 +1,259 @@
+"""
+Native async read endpoints for ASGI deployments.
+
+Under ASGI every sync view runs in a worker thread, so a slow client holds
+one for the whole request. With ``TASKS_ASYNC_VIEWS`` enabled,
+``tasks.urls`` routes ``GET``/``HEAD`` on the task read paths here instead.
+Task rows are read with the async ORM, the response is built with the same
+representation, pagination, ETag and cache helpers as the sync views, and
+the event loop keeps serving other connections while a client is slow.
+Every other method on those URLs still goes to the original sync view.
+
+The DRF view classes are reused for everything that is not a query of task
+rows: authentication, permission and throttle checks, ``get_queryset``
+filters, content negotiation, error envelopes and rendering. Those run in a
+thread through ``sync_to_async``. The views' object permissions allow every
+safe method, so reads do not need to load the object to check them.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
+from django.urls import URLPattern
+from rest_framework import serializers, status
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.response import Response
+
+from ..cache import acached_list_response
+from ..changes import latest_cursor
+from ..events import event_stream
+from ..export import aiter_task_records, ajson_array_chunks
+from ..services import bulk_batch_size
+from ..utils.exceptions import format_error_response
+from .conditional import aconditional_detail_response, aconditional_list_response, alist_aggregate
+from .pagination import KEYSET_ORDERING
+from .representations import aserialize_tasks, task_rows
+from .serializers import UserSerializer
+from .views import TaskViewSet, UserNameTaskList, UserTaskViewSet, parse_count, parse_flag
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _initial(view_class, action, request, kwargs):
+    """Instantiate the DRF view for ``request`` and run its checks."""
+    view = view_class()
+    if action is not None:
+        view.action_map = {'get': action, 'head': action}
+    view.args, view.kwargs = (), kwargs
+    view.request = view.initialize_request(request, **kwargs)
+    view.headers = view.default_response_headers
+    try:
+        view.initial(view.request, **kwargs)
+    except Exception as exc:
+        return view, _finalize(view, view.handle_exception(exc))
+    return view, None
+
+
+def _finalize(view, response):
+    response = view.finalize_response(view.request, response)
+    return response.render() if hasattr(response, 'render') else response
+
+
+async def _respond(view_class, action, handler, request, kwargs):
+    view, error = await sync_to_async(_initial)(view_class, action, request, kwargs)
+    if error is not None:
+        return error
+    try:
+        response = await handler(view)
+    except Exception as exc:
+        response = await sync_to_async(view.handle_exception)(exc)
+    return await sync_to_async(_finalize)(view, response)
+
+
+async def _page_response(view, rows):
+    page = await view.paginator.apaginate_queryset(rows, view.request, view=view)
+    if page is not None:
+        return view.paginator.get_paginated_response(
+            await aserialize_tasks(page, view.field_selection, rows.model)
+        )
+    return Response(await aserialize_tasks(rows, view.field_selection, rows.model))
+
+
+async def _get_task(queryset, pk):
+    try:
+        task = await queryset.filter(pk=pk).afirst()
+    except (TypeError, ValueError, ValidationError):
+        task = None
+    if task is None:
+        raise Http404
+    return task
+
+
+async def task_list(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    return await aconditional_list_response(
+        view.request, queryset,
+        lambda: _page_response(view, task_rows(queryset, view.field_selection)),
+    )
+
+
+async def _detail_response(view, queryset, pk):
+    task = await _get_task(task_rows(queryset, view.field_selection), pk)
+    return Response((await aserialize_tasks([task], view.field_selection, queryset.model))[0])
+
+
+async def task_detail(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    pk = view.kwargs['pk']
+    return await aconditional_detail_response(
+        view.request, queryset, pk, lambda: _detail_response(view, queryset, pk)
+    )
+
+
+async def task_assignments(view):
+    task = await _get_task(view.filter_queryset(view.get_queryset()), view.kwargs['pk'])
+    return Response(UserSerializer(task.assigned_to.all(), many=True).data)
+
+
+async def user_task_list(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    return await aconditional_list_response(
+        view.request, queryset,
+        lambda: acached_list_response(
+            view.request, 'user-tasks', view.kwargs['user_id'],
+            lambda: _page_response(view, task_rows(queryset, view.field_selection)),
+        ),
+    )
+
+
+async def user_task_detail(view):
+    queryset = view.filter_queryset(view.get_queryset())
+    return await _detail_response(view, queryset, view.kwargs['pk'])
+
+
+async def _username_stream(view, queryset, username):
+    records = aiter_task_records(
+        queryset, chunk_size=bulk_batch_size(), selection=view.field_selection,
+        ordering=KEYSET_ORDERING,
+    )
+    first = await anext(records, None)
+    if first is None and not await User.objects.filter(username=username).aexists():
+        return UserNameTaskList.user_not_found(username)
+
+    async def all_records():
+        if first is not None:
+            yield first
+        async for record in records:
+            yield record
+
+    return StreamingHttpResponse(ajson_array_chunks(all_records()), content_type='application/json')
+
+
+async def username_task_list(view):
+    username = view.kwargs['username']
+    queryset = view.get_queryset()
+    if parse_flag(view.request, 'stream'):
+        return await _username_stream(view, queryset, username)
+    aggregate = await alist_aggregate(queryset, user_id=Max('assigned_to__id'))
+
+    async def build():
+        user_id = aggregate['user_id']
+        if user_id is None:
+            users = User.objects.filter(username=username)
+            user_id = await users.values_list('id', flat=True).afirst()
+            if user_id is None:
+                return UserNameTaskList.user_not_found(username)
+        return await acached_list_response(
+            view.request, 'user-tasks-by-username', user_id,
+            lambda: _page_response(view, task_rows(queryset, view.field_selection)),
+        )
+
+    return await aconditional_list_response(view.request, queryset, build, aggregate)
+
+
+async def task_events(view):
+    request = view.request
+    if request.method != 'GET':
+        raise MethodNotAllowed(request.method)
+    if not isinstance(request._request, ASGIRequest):
+        # Under WSGI, Django reads an async stream to the end before
+        # sending any of it, with a worker held all the while.
+        return format_error_response(
+            'Live updates are only served by the ASGI app (SERVER_MODE=asgi); '
+            'use /api/tasks/changes/ instead',
+            code='asgi_required',
+            http_status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    queryset = view.filter_queryset(view.get_queryset())
+    assigned_to = parse_count(request, 'assigned_to', None)
+    if assigned_to is not None:
+        queryset = queryset.filter(assigned_to__id=assigned_to)
+    last_event_id = request.headers.get('Last-Event-ID', '').strip()
+    if last_event_id:
+        if not last_event_id.isdigit():
+            raise serializers.ValidationError(
+                {'Last-Event-ID': ['Must be a non-negative integer.']}
+            )
+        cursor = int(last_event_id)
+    else:
+        cursor = parse_count(request, 'since', None)
+    if cursor is None:
+        cursor = await sync_to_async(latest_cursor)()
+    response = StreamingHttpResponse(
+        event_stream(cursor, view.field_selection, queryset), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Keep reverse proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def task_events_view(request):
+    """
+    ``GET /api/tasks/events/``: always async, whatever ``TASKS_ASYNC_VIEWS``
+    says, since a stream stays open for minutes; see ``tasks.events``. Only
+    ASGI requests get a stream.
+    """
+    return await _respond(TaskViewSet, 'events', task_events, request, {})
+
+
+task_events_view.csrf_exempt = True
+
+
+# URL name -> (DRF view class, viewset action, async handler)
+ASYNC_READ_ROUTES = {
+    'task-list': (TaskViewSet, 'list', task_list),
+    'task-detail': (TaskViewSet, 'retrieve', task_detail),
+    'task-assignments': (TaskViewSet, 'assignments', task_assignments),
+    'user-tasks-list': (UserTaskViewSet, 'list', user_task_list),
+    'user-tasks-detail': (UserTaskViewSet, 'retrieve', user_task_detail),
+    'user-tasks-by-username': (UserNameTaskList, None, username_task_list),
+}
+
+
+def async_read_view(view_class, action, handler, fallback):
+    """Serve reads with ``handler`` and hand every other method to ``fallback``."""
+    async def view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await _respond(view_class, action, handler, request, kwargs)
+        return await sync_to_async(fallback)(request, *args, **kwargs)
+
+    # Like the DRF views it wraps: CSRF is enforced by SessionAuthentication.
+    view.csrf_exempt = True
+    return view
+
+
+def async_read_urlpatterns(urlpatterns):
+    """Return ``urlpatterns`` with the routes in ``ASYNC_READ_ROUTES`` made async."""
+    patterns = []
+    for pattern in urlpatterns:
+        route = ASYNC_READ_ROUTES.get(getattr(pattern, 'name', None))
+        if route is not None:
+            pattern = URLPattern(
+                pattern.pattern, async_read_view(*route, pattern.callback),
+                pattern.default_args, pattern.name,
+            )
+        patterns.append(pattern)
+    return patterns
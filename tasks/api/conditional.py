@@ -0,0 +1,118 @@
+"""
+Conditional GET support (ETag / Last-Modified) for task resources.
+
+Validators come from a single aggregate over ``updated_at`` for the
+requested filter, evaluated before any task rows are fetched, so an
+unchanged resource costs one index read and a ``304``. Lists only get an
+ETag: deleting or archiving a task leaves ``max(updated_at)`` as it was,
+so a list's Last-Modified date would not move; the row count in its ETag
+does.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+
+from ..cache import aglobal_generation, global_generation
+
+LIST_AGGREGATES = {'last': Max('updated_at'), 'count': Count('pk')}
+
+
+def _etag(request, generation, *parts):
+    # Shared user data (creator/assignee details) is versioned by the global
+    # cache generation; the full URL covers filters and pagination.
+    source = ':'.join(str(part) for part in (request.build_absolute_uri(), generation, *parts))
+    return '"%s"' % hashlib.sha1(source.encode()).hexdigest()
+
+
+def _timestamp(value):
+    return timegm(value.utctimetuple()) if value else None
+
+
+def _list_validators(request, generation, aggregate):
+    last = aggregate['last']
+    return _etag(request, generation, aggregate['count'], last and last.isoformat()), None
+
+
+def _detail_validators(request, generation, pk, updated_at):
+    return _etag(request, generation, pk, updated_at.isoformat()), _timestamp(updated_at)
+
+
+def _updated_at(queryset, pk):
+    try:
+        return queryset.filter(pk=pk).values_list('updated_at', flat=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def _finish(response, etag, last_modified):
+    if response.status_code == status.HTTP_200_OK:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _conditional(request, etag, last_modified, build):
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+    return _finish(build(), etag, last_modified)
+
+
+async def _aconditional(request, etag, last_modified, build):
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+    return _finish(await build(), etag, last_modified)
+
+
+def list_aggregate(queryset, **extra):
+    """The validator aggregate of ``queryset``, plus ``extra`` aggregates in the same query."""
+    return queryset.order_by().aggregate(**LIST_AGGREGATES, **extra)
+
+
+async def alist_aggregate(queryset, **extra):
+    return await queryset.order_by().aaggregate(**LIST_AGGREGATES, **extra)
+
+
+def conditional_list_response(request, queryset, build, aggregate=None):
+    """
+    Answer with ``304`` if nothing in ``queryset`` changed, else ``build()``.
+    ``aggregate`` is a ``list_aggregate`` of ``queryset`` already read.
+    """
+    if aggregate is None:
+        aggregate = list_aggregate(queryset)
+    etag, last_modified = _list_validators(request, global_generation(), aggregate)
+    return _conditional(request, etag, last_modified, build)
+
+
+def conditional_detail_response(request, queryset, pk, build):
+    """Answer with ``304`` if the task ``pk`` did not change, else ``build()``."""
+    query = _updated_at(queryset, pk)
+    updated_at = query.first() if query is not None else None
+    if updated_at is None:
+        return build()
+    etag, last_modified = _detail_validators(request, global_generation(), pk, updated_at)
+    return _conditional(request, etag, last_modified, build)
+
+
+async def aconditional_list_response(request, queryset, build, aggregate=None):
+    """Async ``conditional_list_response``; ``build`` is a coroutine function."""
+    if aggregate is None:
+        aggregate = await alist_aggregate(queryset)
+    etag, last_modified = _list_validators(request, await aglobal_generation(), aggregate)
+    return await _aconditional(request, etag, last_modified, build)
+
+
+async def aconditional_detail_response(request, queryset, pk, build):
+    """Async ``conditional_detail_response``; ``build`` is a coroutine function."""
+    query = _updated_at(queryset, pk)
+    updated_at = await query.afirst() if query is not None else None
+    if updated_at is None:
+        return await build()
+    etag, last_modified = _detail_validators(request, await aglobal_generation(), pk, updated_at)
+    return await _aconditional(request, etag, last_modified, build)
@@ -0,0 +1,254 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import InvalidPage
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Keyset ordering: Task.Meta.ordering tie-broken by primary key so every row
+# has a unique, stable position.
+KEYSET_ORDERING = ('-created_at', '-id')
+
+
+def encode_cursor(created_at, pk, reverse=False):
+    """Encode a keyset position into an opaque URL-safe token."""
+    payload = {'c': created_at.isoformat(), 'i': pk}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by ``encode_cursor``.
+    Returns ``((created_at, pk), reverse)`` or raises ``ValueError``.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(payload['c'])
+        pk = int(payload['i'])
+    except (TypeError, KeyError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if created_at is None:
+        raise ValueError('Invalid cursor')
+    return (created_at, pk), bool(payload.get('r'))
+
+
+def row_position(row):
+    """Return the keyset position of a task instance or ``values()`` row."""
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.id
+
+
+def apply_keyset(queryset, position=None, reverse=False):
+    """
+    Order ``queryset`` by the keyset ordering and skip everything up to and
+    including ``position``. With ``reverse`` the rows before ``position``
+    are returned, nearest first.
+
+    The ``created_at <= X`` bound is kept as a separate conjunct so the
+    database can turn it into an index range instead of evaluating the
+    tie-break for every row.
+    """
+    if reverse:
+        queryset = queryset.order_by('created_at', 'id')
+    else:
+        queryset = queryset.order_by(*KEYSET_ORDERING)
+    if position is None:
+        return queryset
+
+    created_at, pk = position
+    if reverse:
+        return queryset.filter(created_at__gte=created_at).exclude(
+            created_at=created_at, id__lte=pk
+        )
+    return queryset.filter(created_at__lte=created_at).exclude(
+        created_at=created_at, id__gte=pk
+    )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over ``(created_at, id)``.
+
+    Each page is a single indexed range read of ``page_size + 1`` rows, so
+    cost does not grow with depth and no ``COUNT(*)`` is issued. Positions
+    are taken from row values rather than offsets, which keeps pages stable
+    while new tasks are inserted.
+    """
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    page_size = None
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, page_size=None):
+        if page_size is not None:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request)
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``."""
+        queryset = self._page_queryset(queryset, request)
+        return self._set_page([row async for row in queryset])
+
+    def _page_queryset(self, queryset, request):
+        self.request = request
+        token = request.query_params.get(self.cursor_query_param)
+        position, reverse = None, False
+        if token:
+            try:
+                position, reverse = decode_cursor(token)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+        self.position, self.reverse = position, reverse
+        return apply_keyset(queryset, position, reverse)[:self.page_size + 1]
+
+    def _set_page(self, rows):
+        position, reverse = self.position, self.reverse
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.first_position = row_position(rows[0]) if rows else None
+        self.last_position = row_position(rows[-1]) if rows else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self._build_link(encode_cursor(*self.last_position))
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self._build_link(encode_cursor(*self.first_position, reverse=True))
+
+    def _build_link(self, token):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TaskPagination(PageNumberPagination):
+    """
+    Project default pagination.
+
+    Behaves like ``PageNumberPagination`` unless the client opts in to keyset
+    paging with ``?pagination=cursor`` or by following a ``cursor`` link.
+    Search results are ordered by rank, which keyset pages cannot follow, so
+    ``q`` with a cursor is rejected.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = KeysetPagination.cursor_query_param
+    search_query_param = 'q'
+
+    def use_keyset(self, request):
+        params = request.query_params
+        keyset = (
+            self.cursor_query_param in params
+            or params.get(self.mode_query_param) == 'cursor'
+        )
+        if keyset and params.get(self.search_query_param, '').strip():
+            raise serializers.ValidationError({self.search_query_param: [
+                'Search results are ranked and cannot be paged with a cursor; use page numbers.'
+            ]})
+        return keyset
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.keyset = KeysetPagination(page_size=self.get_page_size(request))
+            if not self.keyset.page_size:
+                return None
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async ``paginate_queryset``: the same pages, read with the async ORM.
+        """
+        if self.use_keyset(request):
+            self.keyset = KeysetPagination(page_size=self.get_page_size(request))
+            if not self.keyset.page_size:
+                return None
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        self.keyset = None
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        bottom = (number - 1) * page_size
+        rows = [row async for row in queryset[bottom:bottom + page_size]]
+        self.page = paginator._get_page(rows, number, paginator)
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return rows
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.extend([
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "cursor" to use keyset pagination.',
+                'schema': {'type': 'string', 'enum': ['cursor']},
+            },
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque cursor taken from a previous next/previous link.',
+                'schema': {'type': 'string'},
+            },
+        ])
+        return parameters
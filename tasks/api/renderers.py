@@ -0,0 +1,11 @@
+from rest_framework.renderers import JSONRenderer
+
+from ..instrumentation import instrumented
+
+
+class InstrumentedJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` whose time shows up as ``render`` in ``Server-Timing``."""
+
+    @instrumented('render')
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,240 @@
+"""
+Read-only fast path for task representations.
+
+``TaskSerializer`` builds a tree of field objects per task and per nested
+user. List endpoints only ever read, so they build the same JSON shape
+straight from ``values()`` rows plus one batched assignee query instead.
+``tasks.tests.test_representations`` keeps the two paths byte-identical.
+
+A ``FieldSelection`` (``?fields=`` / ``?expand=``) picks the fields of the
+response and whether ``assigned_to``/``created_by`` are ids or nested
+users. Only the columns it needs are read, and assignees are not queried
+at all unless ``assigned_to`` is selected.
+
+``assigned_to`` is rendered from ``Task.assignee_snapshot`` (see
+``tasks.snapshots``), read with the task columns, so a page of tasks is one
+query. Only rows without a snapshot need the batched assignee query.
+
+Rows can come from ``Task`` or from ``AllTask`` (live and archived tasks,
+for ``?include_archived=``); pass the rows' model so assignees are read from
+its through table.
+"""
+from collections import defaultdict
+from operator import itemgetter
+from typing import FrozenSet, NamedTuple, Tuple
+
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from ..instrumentation import instrumented
+from ..models import Task
+from .serializers import UserSerializer
+
+TASK_COLUMNS = (
+    'id', 'name', 'description', 'created_at', 'task_type', 'completed_at', 'status',
+)
+RELATED_FIELDS = ('assigned_to', 'created_by')
+TASK_FIELDS = TASK_COLUMNS + RELATED_FIELDS
+DATETIME_COLUMNS = ('created_at', 'completed_at')
+SNAPSHOT_COLUMN = 'assignee_snapshot'
+USER_COLUMNS = UserSerializer.Meta.fields
+CREATOR_COLUMNS = tuple(f'created_by__{field}' for field in USER_COLUMNS)
+
+# Single shared field instance: DRF's datetime formatting (timezone and
+# ISO-8601 'Z' handling) without building a field per value.
+_datetime_field = serializers.DateTimeField()
+
+
+class FieldSelection(NamedTuple):
+    """Response fields, in ``TaskSerializer`` order, and the relations to nest."""
+    fields: Tuple[str, ...]
+    expand: FrozenSet[str]
+
+    def includes(self, field):
+        return field in self.fields
+
+    def expands(self, field):
+        return field in self.fields and field in self.expand
+
+    def columns(self):
+        """
+        ``values()`` columns needed to render this selection. ``id`` and
+        ``created_at`` are always read: they are the row's keyset position
+        (``tasks.api.pagination``). Rendering only outputs selected fields.
+        """
+        columns = ['id', 'created_at', *(
+            column for column in TASK_COLUMNS[1:]
+            if column in self.fields and column != 'created_at'
+        )]
+        if self.expands('created_by'):
+            columns.extend(CREATOR_COLUMNS)
+        elif self.includes('created_by'):
+            columns.append('created_by')
+        return columns
+
+
+# Everything nested: the ``TaskSerializer`` shape, used by export.
+FULL_SELECTION = FieldSelection(TASK_FIELDS, frozenset(RELATED_FIELDS))
+# API default: every field, relations as ids.
+DEFAULT_SELECTION = FieldSelection(TASK_FIELDS, frozenset())
+
+
+def _parse_names(value, allowed, param):
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise serializers.ValidationError({
+            param: [f'Unknown field(s): {", ".join(unknown)}. Choose from: {", ".join(allowed)}.']
+        })
+    return set(names)
+
+
+def parse_field_selection(query_params):
+    """Build the ``FieldSelection`` for ``?fields=a,b`` and ``?expand=c``."""
+    fields, expand = query_params.get('fields'), query_params.get('expand')
+    if not fields and not expand:
+        return DEFAULT_SELECTION
+    selected = _parse_names(fields, TASK_FIELDS, 'fields') if fields else set(TASK_FIELDS)
+    expanded = _parse_names(expand, RELATED_FIELDS, 'expand') if expand else set()
+    return FieldSelection(
+        tuple(field for field in TASK_FIELDS if field in selected), frozenset(expanded)
+    )
+
+
+def assignees_prefetch():
+    """Prefetch for ``assigned_to`` with the deterministic order used by the fast path."""
+    return Prefetch('assigned_to', queryset=User.objects.order_by('id'))
+
+
+def _has_snapshot(model):
+    return any(field.name == SNAPSHOT_COLUMN for field in model._meta.concrete_fields)
+
+
+def task_rows(queryset, selection=FULL_SELECTION):
+    """Turn a task queryset into the flat rows consumed by ``render_tasks``."""
+    columns = selection.columns()
+    if selection.includes('assigned_to') and _has_snapshot(queryset.model):
+        columns.append(SNAPSHOT_COLUMN)
+    return (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .values(*columns)
+    )
+
+
+def _format_datetime(value):
+    return _datetime_field.to_representation(value) if value else None
+
+
+def _user_dict(values):
+    return dict(zip(USER_COLUMNS, values))
+
+
+def _assignee_rows(task_ids, expand, model):
+    columns = [f'user__{field}' for field in USER_COLUMNS] if expand else ['user_id']
+    return (
+        model.assigned_to.through.objects.filter(task_id__in=task_ids)
+        .order_by('task_id', 'user_id')
+        .values_list('task_id', *columns)
+    )
+
+
+def _group_assignees(rows, expand):
+    assignees = defaultdict(list)
+    for row in rows:
+        assignees[row[0]].append(_user_dict(row[1:]) if expand else row[1])
+    return assignees
+
+
+def _snapshot_assignees(rows, expand):
+    """Assignees of the rows that have a snapshot, and the ids of those that do not."""
+    assignees, missing = {}, []
+    for row in rows:
+        snapshot = row.get(SNAPSHOT_COLUMN)
+        if snapshot is None:
+            missing.append(row['id'])
+        elif expand:
+            assignees[row['id']] = [_user_dict(user) for user in snapshot]
+        else:
+            assignees[row['id']] = [user[0] for user in snapshot]
+    return assignees, missing
+
+
+def row_assignees(rows, expand=True, model=Task):
+    """
+    Return the ``fetch_assignees`` mapping for ``task_rows`` output, taken
+    from snapshots where the rows have them.
+    """
+    assignees, missing = _snapshot_assignees(rows, expand)
+    if missing:
+        assignees.update(fetch_assignees(missing, expand, model))
+    return assignees
+
+
+async def arow_assignees(rows, expand=True, model=Task):
+    """Async ``row_assignees``."""
+    assignees, missing = _snapshot_assignees(rows, expand)
+    if missing:
+        assignees.update(await afetch_assignees(missing, expand, model))
+    return assignees
+
+
+def fetch_assignees(task_ids, expand=True, model=Task):
+    """
+    Return ``{task_id: [user dict, ...]}`` for ``task_ids`` in one query,
+    or ``{task_id: [user id, ...]}`` without ``expand``.
+    """
+    if not task_ids:
+        return defaultdict(list)
+    return _group_assignees(_assignee_rows(task_ids, expand, model), expand)
+
+
+async def afetch_assignees(task_ids, expand=True, model=Task):
+    """Async ``fetch_assignees``."""
+    if not task_ids:
+        return defaultdict(list)
+    return _group_assignees([row async for row in _assignee_rows(task_ids, expand, model)], expand)
+
+
+def _field_getters(selection, assignees):
+    getters = []
+    for field in selection.fields:
+        if field in DATETIME_COLUMNS:
+            getter = (lambda key: lambda row: _format_datetime(row[key]))(field)
+        elif field == 'assigned_to':
+            getter = lambda row: assignees.get(row['id'], [])  # noqa: E731
+        elif selection.expands(field):
+            getter = lambda row: _user_dict(row[column] for column in CREATOR_COLUMNS)  # noqa: E731
+        else:
+            getter = itemgetter(field)
+        getters.append((field, getter))
+    return getters
+
+
+@instrumented('serialize')
+def render_tasks(rows, assignees, selection=FULL_SELECTION):
+    """Build ``TaskSerializer``-shaped dicts from ``task_rows`` output."""
+    getters = _field_getters(selection, assignees)
+    return [{field: get(row) for field, get in getters} for row in rows]
+
+
+def serialize_tasks(rows, selection=FULL_SELECTION, model=Task):
+    """Render a page of ``task_rows``; assignees come from snapshots or one batched lookup."""
+    rows = list(rows)
+    assignees = (
+        row_assignees(rows, selection.expands('assigned_to'), model)
+        if selection.includes('assigned_to') else {}
+    )
+    return render_tasks(rows, assignees, selection)
+
+
+async def aserialize_tasks(rows, selection=FULL_SELECTION, model=Task):
+    """Async ``serialize_tasks``; ``rows`` is a list or a ``task_rows`` queryset."""
+    if not isinstance(rows, list):
+        rows = [row async for row in rows]
+    assignees = (
+        await arow_assignees(rows, selection.expands('assigned_to'), model)
+        if selection.includes('assigned_to') else {}
+    )
+    return render_tasks(rows, assignees, selection)
@@ -1,7 +1,56 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from ..instrumentation import timed
 from ..models import Task
 
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """
+    ``many=True`` primary keys looked up with one ``pk__in`` query instead of
+    one query per id. Errors match ``PrimaryKeyRelatedField``.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pk_field = queryset.model._meta.pk
+        pks = []
+        for item in data:
+            if child.pk_field is not None:
+                item = child.pk_field.to_internal_value(item)
+            try:
+                if isinstance(item, bool):
+                    raise TypeError
+                pks.append((item, pk_field.to_python(item)))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail('incorrect_type', data_type=type(item).__name__)
+
+        objects = queryset.in_bulk({pk for _, pk in pks})
+        for item, pk in pks:
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=item)
+        return [objects[pk] for _, pk in pks]
+
+
+class BatchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` whose ``many=True`` form is ``BatchedManyRelatedField``."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchedManyRelatedField(**list_kwargs)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for User model.
@@ -19,7 +68,7 @@ class TaskSerializer(serializers.ModelSerializer):
     """
     assigned_to = UserSerializer(many=True, read_only=True)
     created_by = UserSerializer(read_only=True)
-    assigned_to_ids = serializers.PrimaryKeyRelatedField(
+    assigned_to_ids = BatchedPrimaryKeyRelatedField(
         many=True,
         write_only=True,
         queryset=User.objects.all(),
@@ -36,6 +85,32 @@ class TaskSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('created_at', 'completed_at')
 
+    def get_fields(self):
+        """Relations not expanded by the ``field_selection`` context are ids."""
+        fields = super().get_fields()
+        selection = self.context.get('field_selection')
+        if selection is not None:
+            for name in ('assigned_to', 'created_by'):
+                if not selection.expands(name):
+                    fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True, many=name == 'assigned_to'
+                    )
+        return fields
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+    @property
+    def _readable_fields(self):
+        # Unselected fields are skipped rather than rendered and dropped, so
+        # deferred columns and unprefetched assignees are never loaded.
+        selection = self.context.get('field_selection')
+        for field in super()._readable_fields:
+            if selection is None or selection.includes(field.field_name):
+                yield field
+
     def validate_name(self, value):
         """Ensure task name is not too short."""
         if len(value.strip()) < 3:
@@ -46,4 +121,88 @@ class TaskSerializer(serializers.ModelSerializer):
         """Validate status transitions."""
         if self.instance and self.instance.status == 'completed' and value != 'completed':
             raise serializers.ValidationError("Cannot change status of a completed task.")
-        return value 
\ No newline at end of file
+        return value
+
+
+class BulkTaskSerializer(TaskSerializer):
+    """
+    Write-only serializer for bulk task creation.
+    Assignee ids are plain integers here; the bulk view checks them for a
+    whole batch with one query instead of one lookup per id.
+    """
+    assigned_to_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        write_only=True,
+        source='assigned_to',
+        required=False
+    )
+
+    class Meta(TaskSerializer.Meta):
+        fields = ('name', 'description', 'task_type', 'status', 'assigned_to_ids')
+
+
+class TaskImportSerializer(BulkTaskSerializer):
+    """
+    One row of a task import.
+    Users are given by username; ``tasks.imports`` resolves them for a whole
+    batch at once.
+    """
+    created_by = serializers.CharField(max_length=150, required=False)
+    assigned_to = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        required=False
+    )
+
+    class Meta(BulkTaskSerializer.Meta):
+        fields = ('name', 'description', 'task_type', 'status', 'created_by', 'assigned_to')
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """Payload for bulk task deletion."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False
+    )
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Task filters shared by collection-level operations."""
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+    task_type = serializers.ChoiceField(choices=Task.TaskType.choices, required=False)
+
+
+class BulkAssignSerializer(serializers.Serializer):
+    """
+    Payload for batch assignment.
+    Either ``assignments`` (task id -> user ids) or ``filter`` with ``user_ids``.
+    """
+    assignments = serializers.DictField(
+        child=serializers.ListField(child=serializers.IntegerField(min_value=1)),
+        required=False
+    )
+    filter = TaskFilterSerializer(required=False)
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False
+    )
+
+    def validate_assignments(self, value):
+        """Task ids arrive as JSON object keys; convert them to integers."""
+        try:
+            return {int(task_id): user_ids for task_id, user_ids in value.items()}
+        except ValueError:
+            raise serializers.ValidationError("Task ids must be integers.")
+
+    def validate(self, attrs):
+        has_mapping = 'assignments' in attrs
+        has_filter = 'filter' in attrs or 'user_ids' in attrs
+        if has_mapping == has_filter:
+            raise serializers.ValidationError(
+                "Provide either 'assignments' or 'filter' with 'user_ids'."
+            )
+        if has_filter and 'user_ids' not in attrs:
+            raise serializers.ValidationError({'user_ids': ["This field is required."]})
+        if has_mapping and not attrs['assignments']:
+            raise serializers.ValidationError({'assignments': ["This field may not be empty."]})
+        return attrs
@@ -1,34 +1,164 @@
-from rest_framework import viewsets, permissions, status
+import io
+from itertools import chain
+
+from rest_framework import generics, viewsets, permissions, serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.views import APIView
 
-from ..models import Task
-from .serializers import TaskSerializer, UserSerializer
+from ..analytics import GROUP_BY_CHOICES, WINDOW_FUNCTIONS, duration_report
+from ..cache import cache_stats, cached_list_response
+from ..changes import change_feed, feed_batch_size, latest_cursor
+from ..export import (
+    CONTENT_TYPES, EXPORT_FORMATS, export_lines, iter_task_records, json_array_chunks, ndjson_lines,
+)
+from ..imports import FORMATS_BY_CONTENT_TYPE, run_import
+from ..models import AllTask, Task, TaskImport
+from ..search import search_tasks
+from .conditional import conditional_detail_response, conditional_list_response, list_aggregate
+from .pagination import KEYSET_ORDERING
+from .representations import (
+    assignees_prefetch, parse_field_selection, serialize_tasks, task_rows,
+)
+from .serializers import (
+    BulkAssignSerializer, BulkDeleteSerializer, BulkTaskSerializer, TaskSerializer, UserSerializer,
+)
+from ..services import bulk_assign_tasks, bulk_batch_size, bulk_create_tasks, bulk_delete_tasks
+from ..stats import summary, user_summary
+from ..utils.exceptions import format_error_response
 from ..utils.permissions import IsTaskCreatorOrReadOnly
 
-class TaskViewSet(viewsets.ModelViewSet):
+DEFAULT_BULK_MAX_ITEMS = 5000
+
+
+class FieldSelectionMixin:
+    """
+    Parse ``?fields=`` and ``?expand=`` into ``self.field_selection`` and
+    hand it to ``TaskSerializer``. Relations are ids unless expanded.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.field_selection = parse_field_selection(request.query_params)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['field_selection'] = getattr(self, 'field_selection', None)
+        return context
+
+
+def parse_flag(request, param):
+    """Boolean query parameter ``param``; missing means false."""
+    value = request.query_params.get(param, '').strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return False
+    if value not in ('1', 'true', 'yes'):
+        raise serializers.ValidationError({param: ['Must be true or false.']})
+    return True
+
+
+def parse_count(request, param, default):
+    """Non-negative integer query parameter ``param``."""
+    value = request.query_params.get(param, '').strip()
+    if not value:
+        return default
+    if not value.isdigit():
+        raise serializers.ValidationError({param: ['Must be a non-negative integer.']})
+    return int(value)
+
+
+def parse_include_archived(request):
+    """
+    Whether ``?include_archived=`` asks for archived tasks too. Only reads
+    can include them: archived tasks are read-only.
+    """
+    return parse_flag(request, 'include_archived') and request.method in permissions.SAFE_METHODS
+
+
+class IncludeArchivedMixin:
+    """
+    Read live tasks (``Task``) by default and live plus archived tasks
+    (``AllTask``) with ``?include_archived=true``; see ``tasks.archive``.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.include_archived = parse_include_archived(request)
+
+    def tasks(self):
+        """Manager of the task model this request reads."""
+        return (AllTask if getattr(self, 'include_archived', False) else Task).objects
+
+
+class FastTaskListMixin(FieldSelectionMixin):
+    """
+    Serve ``list`` and ``retrieve`` from the read-only representation path
+    instead of ``TaskSerializer``; lists sit behind ETag/Last-Modified
+    validation. Object permissions allow every safe method, so reads do not
+    load the instance to check them.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_list_response(request, queryset, lambda: self.list_response(queryset))
+
+    def list_response(self, queryset):
+        rows = task_rows(queryset, self.field_selection)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                serialize_tasks(page, self.field_selection, queryset.model)
+            )
+        return Response(serialize_tasks(rows, self.field_selection, queryset.model))
+
+    def retrieve(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            row = task_rows(queryset, self.field_selection).filter(pk=kwargs['pk']).first()
+        except (TypeError, ValueError, DjangoValidationError):
+            row = None
+        if row is None:
+            raise Http404
+        return Response(serialize_tasks([row], self.field_selection, queryset.model)[0])
+
+
+class TaskViewSet(IncludeArchivedMixin, FastTaskListMixin, viewsets.ModelViewSet):
     """ViewSet for managing tasks with CRUD operations and task assignments."""
     
-    queryset = Task.objects.select_related('created_by').prefetch_related('assigned_to').all()
+    queryset = (
+        Task.objects.select_related('created_by').prefetch_related(assignees_prefetch()).all()
+    )
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated, IsTaskCreatorOrReadOnly]
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = self.tasks().select_related('created_by').prefetch_related(assignees_prefetch())
         status = self.request.query_params.get('status')
         task_type = self.request.query_params.get('task_type')
+        query = self.request.query_params.get('q', '').strip()
 
         if status:
             queryset = queryset.filter(status=status)
         if task_type:
             queryset = queryset.filter(task_type=task_type)
+        if query:
+            queryset = search_tasks(queryset, query)
 
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_detail_response(
+            request, self.get_queryset(), kwargs['pk'],
+            lambda: super(TaskViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
@@ -106,7 +236,290 @@ class TaskViewSet(viewsets.ModelViewSet):
         task = self.get_object()
         return Response(UserSerializer(task.assigned_to.all(), many=True).data)
 
-class UserTaskViewSet(viewsets.ReadOnlyModelViewSet):
+    @swagger_auto_schema(
+        method='post',
+        operation_description='Create many tasks in one request',
+        request_body=BulkTaskSerializer(many=True),
+        responses={201: 'Created task ids', 400: 'Bad Request'}
+    )
+    @swagger_auto_schema(
+        method='delete',
+        operation_description='Delete many tasks created by the caller',
+        request_body=BulkDeleteSerializer,
+        responses={200: 'Deleted, forbidden and missing task ids', 400: 'Bad Request'}
+    )
+    @action(detail=False, methods=['post', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'DELETE':
+            return self._bulk_delete(request)
+        return self._bulk_create(request)
+
+    def _bulk_create(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return format_error_response(
+                'Request body must be a non-empty array of tasks',
+                code='invalid_payload',
+            )
+        max_items = getattr(settings, 'TASKS_BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+        if len(items) > max_items:
+            return format_error_response(
+                f'At most {max_items} tasks can be created per request',
+                code='too_many_items',
+                details={'max_items': max_items},
+            )
+
+        # Validate batch by batch with a single serializer instance; assignee
+        # ids are checked with one query per batch.
+        errors, validated = {}, []
+        serializer = BulkTaskSerializer()
+        batch_size = bulk_batch_size()
+        for offset in range(0, len(items), batch_size):
+            batch = []
+            for index, item in enumerate(items[offset:offset + batch_size], start=offset):
+                try:
+                    batch.append((index, serializer.run_validation(item)))
+                except serializers.ValidationError as exc:
+                    errors[index] = exc.detail
+            user_ids = {user_id for _, data in batch for user_id in data.get('assigned_to', [])}
+            existing = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+            for index, data in batch:
+                missing = sorted(set(data.get('assigned_to', [])) - existing)
+                if missing:
+                    errors[index] = {
+                        'assigned_to_ids': [
+                            f'Invalid pk "{pk}" - object does not exist.' for pk in missing
+                        ]
+                    }
+                else:
+                    validated.append(data)
+
+        if errors:
+            return format_error_response(
+                'Some tasks are invalid',
+                code='invalid_tasks',
+                details={str(index): item_errors for index, item_errors in sorted(errors.items())},
+            )
+
+        tasks = bulk_create_tasks(validated, created_by=request.user)
+        return Response(
+            {'count': len(tasks), 'ids': [task.id for task in tasks]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description=(
+            'Replace the assignees of many tasks at once, either from an explicit '
+            'task id -> user ids mapping or for every task of the caller matching a filter'
+        ),
+        request_body=BulkAssignSerializer,
+        responses={200: 'Per-task results', 400: 'Bad Request'}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-assign')
+    def bulk_assign(self, request):
+        serializer = BulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        max_items = getattr(settings, 'TASKS_BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+        if 'assignments' in data:
+            assignments = data['assignments']
+        else:
+            task_ids = Task.objects.filter(
+                created_by=request.user, **data.get('filter', {})
+            ).order_by('id').values_list('id', flat=True)[:max_items + 1]
+            assignments = {task_id: data['user_ids'] for task_id in task_ids}
+
+        if len(assignments) > max_items:
+            return format_error_response(
+                f'At most {max_items} tasks can be assigned per request',
+                code='too_many_items',
+                details={'max_items': max_items},
+            )
+
+        user_ids = {user_id for ids in assignments.values() for user_id in ids}
+        existing = User.objects.filter(id__in=user_ids).values_list('id', flat=True)
+        missing_ids = sorted(user_ids - set(existing))
+        if missing_ids:
+            return format_error_response(
+                'Some user IDs do not exist',
+                code='invalid_user_ids',
+                details={'missing_ids': missing_ids},
+            )
+
+        results = bulk_assign_tasks(assignments, request.user)
+        return Response({
+            'results': [{'id': task_id, **result} for task_id, result in results.items()],
+        })
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description=(
+            'Stream every task matching the filters as NDJSON (default) or CSV, '
+            'without pagination'
+        ),
+        manual_parameters=[
+            openapi.Parameter('output', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=list(EXPORT_FORMATS)),
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('task_type', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={200: 'Streamed tasks', 400: 'Bad Request'}
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return format_error_response(
+                f'output must be one of: {", ".join(EXPORT_FORMATS)}',
+                code='invalid_output',
+            )
+        response = StreamingHttpResponse(
+            export_lines(self.get_queryset(), export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="tasks.{export_format}"'
+        return response
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description=(
+            'Create tasks from a CSV or NDJSON body in the export format (admin only). '
+            'Users are given by username; rows without created_by are created by the caller. '
+            'Streams NDJSON: the import id, then rejected rows and progress after every batch. '
+            'Pass resume=<import id> with the same body to continue an interrupted import'
+        ),
+        manual_parameters=[
+            openapi.Parameter('resume', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: 'Streamed progress and rejected rows',
+            400: 'Bad Request',
+            415: 'Unsupported Media Type',
+        }
+    )
+    @action(
+        detail=False, methods=['post'], url_path='import', url_name='import',
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def import_tasks(self, request):
+        import_format = FORMATS_BY_CONTENT_TYPE.get(request.content_type.split(';')[0].strip())
+        if import_format is None:
+            return format_error_response(
+                f'Content-Type must be one of: {", ".join(FORMATS_BY_CONTENT_TYPE)}',
+                code='unsupported_media_type',
+                http_status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+
+        resume = request.query_params.get('resume')
+        if resume is None:
+            task_import = TaskImport.objects.create(
+                source=request.headers.get('X-Filename', 'upload')[:255],
+                format=import_format,
+                created_by=request.user,
+            )
+        else:
+            task_import = TaskImport.objects.filter(pk=resume).first() if resume.isdigit() else None
+            if task_import is None:
+                return format_error_response(
+                    'Import not found', code='import_not_found',
+                    http_status=status.HTTP_404_NOT_FOUND,
+                )
+            if task_import.format != import_format:
+                return format_error_response(
+                    f'Import {task_import.pk} reads {task_import.format}', code='format_mismatch'
+                )
+
+        def events():
+            yield {'import': task_import.pk}
+            yield from run_import(
+                request.stream or io.BytesIO(), task_import, default_creator=request.user
+            )
+
+        return StreamingHttpResponse(ndjson_lines(events()), content_type=CONTENT_TYPES['ndjson'])
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description='Task counts by status and task type, from the summary table',
+        responses={200: 'Task counts'}
+    )
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        return Response(summary())
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description='Completion-time percentiles, histogram and mean of completed tasks',
+        manual_parameters=[
+            openapi.Parameter('group_by', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=list(GROUP_BY_CHOICES)),
+            openapi.Parameter('window', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=list(WINDOW_FUNCTIONS)),
+            openapi.Parameter('task_type', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={200: 'Duration statistics', 400: 'Bad Request'}
+    )
+    @action(detail=False, methods=['get'])
+    def durations(self, request):
+        group_by = request.query_params.get('group_by') or None
+        window = request.query_params.get('window', 'day')
+        if group_by is not None and group_by not in GROUP_BY_CHOICES:
+            return format_error_response(
+                f'group_by must be one of: {", ".join(GROUP_BY_CHOICES)}',
+                code='invalid_group_by',
+            )
+        if window not in WINDOW_FUNCTIONS:
+            return format_error_response(
+                f'window must be one of: {", ".join(WINDOW_FUNCTIONS)}',
+                code='invalid_window',
+            )
+        return Response(duration_report(self.get_queryset(), group_by=group_by, window=window))
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description=(
+            'Tasks changed after the change log cursor `since` (0 for everything still logged), '
+            'each once with its latest action and current representation (null once deleted or '
+            'archived). Resume from the returned cursor; 410 means the log no longer reaches back '
+            'to `since`: resync from the task list, then resume from the cursor in the error '
+            'details'
+        ),
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('fields', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: 'Changed tasks and the next cursor',
+            400: 'Bad Request',
+            410: 'Cursor expired',
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        since = parse_count(request, 'since', 0)
+        limit = min(parse_count(request, 'limit', feed_batch_size()), feed_batch_size()) or 1
+        feed = change_feed(since, limit, self.field_selection)
+        if feed is None:
+            return format_error_response(
+                'The change log no longer reaches back to this cursor; resync from the task list',
+                code='cursor_expired',
+                details={'since': since, 'cursor': latest_cursor()},
+                http_status=status.HTTP_410_GONE,
+            )
+        return Response(feed)
+
+    def _bulk_delete(self, request):
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted, forbidden, missing = bulk_delete_tasks(
+            serializer.validated_data['ids'], request.user
+        )
+        return Response({'deleted': deleted, 'forbidden': forbidden, 'missing': missing})
+
+
+class UserTaskViewSet(IncludeArchivedMixin, FastTaskListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for retrieving tasks assigned to a specific user."""
     
     serializer_class = TaskSerializer
@@ -116,31 +529,104 @@ class UserTaskViewSet(viewsets.ReadOnlyModelViewSet):
         # Handle schema generation case
         if getattr(self, 'swagger_fake_view', False):
             return Task.objects.none()
-        return Task.objects.filter(
+        return self.tasks().filter(
             assigned_to__id=self.kwargs['user_id']
-        ).select_related('created_by').prefetch_related('assigned_to')
+        ).select_related('created_by').prefetch_related(assignees_prefetch())
+
+    def list_response(self, queryset):
+        return cached_list_response(
+            self.request, 'user-tasks', self.kwargs['user_id'],
+            lambda: super(UserTaskViewSet, self).list_response(queryset),
+        )
+
+    @swagger_auto_schema(
+        method='get',
+        operation_description=(
+            'Counts of tasks assigned to the user by status, from the per-user summary table'
+        ),
+        responses={200: 'Task counts'}
+    )
+    @action(detail=False, methods=['get'])
+    def summary(self, request, user_id=None):
+        return Response(user_summary(user_id))
 
 
-class UserNameTaskList(APIView):
+class UserNameTaskList(IncludeArchivedMixin, FastTaskListMixin, generics.GenericAPIView):
+    """
+    Tasks assigned to a user, by username. The username is resolved through
+    the ``assigned_to`` join of the task query itself; the user table is
+    only read when no task matches, to tell an unknown user from an idle one.
+    Pages follow the project pagination; ``?stream=true`` returns every task
+    as one JSON array rendered chunk by chunk.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    serializer_class = TaskSerializer
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Task.objects.none()
+        return self.tasks().filter(assigned_to__username=self.kwargs['username'])
 
     @swagger_auto_schema(
         operation_description='List tasks assigned to a user by username',
+        manual_parameters=[
+            openapi.Parameter('stream', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                              description='Stream every task as one unpaginated JSON array.'),
+        ],
         responses={200: TaskSerializer(many=True), 404: 'User not found'}
     )
     def get(self, request, username: str):
-        user = User.objects.filter(username=username).first()
-        if not user:
-            return Response(
-                {
-                    'error': {
-                        'message': 'User not found',
-                        'code': 'user_not_found',
-                        'details': {'username': username},
-                    }
-                },
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        queryset = Task.objects.filter(assigned_to=user).select_related('created_by').prefetch_related('assigned_to')
-        serializer = TaskSerializer(queryset, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        queryset = self.get_queryset()
+        if parse_flag(request, 'stream'):
+            return self.stream_response(queryset, username)
+        aggregate = list_aggregate(queryset, user_id=Max('assigned_to__id'))
+        return conditional_list_response(
+            request, queryset,
+            lambda: self.username_response(queryset, username, aggregate['user_id']),
+            aggregate,
+        )
+
+    @staticmethod
+    def user_not_found(username):
+        return Response(
+            {
+                'error': {
+                    'message': 'User not found',
+                    'code': 'user_not_found',
+                    'details': {'username': username},
+                }
+            },
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    def username_response(self, queryset, username, user_id):
+        if user_id is None:
+            user_id = User.objects.filter(username=username).values_list('id', flat=True).first()
+            if user_id is None:
+                return self.user_not_found(username)
+        return cached_list_response(
+            self.request, 'user-tasks-by-username', user_id, lambda: self.list_response(queryset)
+        )
+
+    def stream_response(self, queryset, username):
+        records = iter_task_records(
+            queryset, chunk_size=bulk_batch_size(), selection=self.field_selection,
+            ordering=KEYSET_ORDERING,
+        )
+        # Read the first chunk now: a 404 cannot be sent once streaming starts.
+        first = next(records, None)
+        if first is None and not User.objects.filter(username=username).exists():
+            return self.user_not_found(username)
+        head = [] if first is None else [first]
+        return StreamingHttpResponse(
+            json_array_chunks(chain(head, records)), content_type='application/json'
+        )
+
+
+class TaskCacheStats(APIView):
+    """Hit/miss counters of the per-user task list cache, for sizing it."""
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(operation_description='Response cache hit/miss counters')
+    def get(self, request):
+        return Response(cache_stats())
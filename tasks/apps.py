@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+
+    def ready(self):
+        # Connect signal receivers that keep derived state in step with tasks.
+        from . import (  # noqa: F401
+            cache, changes, events, instrumentation, receivers, search, stats,
+        )
+        from .utils import authentication  # noqa: F401
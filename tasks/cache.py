@@ -0,0 +1,250 @@
+"""
+Versioned response cache for per-user task lists.
+
+Cached responses are keyed on a generation counter per user plus a global
+generation. Writes never delete cache entries: they bump the counters of the
+affected users, so later reads compute new keys and stale entries simply age
+out of the backend. Counters are bumped as soon as a change is made and
+again when its transaction commits, so a reader racing the commit cannot
+store pre-commit data under the post-commit generation.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Task
+from .services import bulk_batch_size, chunked
+from .signals import (
+    task_assignments_changed, tasks_archived, tasks_bulk_created, tasks_bulk_deleted,
+    tasks_bulk_updated,
+)
+
+DEFAULT_TIMEOUT = 0
+
+USER_GENERATION_KEY = 'tasks:gen:user:{}'
+GLOBAL_GENERATION_KEY = 'tasks:gen:global'
+RESPONSE_KEY = 'tasks:resp:{scope}:{user_id}:{user_gen}:{global_gen}:{digest}'
+HITS_KEY = 'tasks:cache:hits'
+MISSES_KEY = 'tasks:cache:misses'
+
+
+def cache_timeout():
+    return getattr(settings, 'TASKS_RESPONSE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _fresh_generation():
+    # Seeding from the clock keeps an evicted counter from restarting at a
+    # value that older cached responses were stored under.
+    return time.time_ns()
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_generation(), None)
+
+
+def _generations(*keys):
+    values = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        value = values.get(key)
+        if value is None:
+            cache.add(key, _fresh_generation(), None)
+            value = cache.get(key)
+        generations.append(value)
+    return generations
+
+
+async def _agenerations(*keys):
+    values = await cache.aget_many(keys)
+    generations = []
+    for key in keys:
+        value = values.get(key)
+        if value is None:
+            await cache.aadd(key, _fresh_generation(), None)
+            value = await cache.aget(key)
+        generations.append(value)
+    return generations
+
+
+def global_generation():
+    """Current global generation; changes whenever shared user data changes."""
+    return _generations(GLOBAL_GENERATION_KEY)[0]
+
+
+async def aglobal_generation():
+    return (await _agenerations(GLOBAL_GENERATION_KEY))[0]
+
+
+def bump_users(user_ids):
+    """Invalidate cached task lists of ``user_ids`` now and again on commit."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+
+    def bump():
+        for user_id in user_ids:
+            _bump(USER_GENERATION_KEY.format(user_id))
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_all():
+    """Invalidate every cached task list (used when shared user data changes)."""
+    _bump(GLOBAL_GENERATION_KEY)
+    transaction.on_commit(lambda: _bump(GLOBAL_GENERATION_KEY))
+
+
+def _count(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+async def _acount(key):
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, None)
+
+
+def _response_key(request, scope, user_id, user_gen, global_gen):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return RESPONSE_KEY.format(
+        scope=scope, user_id=user_id, user_gen=user_gen, global_gen=global_gen, digest=digest
+    )
+
+
+def cached_list_response(request, scope, user_id, build):
+    """
+    Return the cached list response for ``user_id`` or build and store it.
+
+    ``build`` returns a DRF ``Response``; only 200 responses are stored.
+    """
+    timeout = cache_timeout()
+    if not timeout:
+        return build()
+
+    user_gen, global_gen = _generations(USER_GENERATION_KEY.format(user_id), GLOBAL_GENERATION_KEY)
+    key = _response_key(request, scope, user_id, user_gen, global_gen)
+    data = cache.get(key)
+    if data is not None:
+        _count(HITS_KEY)
+        return Response(data)
+
+    _count(MISSES_KEY)
+    response = build()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, timeout)
+    return response
+
+
+async def acached_list_response(request, scope, user_id, build):
+    """Async ``cached_list_response``; ``build`` is a coroutine function."""
+    timeout = cache_timeout()
+    if not timeout:
+        return await build()
+
+    user_gen, global_gen = await _agenerations(
+        USER_GENERATION_KEY.format(user_id), GLOBAL_GENERATION_KEY
+    )
+    key = _response_key(request, scope, user_id, user_gen, global_gen)
+    data = await cache.aget(key)
+    if data is not None:
+        await _acount(HITS_KEY)
+        return Response(data)
+
+    await _acount(MISSES_KEY)
+    response = await build()
+    if response.status_code == status.HTTP_200_OK:
+        await cache.aset(key, response.data, timeout)
+    return response
+
+
+def cache_stats():
+    """Hit/miss counters of the response cache."""
+    values = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = values.get(HITS_KEY, 0), values.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        'timeout': cache_timeout(),
+        'backend': settings.CACHES['default']['BACKEND'],
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def _assignee_ids(task):
+    return list(task.assigned_to.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Task)
+def _task_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        bump_users(_assignee_ids(instance))
+
+
+@receiver(pre_delete, sender=Task)
+def _task_deleted(sender, instance, **kwargs):
+    bump_users(_assignee_ids(instance))
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def _assignments_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        bump_users([instance.pk])
+    elif action == 'pre_clear':
+        bump_users(_assignee_ids(instance))
+    else:
+        bump_users(pk_set or ())
+
+
+@receiver(tasks_bulk_created, sender=Task)
+@receiver(tasks_bulk_deleted, sender=Task)
+@receiver(tasks_archived, sender=Task)
+def _bulk_tasks_changed(sender, assignments, **kwargs):
+    bump_users(user_id for _, user_id in assignments)
+
+
+@receiver(tasks_bulk_updated, sender=Task)
+def _bulk_tasks_updated(sender, tasks, **kwargs):
+    through = Task.assigned_to.through
+    user_ids = set()
+    for chunk in chunked([row['id'] for row in tasks], bulk_batch_size()):
+        user_ids.update(through.objects.filter(task_id__in=chunk).values_list('user_id', flat=True))
+    bump_users(user_ids)
+
+
+@receiver(task_assignments_changed, sender=Task)
+def _bulk_assignments_changed(sender, added, removed, **kwargs):
+    bump_users(user_id for _, user_id in added + removed)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _user_changed(sender, update_fields=None, **kwargs):
+    # Task lists embed creator and assignee details; logins only touch last_login.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_all()
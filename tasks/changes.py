@@ -0,0 +1,256 @@
+"""
+Append-only task change log and the change feed read from it.
+
+Every task write appends ``TaskChange`` entries in the same transaction:
+the model signals cover ``Task.save``/``delete`` and ``assigned_to``
+changes, ``tasks.signals`` covers the set-based paths and archival. The
+entry id is the sequence number; ``GET /api/tasks/changes/?since=<seq>``
+returns what changed after it, a bounded batch at a time, each task once
+with its current representation.
+
+Ids are taken when rows are inserted, not when transactions commit, so an
+entry can become visible after a higher one. ``read_changes`` therefore
+stops before a gap in the ids while the entry after the gap is younger than
+``TASKS_CHANGE_FEED_SETTLE_SECONDS``; gaps left by rolled back transactions
+are passed once they are older than that.
+
+``manage.py compact_task_changes`` deletes entries older than
+``TASKS_CHANGE_LOG_RETENTION_DAYS``. The newest of them is kept as a
+``compacted`` marker, so a read from an older cursor runs into it. That
+read, or one whose cursor entry no longer exists, is answered with
+``410 Gone`` and the current cursor: the client resyncs from the task list
+and resumes from that cursor. A read from ``0`` starts after the marker.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max, Min
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .api.representations import DEFAULT_SELECTION, serialize_tasks, task_rows
+from .models import Task, TaskChange
+from .services import bulk_batch_size
+from .signals import (
+    task_assignments_changed, task_changes_logged, tasks_archived, tasks_bulk_created,
+    tasks_bulk_deleted, tasks_bulk_updated,
+)
+from .stats import previous_status
+
+DEFAULT_RETENTION_DAYS = 30
+DEFAULT_FEED_BATCH_SIZE = 500
+DEFAULT_SETTLE_SECONDS = 10
+
+# Latest actions after which the task is gone from the live table.
+REMOVED_ACTIONS = (TaskChange.Action.DELETED, TaskChange.Action.ARCHIVED)
+# Feed action for a change after which the task is outside the filters.
+LEFT = 'left'
+
+
+def retention():
+    days = getattr(settings, 'TASKS_CHANGE_LOG_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return timedelta(days=days)
+
+
+def feed_batch_size():
+    return getattr(settings, 'TASKS_CHANGE_FEED_BATCH_SIZE', DEFAULT_FEED_BATCH_SIZE)
+
+
+def settle_time():
+    seconds = getattr(settings, 'TASKS_CHANGE_FEED_SETTLE_SECONDS', DEFAULT_SETTLE_SECONDS)
+    return timedelta(seconds=seconds)
+
+
+def log_changes(task_ids, action):
+    """Append one ``action`` entry per task id."""
+    task_ids = list(dict.fromkeys(task_ids))
+    if not task_ids:
+        return
+    TaskChange.objects.bulk_create(
+        (TaskChange(task_id=task_id, action=action) for task_id in task_ids),
+        batch_size=bulk_batch_size(),
+    )
+    task_changes_logged.send(sender=TaskChange, task_ids=task_ids, action=action)
+
+
+def latest_cursor():
+    """Id of the newest entry, 0 for an empty log."""
+    return TaskChange.objects.aggregate(newest=Max('id'))['newest'] or 0
+
+
+def read_changes(since, limit, now=None):
+    """
+    Entries after ``since``, at most ``limit``, holding back at unsettled
+    gaps. Returns ``(entries, cursor, has_more)`` where ``entries`` keeps
+    only the latest entry per task, in sequence order, and ``cursor`` is the
+    id to resume from; ``None`` if ``since`` is stale. ``0`` reads
+    everything still logged.
+    """
+    settled = (now or timezone.now()) - settle_time()
+    # The cursor's own entry is read too: if it is gone, so may be others.
+    rows = list(TaskChange.objects.filter(id__gte=since).order_by('id')[:limit + 2])
+    if not since and rows and rows[0].action == TaskChange.Action.COMPACTED:
+        since = rows[0].id
+    if since:
+        if not rows or rows[0].id != since:
+            return None
+        rows = rows[1:]
+    taken, expected, held = [], since + 1, False
+    for entry in rows[:limit]:
+        if entry.action == TaskChange.Action.COMPACTED:
+            return None
+        if entry.id != expected and entry.changed_at > settled:
+            held = True
+            break
+        taken.append(entry)
+        expected = entry.id + 1
+    latest = {entry.task_id: entry for entry in taken}
+    entries = sorted(latest.values(), key=lambda entry: entry.id)
+    cursor = taken[-1].id if taken else since
+    return entries, cursor, len(rows) > limit and not held
+
+
+def change_feed(since, limit, selection=DEFAULT_SELECTION, queryset=None):
+    """
+    The change feed response for ``since``, changed tasks rendered with
+    ``selection``; ``None`` if ``since`` is stale. A change to a task outside
+    ``queryset`` is sent as a ``left`` change without the task, so a client
+    following a filtered feed drops it; removals are always sent.
+    """
+    changes = read_changes(since, limit)
+    if changes is None:
+        return None
+    entries, cursor, has_more = changes
+    filtered = queryset is not None
+    queryset = Task.objects.all() if queryset is None else queryset
+    live = [entry.task_id for entry in entries if entry.action not in REMOVED_ACTIONS]
+    tasks, left = {}, set()
+    if live:
+        rows = list(task_rows(queryset.filter(pk__in=live).order_by(), selection))
+        serialized = serialize_tasks(rows, selection, queryset.model)
+        tasks = {row['id']: task for row, task in zip(rows, serialized)}
+        missing = set(live) - tasks.keys()
+        if filtered and missing:
+            # Tasks removed since are skipped: their removal comes later.
+            left = set(Task.objects.filter(pk__in=missing).values_list('id', flat=True))
+    return {
+        'changes': [
+            {
+                'seq': entry.id,
+                'task_id': entry.task_id,
+                'action': LEFT if entry.task_id in left else entry.action,
+                'changed_at': entry.changed_at,
+                'task': tasks.get(entry.task_id),
+            }
+            for entry in entries
+            if entry.action in REMOVED_ACTIONS or entry.task_id in tasks or entry.task_id in left
+        ],
+        'cursor': cursor,
+        'has_more': has_more,
+    }
+
+
+def compaction_horizon(older_than=None, now=None):
+    """Id of the newest entry older than ``older_than`` (default: the setting), or ``None``."""
+    cutoff = (now or timezone.now()) - (retention() if older_than is None else older_than)
+    return TaskChange.objects.filter(changed_at__lt=cutoff).aggregate(horizon=Max('id'))['horizon']
+
+
+def compact_changes(older_than=None, batch_size=None, now=None):
+    """
+    Delete entries older than ``older_than`` (default: the setting), one
+    batch per transaction. Returns the number deleted.
+    """
+    horizon = compaction_horizon(older_than, now)
+    if horizon is None:
+        return 0
+    batch_size = batch_size or bulk_batch_size()
+    # The marker goes in first: from then on, every read from a cursor
+    # below it is stale, however far the deletes below have got.
+    TaskChange.objects.filter(id=horizon).update(action=TaskChange.Action.COMPACTED, task_id=0)
+    oldest = TaskChange.objects.aggregate(oldest=Min('id'))['oldest']
+    deleted = 0
+    for low in range(oldest, horizon, batch_size):
+        with transaction.atomic():
+            batch = TaskChange.objects.filter(id__gte=low, id__lt=min(low + batch_size, horizon))
+            count, _ = batch.delete()
+        deleted += count
+    return deleted
+
+
+@receiver(post_save, sender=Task)
+def _log_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        action = TaskChange.Action.CREATED
+    elif previous_status(instance) not in (None, instance.status):
+        action = TaskChange.Action.STATUS_CHANGED
+    else:
+        action = TaskChange.Action.UPDATED
+    log_changes([instance.pk], action)
+
+
+@receiver(post_delete, sender=Task)
+def _log_deleted_task(sender, instance, **kwargs):
+    log_changes([instance.pk], TaskChange.Action.DELETED)
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def _log_assignment_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action == 'post_clear' or (action in ('post_add', 'post_remove') and pk_set):
+            log_changes([instance.pk], TaskChange.Action.ASSIGNED)
+    elif action == 'pre_clear':
+        tasks = Task.objects.filter(assigned_to=instance)
+        instance._changelog_cleared = list(tasks.values_list('id', flat=True))
+    elif action == 'post_clear':
+        log_changes(getattr(instance, '_changelog_cleared', ()), TaskChange.Action.ASSIGNED)
+    elif action in ('post_add', 'post_remove'):
+        log_changes(sorted(pk_set or ()), TaskChange.Action.ASSIGNED)
+
+
+@receiver(pre_delete, sender=User)
+def _remember_unassigned_tasks(sender, instance, **kwargs):
+    # The user's assignments are removed by the cascade, without m2m_changed.
+    instance._changelog_assigned = list(
+        Task.assigned_to.through.objects.filter(user=instance).values_list('task_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def _log_unassigned_tasks(sender, instance, **kwargs):
+    task_ids = getattr(instance, '_changelog_assigned', ())
+    if task_ids:
+        # Tasks the user created are gone and were logged as deleted.
+        remaining = Task.objects.filter(pk__in=task_ids).order_by('id').values_list('id', flat=True)
+        log_changes(remaining, TaskChange.Action.ASSIGNED)
+
+
+@receiver(tasks_bulk_created, sender=Task)
+def _log_bulk_created(sender, tasks, **kwargs):
+    log_changes((task.pk for task in tasks), TaskChange.Action.CREATED)
+
+
+@receiver(tasks_bulk_deleted, sender=Task)
+def _log_bulk_deleted(sender, tasks, **kwargs):
+    log_changes((row['id'] for row in tasks), TaskChange.Action.DELETED)
+
+
+@receiver(tasks_bulk_updated, sender=Task)
+def _log_bulk_updated(sender, tasks, changes, **kwargs):
+    action = TaskChange.Action.STATUS_CHANGED if 'status' in changes else TaskChange.Action.UPDATED
+    log_changes((row['id'] for row in tasks), action)
+
+
+@receiver(task_assignments_changed, sender=Task)
+def _log_bulk_assigned(sender, added, removed, **kwargs):
+    log_changes(sorted({task_id for task_id, _ in added + removed}), TaskChange.Action.ASSIGNED)
+
+
+@receiver(tasks_archived, sender=Task)
+def _log_archived(sender, tasks, **kwargs):
+    log_changes((row['id'] for row in tasks), TaskChange.Action.ARCHIVED)
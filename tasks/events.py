@@ -0,0 +1,212 @@
+"""
+Live task updates for ``GET /api/tasks/events/`` (server-sent events).
+
+The events are the change log entries (``tasks.changes``): each stream
+reads the log from its own cursor, like the change feed, and sends the
+latest entry per task as an event whose id is the entry's sequence
+number. A client that reconnects sends the last id it saw as
+``Last-Event-ID`` and continues from there. A client that reads slowly
+holds up nothing but its own cursor: nothing is queued for it, it reads
+further back in the log the next time it gets to read, and once it is
+behind the log's retention it is told to resync. Streams are only served
+under ASGI (``tasks.api.async_views``).
+
+The in-process bus only tells the streams when to read. ``log_changes``
+sends ``task_changes_logged`` from the model and bulk signal receivers;
+when the writing transaction commits, the event backend wakes the streams:
+
+- ``local``: the streams of this process. Enough for one ASGI worker.
+- ``database``: also polls the newest change log id every
+  ``TASKS_EVENT_POLL_SECONDS``, so writes from other processes (more
+  workers, the WSGI app, management commands) wake the streams here. One
+  query per process per interval, however many streams are open.
+
+``TASKS_EVENT_BACKEND`` names one of these or the dotted path of another
+backend class.
+"""
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+from .changes import change_feed, feed_batch_size, latest_cursor
+from .models import TaskChange
+from .signals import task_changes_logged
+
+DEFAULT_HEARTBEAT_SECONDS = 15
+DEFAULT_MAX_SECONDS = 300
+DEFAULT_POLL_SECONDS = 1
+# Reconnection delay suggested to EventSource clients.
+RETRY_MILLISECONDS = 3000
+
+
+def heartbeat_interval():
+    return getattr(settings, 'TASKS_EVENT_STREAM_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_SECONDS)
+
+
+def max_stream_time():
+    return getattr(settings, 'TASKS_EVENT_STREAM_MAX_SECONDS', DEFAULT_MAX_SECONDS)
+
+
+def poll_interval():
+    return getattr(settings, 'TASKS_EVENT_POLL_SECONDS', DEFAULT_POLL_SECONDS)
+
+
+class Subscription:
+    """A stream's wake-up flag, bound to the event loop serving the stream."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    def wake(self):
+        """Set the flag; callable from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # The loop has been closed; its streams are gone.
+            pass
+
+    async def wait(self, timeout):
+        """Wait up to ``timeout`` seconds to be woken; whether it happened."""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.event.clear()
+        return True
+
+
+class EventBus:
+    """The streams of this process waiting for new change log entries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self):
+        subscription = Subscription()
+        with self._lock:
+            self._subscriptions.add(subscription)
+        event_backend().subscribed(self)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self):
+        """Wake every stream."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.wake()
+
+
+bus = EventBus()
+
+
+class LocalBackend:
+    """Wake the streams of this process when its own writes commit."""
+
+    def committed(self, bus):
+        bus.publish()
+
+    def subscribed(self, bus):
+        pass
+
+
+class DatabaseBackend(LocalBackend):
+    """Also wake them when the change log grows, whichever process wrote to it."""
+
+    def __init__(self):
+        self._poller = None
+
+    def subscribed(self, bus):
+        loop = asyncio.get_running_loop()
+        poller = self._poller
+        if poller is None or poller.done() or poller.get_loop() is not loop:
+            self._poller = loop.create_task(self._poll(bus))
+
+    async def _poll(self, bus):
+        newest = await sync_to_async(latest_cursor)()
+        while len(bus):
+            await asyncio.sleep(poll_interval())
+            current = await sync_to_async(latest_cursor)()
+            if current != newest:
+                newest = current
+                bus.publish()
+
+
+EVENT_BACKENDS = {'local': LocalBackend, 'database': DatabaseBackend}
+_backends = {}
+
+
+def event_backend():
+    """The backend named by ``TASKS_EVENT_BACKEND``, one instance per name."""
+    name = getattr(settings, 'TASKS_EVENT_BACKEND', 'local')
+    if name not in _backends:
+        _backends[name] = (EVENT_BACKENDS.get(name) or import_string(name))()
+    return _backends[name]
+
+
+@receiver(task_changes_logged, sender=TaskChange)
+def _wake_streams_on_commit(sender, **kwargs):
+    transaction.on_commit(lambda: event_backend().committed(bus))
+
+
+def sse_message(data=None, event=None, id=None):
+    """One server-sent event; with only ``id``, it just moves the client's resume point."""
+    lines = []
+    if event is not None:
+        lines.append(f'event: {event}')
+    if id is not None:
+        lines.append(f'id: {id}')
+    if data is not None:
+        encoded = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        lines.append('data: ' + encoded)
+    return '\n'.join(lines) + '\n\n'
+
+
+async def event_stream(cursor, selection, queryset):
+    """
+    Server-sent events for the changes after ``cursor`` to tasks in
+    ``queryset``, until ``TASKS_EVENT_STREAM_MAX_SECONDS`` have passed;
+    EventSource clients then reconnect where they left off. A ``resync``
+    event carrying the current cursor ends the stream if ``cursor`` is stale.
+    """
+    subscription = bus.subscribe()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_stream_time()
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        while True:
+            feed = await sync_to_async(change_feed)(cursor, feed_batch_size(), selection, queryset)
+            if feed is None:
+                yield sse_message({'cursor': await sync_to_async(latest_cursor)()}, event='resync')
+                return
+            for change in feed['changes']:
+                yield sse_message(change, event=change['action'], id=change['seq'])
+            last_sent = feed['changes'][-1]['seq'] if feed['changes'] else cursor
+            if feed['cursor'] != last_sent:
+                # Entries left out by the filters still move the resume point.
+                yield sse_message(id=feed['cursor'])
+            cursor = feed['cursor']
+            if feed['has_more']:
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            if not await subscription.wait(min(heartbeat_interval(), remaining)):
+                yield ': keepalive\n\n'
+    finally:
+        bus.unsubscribe(subscription)
@@ -0,0 +1,242 @@
+"""
+Streaming task import.
+
+Reads the formats ``tasks.export`` writes (NDJSON or CSV) one row at a time
+and creates tasks in batches through ``bulk_create_tasks``, so memory
+depends on the batch size rather than the input. Creators and assignees are
+given by username and resolved once per batch through ``UsernameCache``.
+Each batch is committed together with its ``TaskImport`` checkpoint, so an
+interrupted import resumes right after the last committed batch. Bad rows
+are reported with their errors and skipped. Used by
+``POST /api/tasks/import/`` and ``manage.py import_tasks``.
+
+Ids and timestamps in the input are ignored; imported tasks get new ones.
+"""
+import codecs
+import csv
+import json
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import NamedTuple, Optional
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework import serializers
+
+from .api.serializers import TaskImportSerializer
+from .export import CONTENT_TYPES, EXPORT_FORMATS
+from .models import TaskImport
+from .services import bulk_batch_size, bulk_create_tasks, chunked
+
+IMPORT_FORMATS = EXPORT_FORMATS
+FORMATS_BY_CONTENT_TYPE = {content_type: name for name, content_type in CONTENT_TYPES.items()}
+USERNAME_CACHE_SIZE = 100_000
+ASSIGNEE_SEPARATOR = ';'
+
+
+class UsernameCache:
+    """Bounded LRU map of username to user id; unknown usernames map to None."""
+
+    def __init__(self, max_size=USERNAME_CACHE_SIZE):
+        self.max_size = max_size
+        self._ids = OrderedDict()
+
+    def resolve(self, usernames):
+        """Return ``{username: id or None}``, querying only names not cached."""
+        usernames = list(dict.fromkeys(usernames))
+        missing = [username for username in usernames if username not in self._ids]
+        for chunk in chunked(missing, bulk_batch_size()):
+            found = dict(User.objects.filter(username__in=chunk).values_list('username', 'id'))
+            for username in chunk:
+                self._ids[username] = found.get(username)
+        resolved = {}
+        for username in usernames:
+            self._ids.move_to_end(username)
+            resolved[username] = self._ids[username]
+        while len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+        return resolved
+
+
+class Row(NamedTuple):
+    number: int
+    line: int
+    record: object
+    errors: Optional[dict] = None
+
+
+def _username(value):
+    # The export writes users as objects; plain usernames are accepted too.
+    return value.get('username') if isinstance(value, dict) else value
+
+
+def _lines(stream):
+    """Raw lines of a binary stream, read one at a time, without a UTF-8 BOM."""
+    for number, line in enumerate(iter(stream.readline, b''), start=1):
+        yield number, line.removeprefix(codecs.BOM_UTF8) if number == 1 else line
+
+
+def _ndjson_rows(stream):
+    number = 0
+    for line_number, line in _lines(stream):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            if isinstance(exc, UnicodeDecodeError):
+                message = 'Row is not valid UTF-8.'
+            else:
+                message = f'Invalid JSON: {exc}'
+            text = line.decode('utf-8', 'replace')
+            yield Row(number, line_number, text, {'non_field_errors': [message]})
+            continue
+        if not isinstance(record, dict):
+            message = 'Row must be a JSON object.'
+            yield Row(number, line_number, record, {'non_field_errors': [message]})
+            continue
+        record = {key: value for key, value in record.items() if value is not None}
+        if 'created_by' in record:
+            record['created_by'] = _username(record['created_by'])
+        if isinstance(record.get('assigned_to'), list):
+            record['assigned_to'] = [_username(user) for user in record['assigned_to']]
+        yield Row(number, line_number, record)
+
+
+def _csv_rows(stream):
+    undecodable = set()
+
+    def text_lines():
+        for line_number, line in _lines(stream):
+            try:
+                yield line.decode('utf-8')
+            except UnicodeDecodeError:
+                undecodable.add(line_number)
+                yield line.decode('utf-8', 'replace')
+
+    reader = csv.DictReader(text_lines())
+    first_line = 2
+    for number, record in enumerate(reader, start=1):
+        # A quoted value can span lines; the row covers all of them.
+        lines = range(first_line, reader.line_num + 1)
+        line, first_line = first_line, reader.line_num + 1
+        if None in record:
+            message = 'Row has more values than the header.'
+            yield Row(number, line, record, {'non_field_errors': [message]})
+            continue
+        if undecodable.intersection(lines):
+            yield Row(number, line, record, {'non_field_errors': ['Row is not valid UTF-8.']})
+            continue
+        # Empty cells count as missing, so defaults apply.
+        record = {key: value for key, value in record.items() if value}
+        if 'assigned_to' in record:
+            record['assigned_to'] = [
+                username.strip() for username in record['assigned_to'].split(ASSIGNEE_SEPARATOR)
+                if username.strip()
+            ]
+        yield Row(number, line, record)
+
+
+def read_rows(stream, import_format):
+    """Yield a ``Row`` for every record of a binary ``stream``."""
+    if import_format == 'csv':
+        return _csv_rows(stream)
+    return _ndjson_rows(stream)
+
+
+def _reject(row, errors):
+    return {'row': row.number, 'line': row.line, 'errors': errors, 'record': row.record}
+
+
+def _validate(batch, serializer, usernames, default_creator):
+    """Split ``batch`` into ``bulk_create_tasks`` items and reject dicts."""
+    checked, rejects = [], []
+    for row in batch:
+        if row.errors:
+            rejects.append(_reject(row, row.errors))
+            continue
+        try:
+            checked.append((row, serializer.run_validation(row.record)))
+        except serializers.ValidationError as exc:
+            rejects.append(_reject(row, exc.detail))
+
+    ids = usernames.resolve(
+        username
+        for _, data in checked
+        for username in (data.get('created_by'), *data.get('assigned_to', []))
+        if username
+    )
+    items = []
+    for row, data in checked:
+        errors = {}
+        creator = data.pop('created_by', None)
+        if creator is not None:
+            creator_id = ids[creator]
+            if creator_id is None:
+                errors['created_by'] = [f'User "{creator}" does not exist.']
+        elif default_creator is not None:
+            creator_id = default_creator.pk
+        else:
+            errors['created_by'] = ['This field is required.']
+        assignees = data.get('assigned_to', [])
+        unknown = [username for username in assignees if ids[username] is None]
+        if unknown:
+            errors['assigned_to'] = [f'User "{username}" does not exist.' for username in unknown]
+        if errors:
+            rejects.append(_reject(row, errors))
+            continue
+        data['created_by_id'] = creator_id
+        data['assigned_to'] = [ids[username] for username in assignees]
+        items.append(data)
+    return items, rejects
+
+
+def progress(task_import, start_position, started):
+    """Counters of ``task_import`` plus the throughput of the current run."""
+    seconds = time.perf_counter() - started
+    rows = task_import.position - start_position
+    return {
+        'import': task_import.pk,
+        'status': task_import.status,
+        'rows': task_import.position,
+        'imported': task_import.imported,
+        'rejected': task_import.rejected,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(rows / seconds, 1) if seconds else None,
+    }
+
+
+def run_import(stream, task_import, default_creator=None, batch_size=None):
+    """
+    Import the rows of ``stream`` that ``task_import`` has not processed yet.
+
+    Rows without ``created_by`` are created by ``default_creator``. Yields
+    ``{'reject': ...}`` for every bad row and ``{'progress': ...}`` after
+    every committed batch; the last progress has status ``completed``.
+    """
+    batch_size = batch_size or bulk_batch_size()
+    serializer = TaskImportSerializer()
+    usernames = UsernameCache()
+    start_position, started = task_import.position, time.perf_counter()
+    rows = islice(read_rows(stream, task_import.format), task_import.position, None)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        items, rejects = _validate(batch, serializer, usernames, default_creator)
+        with transaction.atomic():
+            if items:
+                bulk_create_tasks(items, batch_size=batch_size)
+            task_import.position += len(batch)
+            task_import.imported += len(items)
+            task_import.rejected += len(rejects)
+            task_import.save(update_fields=['position', 'imported', 'rejected', 'updated_at'])
+        for reject in rejects:
+            yield {'reject': reject}
+        yield {'progress': progress(task_import, start_position, started)}
+
+    task_import.status = TaskImport.Status.COMPLETED
+    task_import.save(update_fields=['status', 'updated_at'])
+    yield {'progress': progress(task_import, start_position, started)}
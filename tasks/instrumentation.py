@@ -0,0 +1,216 @@
+"""
+Per-request performance instrumentation.
+
+``InstrumentationMiddleware`` collects, for every request, the number and
+total time of SQL queries (through a database execute wrapper installed on
+every connection), time spent serializing tasks, time spent rendering the
+response body and the response size. The numbers go out in a
+``Server-Timing`` header and into per-endpoint Prometheus histograms,
+which ``metrics_view`` exports at ``/metrics``.
+
+Metrics live in the worker process. When ``PROMETHEUS_MULTIPROC_DIR`` is
+set (the entrypoint does this), ``prometheus_client`` writes them to files
+in that directory and ``/metrics`` merges the files of every gunicorn
+worker, so it is safe to scrape whichever worker answers.
+"""
+import contextvars
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Histogram, generate_latest, multiprocess,
+)
+
+LABELS = ('method', 'view', 'status')
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf'))
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(9)) + (float('inf'),)
+
+REQUEST_DURATION = Histogram(
+    'tasks_http_request_duration_seconds', 'Time spent handling a request.', LABELS,
+)
+DB_DURATION = Histogram(
+    'tasks_http_request_db_duration_seconds', 'Time spent in SQL queries per request.', LABELS,
+)
+DB_QUERIES = Histogram(
+    'tasks_http_request_db_queries', 'SQL queries run per request.', LABELS, buckets=QUERY_BUCKETS,
+)
+SERIALIZE_DURATION = Histogram(
+    'tasks_http_request_serialize_duration_seconds', 'Time spent serializing tasks per request.',
+    LABELS,
+)
+RENDER_DURATION = Histogram(
+    'tasks_http_request_render_duration_seconds', 'Time spent rendering the response body.', LABELS,
+)
+RESPONSE_SIZE = Histogram(
+    'tasks_http_response_size_bytes', 'Size of non-streaming response bodies.', LABELS,
+    buckets=SIZE_BUCKETS,
+)
+
+TIMED_PHASES = ('serialize', 'render')
+
+
+class RequestMetrics:
+    """Counters of one request, shared by every thread that works on it."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.durations = dict.fromkeys(('db', *TIMED_PHASES), 0.0)
+
+    def add(self, phase, seconds):
+        self.durations[phase] += seconds
+
+
+# Async views hop to worker threads through sync_to_async, which copies the
+# context, so every hop sees (and mutates) the same RequestMetrics.
+_current = contextvars.ContextVar('tasks_request_metrics', default=None)
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to ``phase`` of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - start)
+
+
+def instrumented(phase):
+    """Decorator form of ``timed``."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(phase):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.add('db', time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def _install_execute_wrapper(sender, connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _execute_wrapper)
+
+
+def _ms(seconds):
+    return f'{seconds * 1000:.1f}'
+
+
+def server_timing(metrics, total):
+    """``Server-Timing`` header value for ``metrics``."""
+    durations = metrics.durations
+    parts = [f'db;dur={_ms(durations["db"])};desc="{metrics.queries} queries"']
+    parts.extend(
+        f'{phase};dur={_ms(durations[phase])}' for phase in TIMED_PHASES if durations[phase]
+    )
+    parts.append(f'total;dur={_ms(total)}')
+    return ', '.join(parts)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else 'unmatched'
+
+
+def record(request, response, metrics):
+    """Publish ``metrics`` on ``response`` and in the endpoint histograms."""
+    total = time.perf_counter() - metrics.start
+    response['Server-Timing'] = server_timing(metrics, total)
+    labels = (request.method, _view_name(request), str(response.status_code))
+    REQUEST_DURATION.labels(*labels).observe(total)
+    DB_DURATION.labels(*labels).observe(metrics.durations['db'])
+    DB_QUERIES.labels(*labels).observe(metrics.queries)
+    SERIALIZE_DURATION.labels(*labels).observe(metrics.durations['serialize'])
+    RENDER_DURATION.labels(*labels).observe(metrics.durations['render'])
+    if not response.streaming:
+        RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+    return response
+
+
+class InstrumentationMiddleware:
+    """
+    Measure every request; see the module docstring. Disabled with
+    ``TASKS_INSTRUMENTATION = False``. Streaming responses are measured up
+    to the point the view returns them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TASKS_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return record(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return record(request, response, metrics)
+
+
+def metrics_registry():
+    """The registry to export: every worker's files in multiprocess mode."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition. Needs ``TASKS_METRICS_TOKEN`` as a bearer
+    token if set; without one, only staff sessions may read it unless DEBUG
+    is on.
+    """
+    token = getattr(settings, 'TASKS_METRICS_TOKEN', '')
+    if token:
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,54 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.archive import archive_after, archive_candidates, archive_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Move completed tasks older than TASKS_ARCHIVE_AFTER_DAYS, with their assignments, '
+        'to the archive.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            help=(
+                'Archive tasks completed more than this many days ago '
+                '(default: TASKS_ARCHIVE_AFTER_DAYS).'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, help='Tasks moved per transaction.')
+        parser.add_argument('--limit', type=int, help='Stop after this many tasks.')
+        parser.add_argument(
+            '--dry-run', action='store_true', help='Only count the tasks that would be archived.',
+        )
+
+    def handle(self, *args, **options):
+        for name in ('batch_size', 'limit'):
+            if options[name] is not None and options[name] < 1:
+                raise CommandError(f'--{name.replace("_", "-")} must be positive')
+        days = options['older_than_days']
+        if days is not None and days < 0:
+            raise CommandError('--older-than-days must not be negative')
+        older_than = archive_after() if days is None else timedelta(days=days)
+
+        if options['dry_run']:
+            count = archive_candidates(older_than).count()
+            self.stdout.write(f'{count} task(s) completed more than {older_than.days} day(s) ago.')
+            return
+
+        start = time.perf_counter()
+
+        def progress(moved):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{moved} tasks archived')
+
+        moved = archive_tasks(
+            older_than, batch_size=options['batch_size'], limit=options['limit'], progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {moved} task(s) in {time.perf_counter() - start:.1f}s.'
+        ))
@@ -0,0 +1,49 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.changes import compact_changes, compaction_horizon, retention
+from tasks.models import TaskChange
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete task change log entries older than TASKS_CHANGE_LOG_RETENTION_DAYS. '
+        'Change feed clients with older cursors must resync.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int,
+            help=(
+                'Delete entries logged more than this many days ago '
+                '(default: TASKS_CHANGE_LOG_RETENTION_DAYS).'
+            ),
+        )
+        parser.add_argument('--batch-size', type=int, help='Entries deleted per transaction.')
+        parser.add_argument(
+            '--dry-run', action='store_true', help='Only count the entries that would be deleted.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        days = options['older_than_days']
+        if days is not None and days < 0:
+            raise CommandError('--older-than-days must not be negative')
+        older_than = retention() if days is None else timedelta(days=days)
+
+        if options['dry_run']:
+            horizon = compaction_horizon(older_than)
+            count = TaskChange.objects.filter(id__lt=horizon).count() if horizon is not None else 0
+            self.stdout.write(
+                f'{count} change log entr(ies) logged more than {older_than.days} day(s) ago.'
+            )
+            return
+
+        start = time.perf_counter()
+        deleted = compact_changes(older_than, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} change log entr(ies) in {time.perf_counter() - start:.1f}s.'
+        ))
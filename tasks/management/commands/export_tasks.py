@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, export_lines
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = 'Stream every task (optionally filtered) as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--output', help='File to write to (default: stdout)')
+        parser.add_argument('--status', choices=Task.Status.values)
+        parser.add_argument('--task-type', choices=Task.TaskType.values)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        queryset = Task.objects.all()
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+        if options['task_type']:
+            queryset = queryset.filter(task_type=options['task_type'])
+
+        lines = export_lines(queryset, options['format'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,92 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.imports import IMPORT_FORMATS, run_import
+from tasks.models import TaskImport
+
+PROGRESS_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Create tasks from a CSV or NDJSON file in the export format, in resumable batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to read, or - for stdin.')
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS, help='Default: from the file extension.',
+        )
+        parser.add_argument('--created-by', help='Username that creates rows without a created_by.')
+        parser.add_argument(
+            '--rejects', help='NDJSON file for rejected rows (default: <path>.rejects.ndjson).',
+        )
+        parser.add_argument(
+            '--resume', type=int, help='Id of an interrupted import of the same file.',
+        )
+        parser.add_argument('--batch-size', type=int)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        creator = None
+        if options['created_by']:
+            creator = User.objects.filter(username=options['created_by']).first()
+            if creator is None:
+                raise CommandError(f'User "{options["created_by"]}" does not exist')
+
+        if options['resume']:
+            task_import = TaskImport.objects.filter(pk=options['resume']).first()
+            if task_import is None:
+                raise CommandError(f'Import {options["resume"]} does not exist')
+            if task_import.format != import_format:
+                raise CommandError(f'Import {task_import.pk} reads {task_import.format}')
+        else:
+            task_import = TaskImport.objects.create(
+                source=('stdin' if path == '-' else Path(path).name)[:255],
+                format=import_format,
+                created_by=creator,
+            )
+
+        rejects_path = options['rejects'] or (
+            'rejects.ndjson' if path == '-' else f'{path}.rejects.ndjson'
+        )
+        try:
+            source = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stdout.write(
+            f'Import {task_import.pk}: reading {task_import.source} '
+            f'from row {task_import.position + 1}'
+        )
+
+        last_report = time.monotonic()
+        mode = 'a' if options['resume'] else 'w'
+        with source, open(rejects_path, mode, encoding='utf-8') as rejects:
+            for event in run_import(source, task_import, default_creator=creator,
+                                    batch_size=options['batch_size']):
+                if 'reject' in event:
+                    rejects.write(json.dumps(event['reject'], ensure_ascii=False) + '\n')
+                    continue
+                report = event['progress']
+                if options['verbosity'] > 0 and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.monotonic()
+                    self.stdout.write(self.describe(report))
+
+        self.stdout.write(self.style.SUCCESS(self.describe(report)))
+        if report['rejected']:
+            self.stdout.write(f'Rejected rows are in {rejects_path}')
+
+    @staticmethod
+    def describe(report):
+        return (
+            f'Import {report["import"]} {report["status"]}: {report["rows"]} rows, '
+            f'{report["imported"]} imported, {report["rejected"]} rejected '
+            f'({report["rows_per_second"] or 0:,.0f} rows/s)'
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.snapshots import rebuild_snapshots, snapshot_drift
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild drifted or missing task assignee snapshots from the assignment table, '
+        'or verify them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only compare stored snapshots with the assignment table; exit non-zero on drift.',
+        )
+        parser.add_argument('--batch-size', type=int, help='Tasks checked per query.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        if options['verify']:
+            drifted = snapshot_drift(options['batch_size'])
+            if drifted:
+                shown = ', '.join(map(str, drifted[:20])) + (', ...' if len(drifted) > 20 else '')
+                raise CommandError(f'{len(drifted)} task assignee snapshot(s) drifted: {shown}')
+            self.stdout.write(self.style.SUCCESS('Task assignee snapshots are exact.'))
+            return
+
+        drifted = rebuild_snapshots(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {len(drifted)} task assignee snapshot(s).'))
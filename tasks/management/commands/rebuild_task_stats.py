@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.stats import rebuild_summary, rebuild_user_summary, summary_drift, user_summary_drift
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the task summary and per-user counters from the task and archive tables, '
+        'or verify them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Only compare stored counters with exact counts; exit non-zero on drift.',
+        )
+
+    def handle(self, *args, **options):
+        drift = summary_drift()
+        for (status, task_type), (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f'{status}/{task_type}: stored {stored}, actual {actual}')
+        user_drift = user_summary_drift()
+        for (user_id, status), (stored, actual) in sorted(user_drift.items()):
+            self.stdout.write(f'user {user_id} {status}: stored {stored}, actual {actual}')
+
+        if options['verify']:
+            if drift or user_drift:
+                raise CommandError(
+                    f'{len(drift)} task summary bucket(s) and '
+                    f'{len(user_drift)} user counter(s) drifted'
+                )
+            self.stdout.write(self.style.SUCCESS('Task summary counters are exact.'))
+            return
+
+        rebuild_summary()
+        rebuild_user_summary()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt task summary ({len(drift)} bucket(s) and '
+            f'{len(user_drift)} user counter(s) fixed).'
+        ))
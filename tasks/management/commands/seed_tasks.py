@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.seeding import DEFAULT_SEED_BATCH_SIZE, seed_tasks
+
+
+class Command(BaseCommand):
+    help = 'Insert synthetic users, tasks and assignments for load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100_000)
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument(
+            '--seed', type=int, default=0, help='Random seed; same seed, same rows.',
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='Tasks per user fall off as 1 / (rank + 1) ** skew; 0 spreads them evenly.',
+        )
+        parser.add_argument('--max-assignees', type=int, default=3)
+        parser.add_argument('--days', type=int, default=365, help='Spread of created_at.')
+        parser.add_argument('--prefix', default='seed', help='Username prefix of the new users.')
+        parser.add_argument('--password', default='seed', help='Password of every new user.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_SEED_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        for name in ('tasks', 'max_assignees'):
+            if options[name] < 0:
+                raise CommandError(f'--{name.replace("_", "-")} must not be negative')
+        for name in ('users', 'days', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f'--{name.replace("_", "-")} must be positive')
+
+        start = time.perf_counter()
+
+        def progress(done):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{done}/{options["tasks"]} tasks')
+
+        try:
+            result = seed_tasks(
+                options['tasks'], options['users'], seed=options['seed'], skew=options['skew'],
+                max_assignees=options['max_assignees'], days=options['days'],
+                prefix=options['prefix'], password=options['password'],
+                batch_size=options['batch_size'], progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - start
+        rows = result.users + result.tasks + result.assignments
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {result.users} users, {result.tasks} tasks and '
+            f'{result.assignments} assignments in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s).'
+        ))
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_status_4a0a95_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_task_ty_45f0a7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'created_at', 'id'],
+                name='tasks_task_status_c0ceb9_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['task_type', 'created_at', 'id'],
+                name='tasks_task_task_ty_e12420_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'task_type', 'created_at', 'id'],
+                name='tasks_task_status_9685d1_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Covering (user_id, task_id) index on the auto-created assignment table so
+    per-user task lists resolve their task ids from the index alone. The
+    through table is not a model in migration state, hence RunSQL.
+    """
+
+    dependencies = [
+        ('tasks', '0004_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX tasks_task_assigned_to_user_task_idx '
+                'ON tasks_task_assigned_to (user_id, task_id)'
+            ),
+            reverse_sql='DROP INDEX tasks_task_assigned_to_user_task_idx',
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing rows get the migration time from AddField; use their last known
+    # change instead so ETags and Last-Modified are meaningful right away.
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.update(updated_at=Coalesce('completed_at', 'created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_assignment_user_task_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_status_c0ceb9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_task_ty_e12420_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_status_9685d1_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True,
+                help_text='When the task or its assignees last changed',
+            ),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='tasks_task_updated_33a240_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'created_at', 'id'],
+                include=('updated_at',),
+                name='task_status_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['task_type', 'created_at', 'id'],
+                include=('updated_at',),
+                name='task_type_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'task_type', 'created_at', 'id'],
+                include=('updated_at',),
+                name='task_status_type_created_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:15
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_summary(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    TaskSummary = apps.get_model('tasks', 'TaskSummary')
+    counts = {
+        (row['status'], row['task_type']): row['count']
+        for row in Task.objects.order_by().values('status', 'task_type').annotate(count=Count('id'))
+    }
+    # Pre-create every choice bucket so the hot path only ever runs UPDATEs.
+    for status in ('pending', 'in_progress', 'completed'):
+        for task_type in ('development', 'testing', 'documentation', 'deployment', 'other'):
+            counts.setdefault((status, task_type), 0)
+    TaskSummary.objects.bulk_create(
+        TaskSummary(status=status, task_type=task_type, count=count)
+        for (status, task_type), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSummary',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('status', models.CharField(help_text='Task status', max_length=20)),
+                ('task_type', models.CharField(help_text='Task type', max_length=20)),
+                ('count', models.BigIntegerField(default=0, help_text='Number of tasks')),
+            ],
+            options={
+                'verbose_name': 'Task summary',
+                'verbose_name_plural': 'Task summaries',
+                'ordering': ['status', 'task_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tasksummary',
+            constraint=models.UniqueConstraint(
+                fields=('status', 'task_type'),
+                name='unique_task_summary_bucket',
+            ),
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX tasks_task_search_idx ON tasks_task USING GIN (search_vector)',
+]
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS tasks_task_search_idx',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index for PostgreSQL: a generated tsvector column, maintained by
+    the database on every write, with a GIN index. The column is not a model
+    field; tasks.search queries it directly. SQLite uses an FTS5 table that
+    tasks.search installs after migrate.
+    """
+
+    dependencies = [
+        ('tasks', '0007_task_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(POSTGRES_FORWARD), run(POSTGRES_REVERSE)),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskImport',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('source', models.CharField(
+                    help_text='File name or other description of the input', max_length=255,
+                )),
+                ('format', models.CharField(
+                    choices=[('ndjson', 'NDJSON'), ('csv', 'CSV')],
+                    help_text='Input format',
+                    max_length=10,
+                )),
+                ('status', models.CharField(
+                    choices=[('running', 'Running'), ('completed', 'Completed')],
+                    default='running',
+                    help_text='Whether the whole input has been read',
+                    max_length=20,
+                )),
+                ('position', models.PositiveBigIntegerField(
+                    default=0, help_text='Input rows processed so far',
+                )),
+                ('imported', models.PositiveBigIntegerField(default=0, help_text='Tasks created')),
+                ('rejected', models.PositiveBigIntegerField(default=0, help_text='Rows rejected')),
+                ('created_at', models.DateTimeField(
+                    auto_now_add=True, help_text='When the import was started',
+                )),
+                ('updated_at', models.DateTimeField(
+                    auto_now=True, help_text='When the last batch was committed',
+                )),
+                ('created_by', models.ForeignKey(
+                    blank=True,
+                    help_text='User who started the import',
+                    null=True,
+                    on_delete=django.db.models.deletion.SET_NULL,
+                    related_name='task_imports',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+            options={
+                'verbose_name': 'Task import',
+                'verbose_name_plural': 'Task imports',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
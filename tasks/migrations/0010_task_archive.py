@@ -0,0 +1,193 @@
+# Generated by Django 5.0.2 on 2026-10-18 20:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Live and archived tasks read as one relation for ?include_archived=. Columns
+# are listed explicitly: tasks_task also has search_vector on PostgreSQL.
+TASK_COLUMNS = (
+    'id, name, description, created_at, updated_at, task_type, completed_at, status, '
+    'created_by_id'
+)
+CREATE_VIEWS = [
+    f'''
+    CREATE VIEW tasks_alltask AS
+    SELECT {TASK_COLUMNS}, NULL AS archived_at FROM tasks_task
+    UNION ALL
+    SELECT {TASK_COLUMNS}, archived_at FROM tasks_archivedtask
+    ''',
+    '''
+    CREATE VIEW tasks_allassignment AS
+    SELECT id, task_id, user_id FROM tasks_task_assigned_to
+    UNION ALL
+    SELECT id, task_id, user_id FROM tasks_archivedassignment
+    ''',
+]
+DROP_VIEWS = [
+    'DROP VIEW IF EXISTS tasks_allassignment',
+    'DROP VIEW IF EXISTS tasks_alltask',
+]
+
+
+class Migration(migrations.Migration):
+    """
+    Archive table for completed tasks (tasks.archive) and the read-only
+    tasks_alltask/tasks_allassignment views behind AllTask.
+    """
+
+    dependencies = [
+        ('tasks', '0009_task_import'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AllAssignment',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+            ],
+            options={
+                'db_table': 'tasks_allassignment',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AllTask',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('task_type', models.CharField(
+                    choices=[
+                        ('development', 'Development'),
+                        ('testing', 'Testing'),
+                        ('documentation', 'Documentation'),
+                        ('deployment', 'Deployment'),
+                        ('other', 'Other'),
+                    ],
+                    max_length=20,
+                )),
+                ('completed_at', models.DateTimeField(null=True)),
+                ('status', models.CharField(
+                    choices=[
+                        ('pending', 'Pending'),
+                        ('in_progress', 'In Progress'),
+                        ('completed', 'Completed'),
+                    ],
+                    max_length=20,
+                )),
+                ('archived_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'tasks_alltask',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAssignment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('user', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(
+                    help_text='Id the task had in the task table',
+                    primary_key=True,
+                    serialize=False,
+                )),
+                ('name', models.CharField(help_text='Name of the task', max_length=200)),
+                ('description', models.TextField(help_text='Detailed description of the task')),
+                ('created_at', models.DateTimeField(help_text='When the task was created')),
+                ('updated_at', models.DateTimeField(
+                    help_text='When the task or its assignees last changed',
+                )),
+                ('task_type', models.CharField(
+                    choices=[
+                        ('development', 'Development'),
+                        ('testing', 'Testing'),
+                        ('documentation', 'Documentation'),
+                        ('deployment', 'Deployment'),
+                        ('other', 'Other'),
+                    ],
+                    help_text='Type of the task',
+                    max_length=20,
+                )),
+                ('completed_at', models.DateTimeField(
+                    blank=True, help_text='When the task was completed', null=True,
+                )),
+                ('status', models.CharField(
+                    choices=[
+                        ('pending', 'Pending'),
+                        ('in_progress', 'In Progress'),
+                        ('completed', 'Completed'),
+                    ],
+                    help_text='Status of the task',
+                    max_length=20,
+                )),
+                ('archived_at', models.DateTimeField(help_text='When the task was archived')),
+                ('assigned_to', models.ManyToManyField(
+                    blank=True,
+                    help_text='Users assigned to this task',
+                    related_name='archived_assigned_tasks',
+                    through='tasks.ArchivedAssignment',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+                ('created_by', models.ForeignKey(
+                    help_text='User who created the task',
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='archived_created_tasks',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+            options={
+                'verbose_name': 'Archived task',
+                'verbose_name_plural': 'Archived tasks',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedassignment',
+            name='task',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to='tasks.archivedtask',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['created_at', 'id'], name='tasks_archi_created_329ae4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['completed_at'], name='tasks_archi_complet_27d538_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedassignment',
+            index=models.Index(fields=['user', 'task'], name='tasks_archi_user_id_8902c9_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='archivedassignment',
+            constraint=models.UniqueConstraint(
+                fields=('task', 'user'),
+                name='unique_archived_assignment',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['completed_at'], name='task_completed_at_idx'),
+        ),
+        migrations.RunSQL(CREATE_VIEWS, DROP_VIEWS),
+    ]
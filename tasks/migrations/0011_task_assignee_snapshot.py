@@ -0,0 +1,48 @@
+# Generated by Django 5.0.2 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Existing tasks get a null snapshot (readers fall back to the assignment
+    table) until manage.py rebuild_assignee_snapshots fills it in; only new
+    tasks start from the empty default.
+    """
+
+    dependencies = [
+        ('tasks', '0010_task_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='assignee_snapshot',
+            field=models.JSONField(
+                editable=False,
+                help_text=(
+                    'Assignees as [id, username, email, first_name, last_name] rows; '
+                    'see tasks.snapshots'
+                ),
+                null=True,
+            ),
+        ),
+        # The default is applied by Django, not the database. State only: on
+        # SQLite altering the field would rebuild tasks_task under the
+        # tasks_alltask view.
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='task',
+                name='assignee_snapshot',
+                field=models.JSONField(
+                    default=list,
+                    editable=False,
+                    help_text=(
+                        'Assignees as [id, username, email, first_name, last_name] rows; '
+                        'see tasks.snapshots'
+                    ),
+                    null=True,
+                ),
+            ),
+        ]),
+    ]
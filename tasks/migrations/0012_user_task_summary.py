@@ -0,0 +1,68 @@
+# Generated by Django 5.0.2 on 2026-10-18 22:40
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_user_summary(apps, schema_editor):
+    Task = apps.get_model('tasks', 'Task')
+    ArchivedAssignment = apps.get_model('tasks', 'ArchivedAssignment')
+    UserTaskSummary = apps.get_model('tasks', 'UserTaskSummary')
+    counts = Counter()
+    for assignments in (Task.assigned_to.through.objects, ArchivedAssignment.objects):
+        rows = assignments.order_by().values('user_id', 'task__status').annotate(count=Count('id'))
+        for row in rows:
+            counts[(row['user_id'], row['task__status'])] += row['count']
+    UserTaskSummary.objects.bulk_create(
+        (
+            UserTaskSummary(user_id=user_id, status=status, count=count)
+            for (user_id, status), count in counts.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_task_assignee_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskSummary',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('status', models.CharField(help_text='Task status', max_length=20)),
+                ('count', models.BigIntegerField(
+                    default=0, help_text='Number of tasks assigned to the user',
+                )),
+                ('user', models.ForeignKey(
+                    help_text='Assigned user',
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='task_summaries',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+            options={
+                'verbose_name': 'User task summary',
+                'verbose_name_plural': 'User task summaries',
+                'ordering': ['user', 'status'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='usertasksummary',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'status'),
+                name='unique_user_task_summary_bucket',
+            ),
+        ),
+        migrations.RunPython(build_user_summary, migrations.RunPython.noop),
+    ]
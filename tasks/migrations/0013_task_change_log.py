@@ -0,0 +1,46 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_user_task_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskChange',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID',
+                )),
+                ('task_id', models.BigIntegerField(help_text='Id of the changed task')),
+                ('action', models.CharField(
+                    choices=[
+                        ('created', 'Created'),
+                        ('updated', 'Updated'),
+                        ('status_changed', 'Status changed'),
+                        ('assigned', 'Assignees changed'),
+                        ('deleted', 'Deleted'),
+                        ('archived', 'Archived'),
+                        ('compacted', 'Log compacted'),
+                    ],
+                    help_text='What changed',
+                    max_length=20,
+                )),
+                ('changed_at', models.DateTimeField(
+                    db_index=True,
+                    default=django.utils.timezone.now,
+                    help_text='When the change was logged',
+                )),
+            ],
+            options={
+                'verbose_name': 'Task change',
+                'verbose_name_plural': 'Task changes',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -20,6 +20,10 @@ class Task(models.Model):
     name = models.CharField(max_length=200, help_text="Name of the task")
     description = models.TextField(help_text="Detailed description of the task")
     created_at = models.DateTimeField(auto_now_add=True, help_text="When the task was created")
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the task or its assignees last changed",
+    )
     task_type = models.CharField(
         max_length=20,
         choices=TaskType.choices,
@@ -45,13 +49,44 @@ class Task(models.Model):
         related_name='created_tasks',
         help_text="User who created the task"
     )
+    assignee_snapshot = models.JSONField(
+        default=list,
+        null=True,
+        editable=False,
+        help_text=(
+            "Assignees as [id, username, email, first_name, last_name] rows; "
+            "see tasks.snapshots"
+        ),
+    )
 
     class Meta:
         ordering = ['-created_at']
+        # One index per filter shape produced by the task list endpoints, each
+        # ending in the (created_at, id) ordering so filtered pages are read in
+        # index order without a sort. tasks.tests.test_query_plans checks the
+        # plans. updated_at is carried along (PostgreSQL only) so the ETag
+        # aggregates in tasks.api.conditional can be answered from the index.
         indexes = [
-            models.Index(fields=['status']),
-            models.Index(fields=['task_type']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at']),
+            models.Index(
+                fields=['status', 'created_at', 'id'],
+                include=['updated_at'],
+                name='task_status_created_idx',
+            ),
+            models.Index(
+                fields=['task_type', 'created_at', 'id'],
+                include=['updated_at'],
+                name='task_type_created_idx',
+            ),
+            models.Index(
+                fields=['status', 'task_type', 'created_at', 'id'],
+                include=['updated_at'],
+                name='task_status_type_created_idx',
+            ),
+            # Archival candidates (tasks.archive): completed_at is only set
+            # on completed tasks.
+            models.Index(fields=['completed_at'], name='task_completed_at_idx'),
         ]
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
@@ -64,11 +99,31 @@ class Task(models.Model):
         Override save method to handle task completion logic.
         Sets completed_at timestamp when task is marked as completed.
         """
+        self.apply_completion_rules()
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # The snapshot is only written by tasks.snapshots; this instance's
+            # copy may predate later assignment changes.
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname != 'assignee_snapshot'
+                and field.attname not in deferred
+            ]
+        # Receivers that maintain derived tables (see tasks.stats) run inside
+        # the same transaction as the row write.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+    def apply_completion_rules(self, now=None):
+        """
+        Keep completed_at consistent with status.
+        Called by save() and by bulk paths that bypass it.
+        """
         if self.status == self.Status.COMPLETED and not self.completed_at:
-            self.completed_at = timezone.now()
+            self.completed_at = now or timezone.now()
         elif self.status != self.Status.COMPLETED:
             self.completed_at = None
-        super().save(*args, **kwargs)
 
     @property
     def is_completed(self):
@@ -79,3 +134,238 @@ class Task(models.Model):
     def duration(self):
         """Calculate the duration of the task if completed."""
         return self.completed_at - self.created_at if self.completed_at else None
+
+
+class TaskSummary(models.Model):
+    """
+    Number of tasks per (status, task_type).
+    Kept exact by tasks.stats from the Task save/delete paths and bulk signals.
+    """
+    status = models.CharField(max_length=20, help_text="Task status")
+    task_type = models.CharField(max_length=20, help_text="Task type")
+    count = models.BigIntegerField(default=0, help_text="Number of tasks")
+
+    class Meta:
+        ordering = ['status', 'task_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['status', 'task_type'],
+                name='unique_task_summary_bucket',
+            ),
+        ]
+        verbose_name = 'Task summary'
+        verbose_name_plural = 'Task summaries'
+
+    def __str__(self):
+        return f'{self.status}/{self.task_type}: {self.count}'
+
+
+class UserTaskSummary(models.Model):
+    """
+    Number of tasks assigned to a user per status.
+    Kept exact by tasks.stats from the Task save/delete paths, assignment
+    changes and bulk signals.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='task_summaries',
+        help_text="Assigned user"
+    )
+    status = models.CharField(max_length=20, help_text="Task status")
+    count = models.BigIntegerField(default=0, help_text="Number of tasks assigned to the user")
+
+    class Meta:
+        ordering = ['user', 'status']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'status'],
+                name='unique_user_task_summary_bucket',
+            ),
+        ]
+        verbose_name = 'User task summary'
+        verbose_name_plural = 'User task summaries'
+
+    def __str__(self):
+        return f'{self.user_id}/{self.status}: {self.count}'
+
+
+class TaskChange(models.Model):
+    """
+    One entry of the append-only task change log behind
+    ``/api/tasks/changes/``. The auto-increment id is the sequence number
+    clients resume from. Written by tasks.changes in the same transaction as
+    the change; old entries are removed by ``manage.py compact_task_changes``.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = 'created', 'Created'
+        UPDATED = 'updated', 'Updated'
+        STATUS_CHANGED = 'status_changed', 'Status changed'
+        ASSIGNED = 'assigned', 'Assignees changed'
+        DELETED = 'deleted', 'Deleted'
+        ARCHIVED = 'archived', 'Archived'
+        # Marks where compaction removed older entries; task_id is 0.
+        COMPACTED = 'compacted', 'Log compacted'
+
+    task_id = models.BigIntegerField(help_text="Id of the changed task")
+    action = models.CharField(max_length=20, choices=Action.choices, help_text="What changed")
+    changed_at = models.DateTimeField(
+        default=timezone.now, db_index=True, help_text="When the change was logged"
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Task change'
+        verbose_name_plural = 'Task changes'
+
+    def __str__(self):
+        return f'#{self.pk} {self.action} task {self.task_id}'
+
+
+class TaskImport(models.Model):
+    """
+    Progress of one task import (``manage.py import_tasks`` or the import
+    endpoint). ``position`` is the number of input rows already processed and
+    is saved in the same transaction as each batch, so an interrupted import
+    resumes right after its last committed batch.
+    """
+
+    class Format(models.TextChoices):
+        NDJSON = 'ndjson', 'NDJSON'
+        CSV = 'csv', 'CSV'
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+
+    source = models.CharField(
+        max_length=255, help_text="File name or other description of the input"
+    )
+    format = models.CharField(max_length=10, choices=Format.choices, help_text="Input format")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.RUNNING,
+        help_text="Whether the whole input has been read"
+    )
+    position = models.PositiveBigIntegerField(default=0, help_text="Input rows processed so far")
+    imported = models.PositiveBigIntegerField(default=0, help_text="Tasks created")
+    rejected = models.PositiveBigIntegerField(default=0, help_text="Rows rejected")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='task_imports',
+        help_text="User who started the import"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, help_text="When the import was started")
+    updated_at = models.DateTimeField(auto_now=True, help_text="When the last batch was committed")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Task import'
+        verbose_name_plural = 'Task imports'
+
+    def __str__(self):
+        return f'{self.source} ({self.position} rows)'
+
+
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of ``Task`` by ``tasks.archive``. Keeps the
+    task's id and columns; assignments move to ``ArchivedAssignment``.
+    Archived tasks are read-only.
+    """
+    id = models.BigIntegerField(primary_key=True, help_text="Id the task had in the task table")
+    name = models.CharField(max_length=200, help_text="Name of the task")
+    description = models.TextField(help_text="Detailed description of the task")
+    created_at = models.DateTimeField(help_text="When the task was created")
+    updated_at = models.DateTimeField(help_text="When the task or its assignees last changed")
+    task_type = models.CharField(
+        max_length=20, choices=Task.TaskType.choices, help_text="Type of the task"
+    )
+    completed_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the task was completed"
+    )
+    status = models.CharField(
+        max_length=20, choices=Task.Status.choices, help_text="Status of the task"
+    )
+    assigned_to = models.ManyToManyField(
+        User,
+        through='ArchivedAssignment',
+        related_name='archived_assigned_tasks',
+        blank=True,
+        help_text="Users assigned to this task"
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_created_tasks',
+        help_text="User who created the task"
+    )
+    archived_at = models.DateTimeField(help_text="When the task was archived")
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['completed_at']),
+        ]
+        verbose_name = 'Archived task'
+        verbose_name_plural = 'Archived tasks'
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedAssignment(models.Model):
+    """An assignment of an archived task; keeps the id of the original row."""
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'user'], name='unique_archived_assignment'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'task']),
+        ]
+
+
+class AllTask(models.Model):
+    """
+    Live and archived tasks together: a read-only model over the
+    ``tasks_alltask`` view (``UNION ALL`` of both tables), used for
+    ``?include_archived=``. ``archived_at`` is null for live tasks.
+    """
+    name = models.CharField(max_length=200)
+    description = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    task_type = models.CharField(max_length=20, choices=Task.TaskType.choices)
+    completed_at = models.DateTimeField(null=True)
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    assigned_to = models.ManyToManyField(User, through='AllAssignment', related_name='+')
+    created_by = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='+')
+    archived_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_alltask'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.name
+
+
+class AllAssignment(models.Model):
+    """Assignments of ``AllTask``: the ``tasks_allassignment`` view."""
+    task = models.ForeignKey(AllTask, on_delete=models.DO_NOTHING, related_name='+')
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='+')
+
+    class Meta:
+        managed = False
+        db_table = 'tasks_allassignment'
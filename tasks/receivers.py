@@ -0,0 +1,76 @@
+"""Signal receivers that keep columns on ``Task`` itself consistent."""
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Task
+from .signals import task_assignments_changed, tasks_bulk_created
+from .snapshots import SNAPSHOT_FIELDS, assignee_snapshots, refresh_snapshots
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def touch_reassigned_tasks(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Assignee changes count as task modifications for ``updated_at`` and
+    rewrite ``assignee_snapshot``.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+    now = timezone.now()
+    if not reverse:
+        if action == 'post_clear':
+            return
+        changes = {'updated_at': now}
+        if action == 'pre_clear':
+            changes['assignee_snapshot'] = []
+        elif pk_set:
+            changes['assignee_snapshot'] = assignee_snapshots([instance.pk])[instance.pk]
+        Task.objects.filter(pk=instance.pk).update(**changes)
+        if 'assignee_snapshot' in changes:
+            # Keep the sender's copy current too; Task.save() never writes it.
+            instance.assignee_snapshot = changes['assignee_snapshot']
+    elif action == 'pre_clear':
+        instance._cleared_task_ids = list(
+            Task.objects.filter(assigned_to=instance).values_list('id', flat=True)
+        )
+        Task.objects.filter(pk__in=instance._cleared_task_ids).update(updated_at=now)
+    elif action == 'post_clear':
+        refresh_snapshots(getattr(instance, '_cleared_task_ids', ()))
+    else:
+        Task.objects.filter(pk__in=pk_set or ()).update(updated_at=now)
+        refresh_snapshots(pk_set or ())
+
+
+@receiver(tasks_bulk_created, sender=Task)
+def _snapshot_bulk_created(sender, assignments, **kwargs):
+    # Tasks were inserted with the empty default.
+    refresh_snapshots({task_id for task_id, _ in assignments})
+
+
+@receiver(task_assignments_changed, sender=Task)
+def _snapshot_bulk_assigned(sender, added, removed, **kwargs):
+    refresh_snapshots({task_id for task_id, _ in added + removed})
+
+
+def _assigned_task_ids(user):
+    return list(
+        Task.assigned_to.through.objects.filter(user=user).values_list('task_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=User)
+def _snapshot_user_changed(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if created or raw or (update_fields and not set(update_fields) & set(SNAPSHOT_FIELDS)):
+        return
+    refresh_snapshots(_assigned_task_ids(instance))
+
+
+@receiver(pre_delete, sender=User)
+def _remember_user_tasks(sender, instance, **kwargs):
+    instance._assigned_task_ids = _assigned_task_ids(instance)
+
+
+@receiver(post_delete, sender=User)
+def _snapshot_user_deleted(sender, instance, **kwargs):
+    refresh_snapshots(getattr(instance, '_assigned_task_ids', ()))
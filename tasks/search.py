@@ -0,0 +1,169 @@
+"""
+Full-text search over task name and description.
+
+The index lives in the database and is maintained by the database, so every
+write path (``Task.save``, ``QuerySet.update``, bulk inserts and raw deletes
+in ``tasks.services``) keeps it current without any Python hooks:
+
+* PostgreSQL: a stored generated ``tsvector`` column with a GIN index,
+  added by migration ``0008_task_search_index``.
+* SQLite: an FTS5 external-content table kept in sync by triggers. SQLite
+  drops triggers whenever Django rebuilds ``tasks_task`` during a migration,
+  so the table and triggers are (re)installed after every ``migrate``.
+
+Other backends fall back to ``icontains`` matching without ranking, and so
+does searching ``AllTask`` (``?include_archived=``): only ``tasks_task`` is
+indexed, archived tasks are not.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .models import Task
+
+SEARCH_CONFIG = 'english'
+FTS_TABLE = 'tasks_task_fts'
+# Column weights for ranking: a match in the name counts more than one in
+# the description.
+NAME_WEIGHT, DESCRIPTION_WEIGHT = 2.0, 1.0
+
+SQLITE_TRIGGERS = {
+    'tasks_task_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+    'tasks_task_fts_delete': f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+    """,
+    'tasks_task_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_task_fts_update
+        AFTER UPDATE OF name, description ON tasks_task
+        WHEN old.name IS NOT new.name OR old.description IS NOT new.description BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+    """,
+}
+
+
+def search_terms(query):
+    """Split a user query into word tokens."""
+    return re.findall(r'\w+', query or '')
+
+
+def _fts_query(query):
+    # Quote every token so user input is never parsed as FTS5 syntax; tokens
+    # are implicitly ANDed.
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in search_terms(query))
+
+
+def _vendor(using):
+    return connections[using].vendor
+
+
+def _task_column(using, column):
+    quote = connections[using].ops.quote_name
+    return f'{quote(Task._meta.db_table)}.{quote(column)}'
+
+
+def search_filter(query, using='default'):
+    """A ``Q`` matching tasks whose name or description match ``query``."""
+    vendor = _vendor(using)
+    if vendor == 'postgresql':
+        return Q(RawSQL(
+            f"{_task_column(using, 'search_vector')} @@ websearch_to_tsquery(%s, %s)",
+            [SEARCH_CONFIG, query],
+            output_field=BooleanField(),
+        ))
+    if vendor == 'sqlite':
+        fts_query = _fts_query(query)
+        if not fts_query:
+            return Q(pk__in=[])
+        matches = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        return Q(id__in=RawSQL(matches, [fts_query]))
+    return _terms_filter(query)
+
+
+def _terms_filter(query):
+    condition = Q()
+    for term in search_terms(query):
+        condition &= Q(name__icontains=term) | Q(description__icontains=term)
+    return condition if condition else Q(pk__in=[])
+
+
+def search_rank(query, using='default'):
+    """Relevance of each task for ``query``; higher is better."""
+    vendor = _vendor(using)
+    if vendor == 'postgresql':
+        return RawSQL(
+            f"ts_rank({_task_column(using, 'search_vector')}, websearch_to_tsquery(%s, %s))",
+            [SEARCH_CONFIG, query],
+            output_field=FloatField(),
+        )
+    if vendor == 'sqlite' and _fts_query(query):
+        # bm25() is lower-is-better; it is only evaluated for matching rows.
+        return RawSQL(
+            f'(SELECT -bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) FROM {FTS_TABLE} '
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {_task_column(using, 'id')})",
+            [_fts_query(query)],
+            output_field=FloatField(),
+        )
+    return Value(0.0, output_field=FloatField())
+
+
+def search_tasks(queryset, query):
+    """Restrict ``queryset`` to matches for ``query``, best matches first."""
+    using = queryset.db
+    if queryset.model is Task:
+        condition, rank = search_filter(query, using), search_rank(query, using)
+    else:
+        condition, rank = _terms_filter(query), Value(0.0, output_field=FloatField())
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=rank)
+        .order_by('-search_rank', '-created_at', '-id')
+    )
+
+
+def install_sqlite_index(using='default'):
+    """
+    Create the FTS5 table and triggers if any are missing and rebuild the
+    index from ``tasks_task``. Returns ``True`` when anything was installed.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if Task._meta.db_table not in tables:
+            return False
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks_task'"
+        )
+        triggers = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE in tables and triggers >= SQLITE_TRIGGERS.keys():
+            return False
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            "name, description, content='tasks_task', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+@receiver(post_migrate)
+def _install_search_index(sender, using='default', **kwargs):
+    if sender.name == 'tasks' and _vendor(using) == 'sqlite':
+        install_sqlite_index(using)
@@ -0,0 +1,212 @@
+"""
+Synthetic data for load tests.
+
+``seed_tasks`` writes users, tasks and assignments straight into their
+tables: ``COPY ... FROM STDIN`` on PostgreSQL, batched multi-row ``INSERT``
+elsewhere. Rows bypass ``Task.save()``, ``bulk_create`` (which would
+overwrite ``created_at``) and every signal, so the derived state is redone
+once at the end: the task and per-user summary counters are rebuilt,
+cached responses are invalidated and PostgreSQL statistics are refreshed.
+Assignee snapshots (``tasks.snapshots``) are written with the task rows.
+
+Everything is drawn from ``random.Random(seed)`` and timestamps are offsets
+from a fixed ``EPOCH``, so the same arguments always produce the same rows.
+Users are ranked by id: the user at rank ``r`` creates and is assigned tasks
+with weight ``1 / (r + 1) ** skew`` (0 is uniform, 1 is Zipf-like).
+"""
+import csv
+import io
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+
+from .cache import bump_all
+from .models import AllTask, Task
+from .snapshots import SNAPSHOT_FIELDS
+from .stats import rebuild_summary, rebuild_user_summary
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DEFAULT_SEED_BATCH_SIZE = 10_000
+
+WORDS = (
+    'api', 'audit', 'backup', 'billing', 'build', 'cache', 'client', 'config', 'dashboard',
+    'database', 'deploy', 'docs', 'email', 'export', 'feature', 'import', 'index', 'invoice',
+    'login', 'metrics', 'migration', 'mobile', 'onboarding', 'payment', 'pipeline', 'release',
+    'report', 'search', 'security', 'server', 'session', 'signup', 'storage', 'sync', 'upload',
+    'webhook', 'worker',
+)
+STATUSES = tuple(Task.Status.values)
+TASK_TYPES = tuple(Task.TaskType.values)
+VERBS = (
+    'Add', 'Audit', 'Clean up', 'Document', 'Fix', 'Investigate', 'Migrate', 'Optimize',
+    'Refactor', 'Review', 'Test', 'Update',
+)
+
+
+class SeedResult(NamedTuple):
+    users: int
+    tasks: int
+    assignments: int
+    first_user_id: int
+    first_task_id: int
+
+
+def skew_weights(count, skew):
+    """Cumulative weights of ranks ``0..count-1`` for ``random.choices``."""
+    return list(accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+def _fields(model, exclude=()):
+    return [field for field in model._meta.concrete_fields if field.attname not in exclude]
+
+
+def _write(model, fields, rows):
+    """Append ``rows`` (lists in ``fields`` order) to ``model``'s table."""
+    if not rows:
+        return
+    connection = connections[DEFAULT_DB_ALIAS]
+    # Ids and strings go to the driver as they are; only the other values
+    # (datetimes) need the backend's adaptation.
+    for row in rows:
+        for index, value in enumerate(row):
+            if value is not None and not isinstance(value, (int, str)):
+                row[index] = fields[index].get_db_prep_save(value, connection)
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            buffer = io.StringIO()
+            # Quoting every non-numeric value keeps '' distinct from NULL,
+            # which csv writes as an unquoted empty field.
+            csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(rows)
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+        else:
+            placeholders = ', '.join(['%s'] * len(fields))
+            # Stay under the bound-parameter limit (999 on older SQLite).
+            per_statement = max(1, (connection.features.max_query_params or 999) // len(fields))
+            for start in range(0, len(rows), per_statement):
+                chunk = rows[start:start + per_statement]
+                values = ', '.join([f'({placeholders})'] * len(chunk))
+                cursor.execute(
+                    f'INSERT INTO {table} ({columns}) VALUES {values}',
+                    [value for row in chunk for value in row],
+                )
+
+
+def _next_id(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, k=words))
+
+
+def _task_row(rng, task_id, created_by_id, days):
+    created_at = EPOCH + timedelta(seconds=rng.randrange(days * 86400))
+    status = rng.choice(STATUSES)
+    completed_at = None
+    if status == Task.Status.COMPLETED:
+        completed_at = created_at + timedelta(seconds=rng.randrange(60, 30 * 86400))
+    updated_at = completed_at or created_at + timedelta(seconds=rng.randrange(7 * 86400))
+    return {
+        'id': task_id,
+        'name': f'{rng.choice(VERBS)} {_sentence(rng, rng.randint(1, 3))}',
+        'description': _sentence(rng, rng.randint(5, 60)).capitalize() + '.',
+        'created_at': created_at,
+        'updated_at': updated_at,
+        'task_type': rng.choice(TASK_TYPES),
+        'completed_at': completed_at,
+        'status': status,
+        'created_by_id': created_by_id,
+    }
+
+
+def seed_tasks(tasks, users, seed=0, skew=1.0, max_assignees=3, days=365, prefix='seed',
+               password='seed', batch_size=DEFAULT_SEED_BATCH_SIZE, progress=None):
+    """
+    Insert ``users`` new users and ``tasks`` tasks assigned among them.
+
+    Usernames are ``<prefix><rank>``; every user gets ``password``. Each task
+    has 0 to ``max_assignees`` distinct assignees. ``progress(done)`` is
+    called after every batch of tasks. Returns a ``SeedResult``.
+    """
+    if users < 1:
+        raise ValueError('at least one user is needed')
+    if User.objects.filter(username__startswith=prefix).exists():
+        raise ValueError(f'users named {prefix}* already exist; pick another prefix')
+
+    rng = random.Random(seed)
+    connection = connections[DEFAULT_DB_ALIAS]
+    cum_weights = skew_weights(users, skew)
+    through = Task.assigned_to.through
+    user_fields = _fields(User)
+    task_fields = _fields(Task)
+    through_fields = _fields(through, exclude={'id'})
+    assignments = 0
+
+    with transaction.atomic():
+        first_user_id = _next_id(User)
+        # Archived tasks keep their ids, which new tasks must not reuse.
+        first_task_id = _next_id(AllTask)
+        hashed = make_password(password)
+        width = len(str(users - 1))
+        user_rows, snapshot_users = [], []
+        for rank in range(users):
+            username = f'{prefix}{rank:0{width}d}'
+            row = {
+                'id': first_user_id + rank, 'password': hashed, 'last_login': None,
+                'is_superuser': False, 'username': username, 'first_name': 'Seed',
+                'last_name': str(rank), 'email': f'{username}@example.com', 'is_staff': False,
+                'is_active': True, 'date_joined': EPOCH,
+            }
+            user_rows.append([row[field.attname] for field in user_fields])
+            snapshot_users.append([row[field] for field in SNAPSHOT_FIELDS])
+        for start in range(0, users, batch_size):
+            _write(User, user_fields, user_rows[start:start + batch_size])
+
+        user_ids = range(first_user_id, first_user_id + users)
+        for start in range(0, tasks, batch_size):
+            count = min(batch_size, tasks - start)
+            task_rows, assignment_rows = [], []
+            # Draws are made task by task so the rows do not depend on batch_size.
+            for task_id in range(first_task_id + start, first_task_id + start + count):
+                created_by_id = rng.choices(user_ids, cum_weights=cum_weights)[0]
+                row = _task_row(rng, task_id, created_by_id, days)
+                picks = rng.randint(0, max_assignees)
+                picked = rng.choices(user_ids, cum_weights=cum_weights, k=picks)
+                assignees = list(dict.fromkeys(picked))
+                # Written as JSON text so COPY and INSERT take it as it is.
+                row['assignee_snapshot'] = json.dumps(
+                    [snapshot_users[user_id - first_user_id] for user_id in sorted(assignees)]
+                )
+                task_rows.append([row[field.attname] for field in task_fields])
+                assignment_rows.extend([task_id, user_id] for user_id in assignees)
+            _write(Task, task_fields, task_rows)
+            _write(through, through_fields, assignment_rows)
+            assignments += len(assignment_rows)
+            if progress:
+                progress(start + count)
+
+        # Explicit ids leave PostgreSQL sequences behind the table contents.
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, Task]):
+                cursor.execute(sql)
+        rebuild_summary()
+        rebuild_user_summary()
+        bump_all()
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for model in (User, Task, through):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+    return SeedResult(users, tasks, assignments, first_user_id, first_task_id)
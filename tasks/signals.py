@@ -0,0 +1,41 @@
+"""
+Signals sent by the set-based write paths in ``tasks.services``.
+
+Those paths skip ``Task.save()``/``Model.delete()``, so ``post_save`` and
+``post_delete`` never fire for them. Anything that keeps derived state in
+step with tasks must listen to these as well as the model signals.
+"""
+from django.dispatch import Signal
+
+# Sent after tasks and their assignments are inserted with bulk_create.
+# Arguments: ``tasks`` (saved Task instances) and ``assignments``
+# (list of ``(task_id, user_id)`` pairs).
+tasks_bulk_created = Signal()
+
+# Sent after tasks are deleted in bulk.
+# Arguments: ``tasks`` (``values()`` dicts of the deleted rows with ``id``,
+# ``status``, ``task_type`` and ``created_by_id``) and ``assignments``
+# (the ``(task_id, user_id)`` pairs removed with them).
+tasks_bulk_deleted = Signal()
+
+# Sent after assignments change through bulk_assign_tasks.
+# Arguments: ``added`` and ``removed`` (lists of ``(task_id, user_id)`` pairs).
+task_assignments_changed = Signal()
+
+# Sent after fields of many tasks are changed with a set-based update.
+# Arguments: ``tasks`` (``values()`` dicts of the changed rows as they were
+# before the update, with ``id``, ``status`` and ``task_type``) and
+# ``changes`` (the ``{field: value}`` written to every one of them).
+tasks_bulk_updated = Signal()
+
+# Sent after tasks are moved to the archive by tasks.archive. The tasks still
+# exist (as ArchivedTask rows), so counters over all tasks are unchanged;
+# anything derived from live tasks only must drop them.
+# Arguments: ``tasks`` (``values()`` dicts of the moved rows with ``id``,
+# ``status``, ``task_type`` and ``created_by_id``) and ``assignments``
+# (the ``(task_id, user_id)`` pairs moved with them).
+tasks_archived = Signal()
+
+# Sent by tasks.changes after appending change log entries, inside the
+# writing transaction. Arguments: ``task_ids`` and ``action``.
+task_changes_logged = Signal()
@@ -0,0 +1,83 @@
+"""
+Denormalized assignee snapshots.
+
+``Task.assignee_snapshot`` holds the task's assignees as
+``[[id, username, email, first_name, last_name], ...]`` rows in user id
+order, the ``UserSerializer`` fields. List endpoints render ``assigned_to``
+from it, so a page of tasks is read with one query instead of a second one
+on the assignment table. ``None`` means not built yet (tasks that existed
+before the column); readers fall back to the assignment table for those.
+
+Snapshots are rewritten by the receivers in ``tasks.receivers`` on every
+assignment change (``m2m_changed``, ``assign``, the bulk paths) and when an
+assignee's user details change. ``manage.py rebuild_assignee_snapshots``
+finds and repairs drift, and fills in missing snapshots.
+"""
+from django.db import transaction
+from django.db.models import Max
+
+from .api.serializers import UserSerializer
+from .models import Task
+from .services import bulk_batch_size, chunked
+
+SNAPSHOT_FIELDS = UserSerializer.Meta.fields
+
+
+def assignee_snapshots(task_ids):
+    """Return ``{task_id: snapshot}`` for ``task_ids`` with one query."""
+    snapshots = {task_id: [] for task_id in task_ids}
+    if not snapshots:
+        return snapshots
+    rows = (
+        Task.assigned_to.through.objects.filter(task_id__in=snapshots)
+        .order_by('task_id', 'user_id')
+        .values_list('task_id', *(f'user__{field}' for field in SNAPSHOT_FIELDS))
+    )
+    for task_id, *user in rows:
+        snapshots[task_id].append(user)
+    return snapshots
+
+
+def refresh_snapshots(task_ids, batch_size=None):
+    """Recompute and store the snapshots of ``task_ids``; missing ids are ignored."""
+    batch_size = batch_size or bulk_batch_size()
+    for chunk in chunked(set(task_ids), batch_size):
+        snapshots = assignee_snapshots(chunk)
+        Task.objects.bulk_update(
+            [
+                Task(pk=task_id, assignee_snapshot=snapshot)
+                for task_id, snapshot in snapshots.items()
+            ],
+            ['assignee_snapshot'],
+            batch_size=batch_size,
+        )
+
+
+def _id_ranges(batch_size):
+    """``(low, high)`` task id ranges of about ``batch_size`` ids each."""
+    top = Task.objects.aggregate(top=Max('pk'))['top'] or 0
+    for low in range(1, top + 1, batch_size):
+        yield low, low + batch_size
+
+
+def snapshot_drift(batch_size=None):
+    """Ids of tasks whose stored snapshot is missing or out of date."""
+    batch_size = batch_size or bulk_batch_size()
+    drifted = []
+    for low, high in _id_ranges(batch_size):
+        with transaction.atomic():
+            stored = dict(
+                Task.objects.filter(pk__gte=low, pk__lt=high).values_list('id', 'assignee_snapshot')
+            )
+            actual = assignee_snapshots(list(stored))
+        drifted.extend(
+            task_id for task_id, snapshot in stored.items() if snapshot != actual[task_id]
+        )
+    return sorted(drifted)
+
+
+def rebuild_snapshots(batch_size=None):
+    """Repair every drifted snapshot; returns the ids that were rewritten."""
+    drifted = snapshot_drift(batch_size)
+    refresh_snapshots(drifted, batch_size)
+    return drifted
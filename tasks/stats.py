@@ -0,0 +1,376 @@
+"""
+Task summary counters (tasks per status x task_type).
+
+``TaskSummary`` is kept exact by applying deltas in the same transaction as
+every task write: ``Task.save``/``delete`` through model signals and the
+set-based paths in ``tasks.services`` through ``tasks.signals``. Reading the
+summary is then a scan of a table with a few dozen rows instead of a
+``GROUP BY`` over every task. ``manage.py rebuild_task_stats`` recomputes
+and verifies it.
+
+``UserTaskSummary`` holds the same kind of counters per assignee and status
+(the workload behind ``GET /api/users/<id>/tasks/summary/``). On top of the
+task writes it follows assignment changes: ``m2m_changed`` in both
+directions and ``task_assignments_changed`` from the bulk assign path.
+
+Archived tasks (``tasks.archive``) are still counted: archiving moves rows
+without changing any bucket, and exact counts are taken over ``AllTask``.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    AllAssignment, AllTask, ArchivedAssignment, ArchivedTask, Task, TaskSummary, UserTaskSummary,
+)
+from .services import bulk_batch_size, chunked
+from .signals import (
+    task_assignments_changed, tasks_bulk_created, tasks_bulk_deleted, tasks_bulk_updated,
+)
+
+
+def apply_deltas(deltas):
+    """Add ``{(status, task_type): delta}`` to the stored counters."""
+    for (status, task_type), delta in deltas.items():
+        if not delta:
+            continue
+        updated = TaskSummary.objects.filter(status=status, task_type=task_type).update(
+            count=F('count') + delta
+        )
+        if not updated:
+            # Buckets for choice values are created by the migration; this is
+            # only reached for values outside Task.Status/Task.TaskType.
+            TaskSummary.objects.get_or_create(status=status, task_type=task_type)
+            TaskSummary.objects.filter(status=status, task_type=task_type).update(
+                count=F('count') + delta
+            )
+
+
+def apply_user_deltas(deltas, batch_size=None):
+    """
+    Add ``{(user_id, status): delta}`` to the stored per-user counters with
+    one ``UPDATE`` per distinct (status, delta) and batch of users.
+    """
+    batch_size = batch_size or bulk_batch_size()
+    groups = defaultdict(list)
+    for (user_id, status), delta in deltas.items():
+        if delta:
+            groups[(status, delta)].append(user_id)
+    # Rows are only created for increments: a decrement without a row can
+    # only be for a user whose counters are being deleted along with it.
+    UserTaskSummary.objects.bulk_create(
+        (
+            UserTaskSummary(user_id=user_id, status=status)
+            for (status, delta), user_ids in groups.items() if delta > 0
+            for user_id in user_ids
+        ),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    for (status, delta), user_ids in groups.items():
+        for chunk in chunked(user_ids, batch_size):
+            UserTaskSummary.objects.filter(user_id__in=chunk, status=status).update(
+                count=F('count') + delta
+            )
+
+
+def compute_summary(queryset=None):
+    """Exact counts from a ``GROUP BY`` over live and archived tasks."""
+    queryset = AllTask.objects.all() if queryset is None else queryset
+    rows = queryset.order_by().values('status', 'task_type').annotate(count=Count('id'))
+    return Counter({(row['status'], row['task_type']): row['count'] for row in rows})
+
+
+def stored_summary():
+    return Counter({
+        (row.status, row.task_type): row.count
+        for row in TaskSummary.objects.all()
+    })
+
+
+def summary_drift():
+    """Return ``{(status, task_type): (stored, actual)}`` for buckets that disagree."""
+    with transaction.atomic():
+        stored = stored_summary()
+        actual = compute_summary()
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(stored) | set(actual)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def rebuild_summary():
+    """Overwrite the stored counters with exact counts."""
+    with transaction.atomic():
+        # Locking the buckets first makes concurrent deltas wait, so they are
+        # applied on top of the rebuilt values rather than lost.
+        stored = {
+            (row.status, row.task_type): row
+            for row in TaskSummary.objects.select_for_update()
+        }
+        actual = compute_summary()
+        for key, row in stored.items():
+            if row.count != actual.get(key, 0):
+                row.count = actual.get(key, 0)
+                row.save(update_fields=['count'])
+        TaskSummary.objects.bulk_create(
+            TaskSummary(status=status, task_type=task_type, count=count)
+            for (status, task_type), count in actual.items()
+            if (status, task_type) not in stored
+        )
+
+
+def compute_user_summary():
+    """Exact per-user counts from a ``GROUP BY`` over live and archived assignments."""
+    rows = (
+        AllAssignment.objects.order_by().values('user_id', 'task__status')
+        .annotate(count=Count('id'))
+    )
+    return Counter({(row['user_id'], row['task__status']): row['count'] for row in rows})
+
+
+def stored_user_summary():
+    rows = UserTaskSummary.objects.values_list('user_id', 'status', 'count')
+    return Counter({(user_id, status): count for user_id, status, count in rows})
+
+
+def user_summary_drift():
+    """Return ``{(user_id, status): (stored, actual)}`` for counters that disagree."""
+    with transaction.atomic():
+        stored = stored_user_summary()
+        actual = compute_user_summary()
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(stored) | set(actual)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def rebuild_user_summary(batch_size=None):
+    """Overwrite the stored per-user counters with exact counts."""
+    batch_size = batch_size or bulk_batch_size()
+    with transaction.atomic():
+        # Locked first for the same reason as in rebuild_summary.
+        stored = {
+            (row.user_id, row.status): row
+            for row in UserTaskSummary.objects.select_for_update().only(
+                'id', 'user_id', 'status', 'count'
+            )
+        }
+        actual = compute_user_summary()
+        changed = []
+        for key, row in stored.items():
+            if row.count != actual.get(key, 0):
+                row.count = actual.get(key, 0)
+                changed.append(row)
+        UserTaskSummary.objects.bulk_update(changed, ['count'], batch_size=batch_size)
+        UserTaskSummary.objects.bulk_create(
+            (
+                UserTaskSummary(user_id=user_id, status=status, count=count)
+                for (user_id, status), count in actual.items()
+                if (user_id, status) not in stored
+            ),
+            batch_size=batch_size,
+        )
+
+
+def summary():
+    """Counters shaped for the stats endpoint."""
+    by_status, by_task_type, buckets = Counter(), Counter(), []
+    for row in TaskSummary.objects.all():
+        by_status[row.status] += row.count
+        by_task_type[row.task_type] += row.count
+        buckets.append({'status': row.status, 'task_type': row.task_type, 'count': row.count})
+    return {
+        'total': sum(by_status.values()),
+        'by_status': dict(by_status),
+        'by_task_type': dict(by_task_type),
+        'counts': buckets,
+    }
+
+
+def user_summary(user_id):
+    """Counters of one user shaped for the user summary endpoint; one indexed lookup."""
+    by_status = dict.fromkeys(Task.Status.values, 0)
+    by_status.update(UserTaskSummary.objects.filter(user_id=user_id).values_list('status', 'count'))
+    total = sum(by_status.values())
+    return {
+        'user': int(user_id),
+        'total': total,
+        'open': total - by_status[Task.Status.COMPLETED],
+        'by_status': by_status,
+    }
+
+
+def _stored_bucket(instance):
+    # Locked read of the stored row: the delta must come from what is in the
+    # database, not from a possibly stale instance.
+    return (
+        Task.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('status', 'task_type')
+        .first()
+    )
+
+
+def _assignee_ids(task_id):
+    return list(
+        Task.assigned_to.through.objects.filter(task_id=task_id).values_list('user_id', flat=True)
+    )
+
+
+def _locked_statuses(task_ids, batch_size=None):
+    # Locked like _stored_bucket, so a concurrent status change either sees
+    # the new assignments or waits for them to be counted.
+    statuses = {}
+    for chunk in chunked(set(task_ids), batch_size or bulk_batch_size()):
+        statuses.update(
+            Task.objects.select_for_update().filter(pk__in=chunk)
+            .order_by().values_list('id', 'status')
+        )
+    return statuses
+
+
+def previous_status(instance):
+    """Stored status of ``instance`` before the save in progress; ``None`` for new tasks."""
+    previous = getattr(instance, '_summary_previous', None)
+    return previous[0] if previous else None
+
+
+@receiver(pre_save, sender=Task)
+def _remember_previous_bucket(sender, instance, raw=False, **kwargs):
+    instance._summary_previous = None if raw or instance.pk is None else _stored_bucket(instance)
+
+
+@receiver(post_save, sender=Task)
+def _count_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.status, instance.task_type)
+    previous = getattr(instance, '_summary_previous', None)
+    if previous == current:
+        return
+    deltas = Counter({current: 1})
+    if previous is not None:
+        deltas[previous] -= 1
+    apply_deltas(deltas)
+    # New tasks have no assignees yet; m2m_changed counts them when added.
+    if previous_status(instance) not in (None, instance.status):
+        user_deltas = Counter()
+        for user_id in _assignee_ids(instance.pk):
+            user_deltas[(user_id, previous[0])] -= 1
+            user_deltas[(user_id, instance.status)] += 1
+        apply_user_deltas(user_deltas)
+
+
+@receiver(pre_delete, sender=Task)
+def _remember_deleted_bucket(sender, instance, **kwargs):
+    instance._summary_previous = _stored_bucket(instance)
+    instance._summary_assignees = _assignee_ids(instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def _count_deleted_task(sender, instance, **kwargs):
+    previous = getattr(instance, '_summary_previous', None)
+    if previous is not None:
+        apply_deltas({previous: -1})
+        apply_user_deltas({(user_id, previous[0]): -1 for user_id in instance._summary_assignees})
+
+
+@receiver(pre_delete, sender=ArchivedTask)
+def _remember_archived_assignees(sender, instance, **kwargs):
+    instance._summary_assignees = list(
+        ArchivedAssignment.objects.filter(task=instance).values_list('user_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=ArchivedTask)
+def _count_deleted_archived_task(sender, instance, **kwargs):
+    # Archived tasks are only deleted with their creator.
+    apply_deltas({(instance.status, instance.task_type): -1})
+    apply_user_deltas({
+        (user_id, instance.status): -1 for user_id in getattr(instance, '_summary_assignees', ())
+    })
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+def _count_assignment_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # The rows are gone by post_clear; remember what they counted.
+        through = Task.assigned_to.through.objects
+        cleared = through.filter(user=instance) if reverse else through.filter(task=instance)
+        instance._summary_cleared = list(cleared.values_list('user_id', 'task__status'))
+        return
+    sign = {'post_add': 1, 'post_remove': -1, 'post_clear': -1}.get(action)
+    if sign is None:
+        return
+    if action == 'post_clear':
+        pairs = getattr(instance, '_summary_cleared', ())
+    elif not pk_set:
+        return
+    elif reverse:
+        pairs = [(instance.pk, status) for status in _locked_statuses(pk_set).values()]
+    else:
+        status = _locked_statuses([instance.pk]).get(instance.pk)
+        pairs = [(user_id, status) for user_id in pk_set] if status else []
+    deltas = Counter()
+    for pair in pairs:
+        deltas[pair] += sign
+    apply_user_deltas(deltas)
+
+
+@receiver(tasks_bulk_created, sender=Task)
+def _count_bulk_created(sender, tasks, assignments=(), **kwargs):
+    apply_deltas(Counter((task.status, task.task_type) for task in tasks))
+    statuses = {task.pk: task.status for task in tasks}
+    apply_user_deltas(Counter((user_id, statuses[task_id]) for task_id, user_id in assignments))
+
+
+@receiver(tasks_bulk_deleted, sender=Task)
+def _count_bulk_deleted(sender, tasks, assignments=(), **kwargs):
+    deltas = Counter()
+    for row in tasks:
+        deltas[(row['status'], row['task_type'])] -= 1
+    apply_deltas(deltas)
+    statuses = {row['id']: row['status'] for row in tasks}
+    user_deltas = Counter()
+    for task_id, user_id in assignments:
+        user_deltas[(user_id, statuses[task_id])] -= 1
+    apply_user_deltas(user_deltas)
+
+
+@receiver(task_assignments_changed, sender=Task)
+def _count_bulk_assigned(sender, added, removed, **kwargs):
+    statuses = _locked_statuses({task_id for task_id, _ in added + removed})
+    deltas = Counter()
+    for task_id, user_id in added:
+        deltas[(user_id, statuses[task_id])] += 1
+    for task_id, user_id in removed:
+        deltas[(user_id, statuses[task_id])] -= 1
+    apply_user_deltas(deltas)
+
+
+@receiver(tasks_bulk_updated, sender=Task)
+def _count_bulk_updated(sender, tasks, changes, **kwargs):
+    deltas = Counter()
+    for row in tasks:
+        deltas[(row['status'], row['task_type'])] -= 1
+        status = changes.get('status', row['status'])
+        deltas[(status, changes.get('task_type', row['task_type']))] += 1
+    apply_deltas(deltas)
+    if 'status' not in changes:
+        return
+    previous = {row['id']: row['status'] for row in tasks}
+    user_deltas = Counter()
+    for chunk in chunked(previous, bulk_batch_size()):
+        assignments = Task.assigned_to.through.objects.filter(task_id__in=chunk).values_list(
+            'task_id', 'user_id'
+        )
+        for task_id, user_id in assignments:
+            user_deltas[(user_id, previous[task_id])] -= 1
+            user_deltas[(user_id, changes['status'])] += 1
+    apply_user_deltas(user_deltas)
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Max
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Task
+from ..services import bulk_set_status
+from ..stats import compute_summary, stored_summary
+from ..utils.paginator import EstimatedCountPaginator
+
+STATIC_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(STORAGES=STATIC_STORAGES)
+class TaskAdminTest(TestCase):
+    url = '/admin/tasks/task/'
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', password='x', email='a@example.com'
+        )
+        self.client.force_login(self.admin)
+        self.workers = [User.objects.create(username=f'worker{i}') for i in range(3)]
+
+    def create_tasks(self, count):
+        for i in range(count):
+            creator = User.objects.create(username=f'creator{Task.objects.count()}')
+            task = Task.objects.create(name=f'Task {i}', description='x', created_by=creator)
+            task.assigned_to.set(self.workers[:i % 3 + 1])
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.create_tasks(3)
+        self.changelist_queries()  # warm the session and authentication caches
+        small = self.changelist_queries()
+        self.create_tasks(30)
+        self.assertEqual(self.changelist_queries(), small)
+
+    def test_mark_completed_action(self):
+        done_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        done = Task.objects.create(
+            name='Done', description='x', status='completed', created_by=self.admin
+        )
+        Task.objects.filter(pk=done.pk).update(completed_at=done_at)
+        open_task = Task.objects.create(
+            name='Open', description='x', task_type='testing', created_by=self.admin
+        )
+        before = Task.objects.aggregate(Max('updated_at'))['updated_at__max']
+
+        response = self.client.post(self.url, {
+            'action': 'mark_completed',
+            '_selected_action': [done.pk, open_task.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+
+        open_task.refresh_from_db()
+        done.refresh_from_db()
+        self.assertEqual(open_task.status, 'completed')
+        self.assertIsNotNone(open_task.completed_at)
+        self.assertGreater(open_task.updated_at, before)
+        self.assertEqual(done.completed_at, done_at)
+        self.assertEqual(+stored_summary(), +compute_summary())
+
+    def test_bulk_set_status_clears_completion(self):
+        task = Task.objects.create(
+            name='Done', description='x', status='completed', created_by=self.admin
+        )
+        # Savepoint pair, locked read, one UPDATE, assignee lookup for the cache,
+        # two summary buckets, assignee lookup for the per-user counters,
+        # change log insert.
+        with self.assertNumQueries(9):
+            self.assertEqual(bulk_set_status([task.pk], Task.Status.PENDING), 1)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'pending')
+        self.assertIsNone(task.completed_at)
+        self.assertEqual(bulk_set_status([task.pk], Task.Status.PENDING), 0)
+        self.assertEqual(+stored_summary(), +compute_summary())
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    def test_estimate_used_above_threshold(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Uses sqlite_stat1')
+        user = User.objects.create(username='counter')
+        Task.objects.bulk_create(
+            Task(name='Task', description='x', created_by=user) for _ in range(5)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        Task.objects.bulk_create(
+            Task(name='Task', description='x', created_by=user) for _ in range(3)
+        )
+
+        with override_settings(TASKS_ESTIMATED_COUNT_THRESHOLD=2):
+            self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 10).count, 5)
+            # No estimate for filtered querysets on SQLite.
+            pending = Task.objects.filter(status='pending')
+            self.assertEqual(EstimatedCountPaginator(pending, 10).count, 8)
+        self.assertEqual(EstimatedCountPaginator(Task.objects.all(), 10).count, 8)
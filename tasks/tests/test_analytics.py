@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..analytics import HISTOGRAM_EDGES, duration_report
+from ..models import Task
+
+START = datetime(2024, 3, 4, 9, 0, tzinfo=timezone.utc)
+
+
+class DurationReportTest(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.alice)
+        self.url = reverse('task-durations')
+        # (creator, task_type, created_at offset, duration in seconds)
+        for creator, task_type, day, seconds in [
+            (self.alice, 'testing', 0, 30),
+            (self.alice, 'testing', 0, 90),
+            (self.alice, 'testing', 1, 7200),
+            (self.bob, 'development', 8, 600),
+            (self.bob, 'development', 8, 3 * 86400),
+        ]:
+            self.completed(creator, task_type, START + timedelta(days=day), seconds)
+        Task.objects.create(name='Open task', description='x', created_by=self.alice)
+
+    def completed(self, creator, task_type, created_at, seconds):
+        task = Task.objects.create(
+            name='Done', description='x', task_type=task_type, created_by=creator
+        )
+        Task.objects.filter(pk=task.pk).update(
+            status='completed', created_at=created_at,
+            completed_at=created_at + timedelta(seconds=seconds),
+        )
+
+    def groups(self, report):
+        return {group['key']: group for group in report['groups']}
+
+    def test_overall(self):
+        (group,) = duration_report()['groups']
+        self.assertEqual(group['count'], 5)
+        self.assertAlmostEqual(group['mean'], (30 + 90 + 7200 + 600 + 3 * 86400) / 5, places=2)
+        self.assertAlmostEqual(group['min'], 30, places=2)
+        self.assertAlmostEqual(group['max'], 3 * 86400, places=2)
+        self.assertAlmostEqual(group['p50'], 600, places=2)
+        self.assertEqual(sum(group['histogram']), 5)
+        self.assertEqual(len(group['histogram']), len(HISTOGRAM_EDGES) - 1)
+
+    def test_group_by_task_type_and_creator(self):
+        by_type = self.groups(duration_report(group_by='task_type', batch_size=2))
+        self.assertEqual(by_type['testing']['count'], 3)
+        self.assertAlmostEqual(by_type['testing']['p50'], 90, places=2)
+        self.assertAlmostEqual(by_type['development']['mean'], (600 + 3 * 86400) / 2, places=2)
+
+        by_creator = self.groups(duration_report(group_by='created_by'))
+        self.assertEqual(by_creator[self.alice.pk]['count'], 3)
+        self.assertEqual(by_creator[self.bob.pk]['count'], 2)
+
+    def test_group_by_window(self):
+        by_week = duration_report(group_by='window', window='week')
+        self.assertEqual([group['count'] for group in by_week['groups']], [3, 2])
+        by_day = duration_report(group_by='window', window='day')
+        self.assertEqual([group['count'] for group in by_day['groups']], [2, 1, 1, 1])
+
+    def test_endpoint(self):
+        response = self.client.get(self.url, {'group_by': 'task_type', 'task_type': 'testing'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([group['key'] for group in response.data['groups']], ['testing'])
+
+        response = self.client.get(self.url, {'status': 'pending'})
+        self.assertEqual(response.data['groups'], [])
+
+        for params in ({'group_by': 'status'}, {'group_by': 'window', 'window': 'year'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
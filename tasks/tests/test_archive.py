@@ -0,0 +1,160 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..archive import archive_tasks
+from ..models import AllTask, ArchivedAssignment, ArchivedTask, Task
+from ..stats import stored_summary, summary_drift
+
+
+@override_settings(TASKS_ARCHIVE_AFTER_DAYS=30)
+class TaskArchiveTest(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.alice)
+
+    def create(self, name, days_ago=None, **fields):
+        if days_ago is not None:
+            fields['status'] = 'completed'
+        task = Task.objects.create(
+            name=name, description=f'{name} notes', created_by=self.alice, **fields
+        )
+        task.assigned_to.set([self.alice, self.bob])
+        if days_ago is not None:
+            completed_at = timezone.now() - timedelta(days=days_ago)
+            Task.objects.filter(pk=task.pk).update(completed_at=completed_at)
+        return task
+
+    def list_ids(self, url, query=''):
+        response = self.client.get(url + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [task['id'] for task in results]
+
+    def test_archive_moves_old_completed_tasks(self):
+        old = [self.create(f'Old {i}', days_ago=40 + i, task_type='testing') for i in range(3)]
+        recent = self.create('Recent', days_ago=5)
+        pending = self.create('Pending')
+        before = {task.pk: Task.objects.values().get(pk=task.pk) for task in old}
+        for row in before.values():
+            # The archive has no snapshot; reads use its assignment table.
+            del row['assignee_snapshot']
+
+        progress = []
+        self.assertEqual(archive_tasks(batch_size=2, progress=progress.append), 3)
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(sorted(Task.objects.values_list('id', flat=True)), [recent.pk, pending.pk])
+        for pk, row in before.items():
+            archived = ArchivedTask.objects.values().get(pk=pk)
+            self.assertIsNotNone(archived.pop('archived_at'))
+            self.assertEqual(archived, row)
+        self.assertEqual(
+            sorted(ArchivedAssignment.objects.values_list('task_id', 'user_id')),
+            sorted((task.pk, user.pk) for task in old for user in (self.alice, self.bob)),
+        )
+        self.assertFalse(Task.assigned_to.through.objects.filter(task_id__in=before).exists())
+        # Archived tasks are still counted.
+        self.assertEqual(stored_summary()[('completed', 'testing')], 3)
+        self.assertEqual(summary_drift(), {})
+        self.assertEqual(archive_tasks(), 0)
+
+    def test_limit_and_age(self):
+        for i in range(3):
+            self.create(f'Old {i}', days_ago=40)
+        self.assertEqual(archive_tasks(limit=2), 2)
+        self.assertEqual(archive_tasks(older_than=timedelta(days=50)), 0)
+        self.assertEqual(archive_tasks(older_than=timedelta(days=10)), 1)
+
+    def test_reads_include_archived_on_request(self):
+        archived = self.create('Archived deploy', days_ago=40)
+        live = self.create('Live deploy')
+        archive_tasks()
+        list_url = reverse('task-list')
+
+        both = [live.pk, archived.pk]
+        self.assertEqual(self.list_ids(list_url), [live.pk])
+        self.assertEqual(self.list_ids(list_url, '?include_archived=true'), both)
+        self.assertEqual(
+            self.list_ids(list_url, '?include_archived=true&status=completed'), [archived.pk]
+        )
+        self.assertEqual(self.list_ids(list_url, '?include_archived=1&q=deploy'), both)
+        self.assertEqual(self.list_ids(list_url, '?include_archived=true&pagination=cursor'), both)
+        response = self.client.get(list_url + '?include_archived=true&expand=assigned_to')
+        task = response.data['results'][1]
+        self.assertEqual(task['name'], 'Archived deploy')
+        self.assertEqual([user['username'] for user in task['assigned_to']], ['alice', 'bob'])
+
+        for url in (reverse('user-tasks-list', args=[self.bob.pk]),
+                    reverse('user-tasks-by-username', args=['bob'])):
+            with self.subTest(url):
+                self.assertEqual(self.list_ids(url), [live.pk])
+                self.assertEqual(self.list_ids(url, '?include_archived=true'), both)
+
+        detail_url = reverse('task-detail', args=[archived.pk])
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(detail_url + '?include_archived=true')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['name'], response.data['assigned_to']),
+                         ('Archived deploy', [self.alice.pk, self.bob.pk]))
+        response = self.client.get(reverse('task-export') + '?include_archived=true')
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [archived.pk, live.pk])
+        response = self.client.get(
+            reverse('task-durations') + '?include_archived=true&group_by=created_by'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([group['count'] for group in response.data['groups']], [1])
+
+    def test_archived_tasks_are_read_only(self):
+        archived = self.create('Archived', days_ago=40)
+        archive_tasks()
+        url = reverse('task-detail', args=[archived.pk]) + '?include_archived=true'
+        response = self.client.patch(url, {'status': 'pending'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('task-list') + '?include_archived=maybe')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('include_archived', response.data['error']['details'])
+
+    def test_archiving_invalidates_cached_lists(self):
+        archived = self.create('Archived', days_ago=40)
+        url = reverse('user-tasks-list', args=[self.bob.pk])
+        self.assertEqual(self.list_ids(url), [archived.pk])
+        archive_tasks()
+        self.assertEqual(self.list_ids(url), [])
+
+    def test_new_ids_do_not_reuse_archived_ids(self):
+        archived = self.create('Newest', days_ago=40)
+        archive_tasks()
+        task = Task.objects.create(name='After', description='x', created_by=self.alice)
+        self.assertGreater(task.pk, archived.pk)
+        self.assertEqual(AllTask.objects.count(), 2)
+
+    def test_deleting_a_user_keeps_counters_exact(self):
+        self.create('Archived', days_ago=40)
+        archive_tasks()
+        self.alice.delete()
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertEqual(+stored_summary(), {})
+        self.assertEqual(summary_drift(), {})
+
+    def test_command(self):
+        for i in range(3):
+            self.create(f'Old {i}', days_ago=40)
+        out = StringIO()
+        call_command('archive_tasks', dry_run=True, stdout=out)
+        self.assertIn('3 task(s) completed more than 30 day(s) ago', out.getvalue())
+        call_command('archive_tasks', older_than_days=60, stdout=out)
+        self.assertIn('Archived 0 task(s)', out.getvalue())
+        call_command('archive_tasks', batch_size=2, stdout=out)
+        self.assertIn('Archived 3 task(s)', out.getvalue())
+        self.assertEqual(ArchivedTask.objects.count(), 3)
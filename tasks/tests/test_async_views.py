@@ -0,0 +1,147 @@
+import inspect
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, TestCase
+from django.urls import include, path, resolve, reverse
+
+from ..api.async_views import async_read_urlpatterns
+from ..archive import archive_tasks
+from ..models import Task
+from ..urls import router, urlpatterns as api_urlpatterns
+
+# Same routes as tasks.urls with TASKS_ASYNC_VIEWS enabled.
+urlpatterns = [path('api/', include(async_read_urlpatterns(router.urls + api_urlpatterns[1:])))]
+ASYNC_URLCONF = __name__
+
+
+class AsyncReadViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='x', first_name='Read')
+        cls.other = User.objects.create_user(username='other', password='x')
+        cls.tasks = []
+        for i in range(14):
+            task = Task.objects.create(
+                name=f'Async task {i}',
+                description='Deploy the async stack' if i % 3 else 'Plain',
+                status='completed' if i % 4 == 0 else 'pending',
+                task_type='testing' if i % 2 else 'development',
+                created_by=cls.user if i % 2 else cls.other,
+            )
+            task.assigned_to.set([cls.user, cls.other][:i % 3])
+            cls.tasks.append(task)
+
+    def setUp(self):
+        self.sync_client = Client()
+        self.sync_client.force_login(self.user)
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+    async def compare(self, url, **headers):
+        sync_response = await self.sync_get(url, **headers)
+        with self.settings(ROOT_URLCONF=ASYNC_URLCONF):
+            async_response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code, url)
+        if sync_response.content:
+            self.assertEqual(
+                json.loads(async_response.content), json.loads(sync_response.content), url
+            )
+        self.assertEqual(async_response.get('ETag'), sync_response.get('ETag'), url)
+        return async_response
+
+    async def sync_get(self, url, **headers):
+        return await sync_to_async(self.sync_client.get)(url, headers=headers)
+
+    async def test_read_routes_match_sync_views(self):
+        task = self.tasks[3]
+        urls = [
+            reverse('task-list'),
+            reverse('task-list') + '?page=2',
+            reverse('task-list') + '?page=9',
+            reverse('task-list') + '?pagination=cursor',
+            reverse('task-list') + '?status=pending&task_type=testing',
+            reverse('task-list') + '?q=async stack',
+            reverse('task-list') + '?fields=id,name,assigned_to&expand=assigned_to',
+            reverse('task-list') + '?fields=bogus',
+            reverse('task-detail', args=[task.pk]) + '?expand=created_by',
+            reverse('task-detail', args=[task.pk]),
+            reverse('task-detail', args=[999]),
+            reverse('task-detail', args=['abc']),
+            reverse('task-assignments', args=[self.tasks[2].pk]),
+            reverse('user-tasks-list', args=[self.user.pk]),
+            reverse('user-tasks-detail', args=[self.user.pk, self.tasks[1].pk]),
+            reverse('user-tasks-by-username', args=['reader']),
+            reverse('user-tasks-by-username', args=['reader']) + '?fields=id,created_by',
+            reverse('user-tasks-by-username', args=['nobody']),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                view = resolve(url.split('?')[0], urlconf=ASYNC_URLCONF).func
+                self.assertTrue(inspect.iscoroutinefunction(view))
+                await self.compare(url)
+
+        response = await self.compare(reverse('task-list') + '?pagination=cursor')
+        await self.compare(json.loads(response.content)['next'].replace('http://testserver', ''))
+
+    async def test_include_archived(self):
+        archived = await sync_to_async(archive_tasks)(older_than=timedelta(0))
+        self.assertEqual(archived, 4)
+        task = self.tasks[4]
+        for url in (
+            reverse('task-list') + '?include_archived=true',
+            reverse('task-list') + '?include_archived=true&pagination=cursor&status=completed',
+            reverse('task-detail', args=[task.pk]),
+            reverse('task-detail', args=[task.pk]) + '?include_archived=true',
+            reverse('task-assignments', args=[task.pk]) + '?include_archived=true',
+            reverse('user-tasks-list', args=[self.user.pk]) + '?include_archived=true',
+            reverse('user-tasks-by-username', args=['reader'])
+            + '?include_archived=true&expand=assigned_to',
+            reverse('task-list') + '?include_archived=maybe',
+        ):
+            with self.subTest(url=url):
+                await self.compare(url)
+
+    async def test_username_stream(self):
+        for name in ('reader', 'nobody'):
+            url = reverse('user-tasks-by-username', args=[name]) + '?stream=true&expand=assigned_to'
+            with self.subTest(url=url):
+                sync_response = await self.sync_get(url)
+                with self.settings(ROOT_URLCONF=ASYNC_URLCONF, TASKS_BULK_BATCH_SIZE=3):
+                    async_response = await self.async_client.get(url)
+                self.assertEqual(async_response.status_code, sync_response.status_code)
+                if sync_response.streaming:
+                    sync_content = b''.join(sync_response.streaming_content)
+                    async_content = b''.join(
+                        [chunk async for chunk in async_response.streaming_content]
+                    )
+                    self.assertEqual(json.loads(async_content), json.loads(sync_content))
+                    self.assertEqual(len(json.loads(async_content)), 9)
+
+    async def test_conditional_requests(self):
+        url = reverse('task-list')
+        with self.settings(ROOT_URLCONF=ASYNC_URLCONF):
+            etag = (await self.async_client.get(url))['ETag']
+            response = await self.async_client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_requires_authentication(self):
+        with self.settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = await AsyncClient().get(reverse('task-list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('error', json.loads(response.content))
+
+    async def test_writes_fall_through_to_sync_views(self):
+        with self.settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = await self.async_client.post(
+                reverse('task-list'),
+                {'name': 'Created async', 'description': 'x'},
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 201)
+            url = reverse('task-detail', args=[self.tasks[0].pk])
+            response = await self.async_client.delete(url)
+            self.assertEqual(response.status_code, 403)
+        self.assertTrue(await Task.objects.filter(name='Created async').aexists())
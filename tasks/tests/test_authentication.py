@@ -0,0 +1,159 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from ..utils.authentication import (
+    AuthCache, CachedTokenAuthentication, _user_generation, auth_cache, invalidate_user,
+)
+
+
+def basic(username, password):
+    return 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+
+
+@override_settings(TASKS_AUTH_CACHE_TIMEOUT=60)
+class CachedAuthenticationTest(TestCase):
+    url = reverse('task-list')
+
+    def setUp(self):
+        auth_cache.clear()
+        self.user = User.objects.create_user(username='alice', password='secret')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+
+    def get(self, authorization):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_AUTHORIZATION=authorization)
+        return response, [q['sql'] for q in queries]
+
+    def test_token_lookup_is_cached(self):
+        response, first = self.get(f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('authtoken_token' in sql for sql in first))
+        response, second = self.get(f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('authtoken_token' in sql for sql in second))
+        # The miss also looked up whose token it is before verifying it.
+        self.assertEqual(len(second), len(first) - 2)
+
+    def test_cache_hits_return_the_token(self):
+        # request.auth is the Token instance whether or not the lookup was cached.
+        for _ in range(2):
+            user, auth = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+            self.assertEqual((user, auth), (self.user, self.token))
+            self.assertIsInstance(auth, Token)
+        self.assertEqual(len(auth_cache), 1)
+
+    def test_basic_password_is_hashed_once(self):
+        with mock.patch('rest_framework.authentication.authenticate', wraps=authenticate) as check:
+            for _ in range(3):
+                self.assertEqual(self.get(basic('alice', 'secret'))[0].status_code, 200)
+        self.assertEqual(check.call_count, 1)
+
+    def test_failed_credentials_are_not_cached(self):
+        self.assertEqual(self.get(basic('alice', 'wrong'))[0].status_code, 401)
+        self.assertEqual(self.get('Token nope')[0].status_code, 401)
+        self.assertEqual(len(auth_cache), 0)
+
+    def test_password_change_invalidates(self):
+        self.assertEqual(self.get(basic('alice', 'secret'))[0].status_code, 200)
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertEqual(self.get(basic('alice', 'secret'))[0].status_code, 401)
+        self.assertEqual(self.get(basic('alice', 'changed'))[0].status_code, 200)
+
+    def test_deactivation_invalidates(self):
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 401)
+
+    def test_token_delete_invalidates(self):
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 401)
+
+    def test_changes_during_verification_are_not_cached(self):
+        verify = TokenAuthentication.authenticate_credentials
+
+        def deactivated_meanwhile(authentication, key):
+            result = verify(authentication, key)
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            invalidate_user(self.user.pk)
+            return result
+
+        with mock.patch.object(TokenAuthentication, 'authenticate_credentials',
+                               deactivated_meanwhile):
+            self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 200)
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 401)
+
+    def test_other_processes_see_invalidation(self):
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 200)
+        # Another process changed the user: only the shared generation moved.
+        self.user.is_active = False
+        with mock.patch.object(auth_cache, 'invalidate_user'):
+            self.user.save()
+        self.assertEqual(self.get(f'Token {self.token.key}')[0].status_code, 401)
+
+    # The engine used with a shared cache.
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_session_user_is_cached(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        sql = [q['sql'] for q in queries]
+        self.assertFalse(any('django_session' in s or 'FROM "auth_user"' in s for s in sql), sql)
+
+    def test_session_password_change_logs_out(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.set_password('changed')
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+@override_settings(TASKS_AUTH_CACHE_TIMEOUT=60)
+class AuthCacheTest(TestCase):
+    def setUp(self):
+        self.cache = AuthCache()
+        self.users = [User.objects.create(username=f'user{i}') for i in range(3)]
+
+    def set(self, key, user):
+        self.cache.set(key, user, None, _user_generation(user.pk))
+
+    @override_settings(TASKS_AUTH_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        self.set('a', self.users[0])
+        self.set('b', self.users[1])
+        self.cache.get('a')
+        self.set('c', self.users[2])
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), (self.users[0], None))
+        self.assertEqual(self.cache.get('c'), (self.users[2], None))
+
+    def test_entries_expire(self):
+        with mock.patch('tasks.utils.authentication.time.monotonic', return_value=1000):
+            self.set('a', self.users[0])
+        with mock.patch('tasks.utils.authentication.time.monotonic', return_value=1059):
+            self.assertIsNotNone(self.cache.get('a'))
+        with mock.patch('tasks.utils.authentication.time.monotonic', return_value=1061):
+            self.assertIsNone(self.cache.get('a'))
+
+    @override_settings(TASKS_AUTH_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables(self):
+        self.set('a', self.users[0])
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_returns_copies(self):
+        self.set('a', self.users[0])
+        self.assertIsNot(self.cache.get('a')[0], self.cache.get('a')[0])
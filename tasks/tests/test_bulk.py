@@ -0,0 +1,181 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Task
+
+
+class BulkTaskAPITest(APITestCase):
+    def setUp(self):
+        self.user1 = User.objects.create(username='bulk1')
+        self.user2 = User.objects.create(username='bulk2')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+        self.url = reverse('task-bulk')
+
+    def test_bulk_create(self):
+        payload = [
+            {
+                'name': f'Bulk task {i}',
+                'description': 'Imported',
+                'task_type': 'testing',
+                'assigned_to_ids': [self.user1.id, self.user2.id],
+            }
+            for i in range(30)
+        ]
+        payload[0]['status'] = 'completed'
+
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 30)
+        self.assertEqual(Task.objects.filter(created_by=self.user1).count(), 30)
+        self.assertEqual(Task.assigned_to.through.objects.count(), 60)
+
+        completed = Task.objects.get(pk=response.data['ids'][0])
+        self.assertIsNotNone(completed.completed_at)
+        self.assertIsNotNone(completed.created_at)
+        self.assertIsNone(Task.objects.get(pk=response.data['ids'][1]).completed_at)
+
+    @override_settings(TASKS_BULK_BATCH_SIZE=10)
+    def test_bulk_create_query_count_is_per_batch(self):
+        payload = [
+            {'name': f'Task {i}', 'description': 'x', 'assigned_to_ids': [self.user2.id]}
+            for i in range(40)
+        ]
+        # 4 user checks, savepoint pair, 4 task inserts, 4 assignment inserts,
+        # 1 summary counter update, 4 assignee snapshot reads and 4 writes,
+        # per-user counter insert and update, 4 change log inserts.
+        with self.assertNumQueries(29):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        payload = [
+            {'name': 'Valid task', 'description': 'x'},
+            {'name': 'ab', 'description': 'x'},
+            {'name': 'Unknown user', 'description': 'x', 'assigned_to_ids': [999]},
+        ]
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error']['code'], 'invalid_tasks')
+        self.assertEqual(set(response.data['error']['details']), {'1', '2'})
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_bulk_create_rejects_non_list(self):
+        response = self.client.post(self.url, {'name': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error']['code'], 'invalid_payload')
+
+    @override_settings(TASKS_BULK_MAX_ITEMS=2)
+    def test_bulk_create_limit(self):
+        payload = [{'name': 'Task', 'description': 'x'}] * 3
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.data['error']['code'], 'too_many_items')
+
+    def test_bulk_delete_only_own_tasks(self):
+        own = Task.objects.create(name='Own', description='x', created_by=self.user1)
+        own.assigned_to.add(self.user2)
+        other = Task.objects.create(name='Other', description='x', created_by=self.user2)
+
+        response = self.client.delete(self.url, {'ids': [own.id, other.id, 999]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {'deleted': [own.id], 'forbidden': [other.id], 'missing': [999]}
+        )
+        self.assertFalse(Task.objects.filter(pk=own.pk).exists())
+        self.assertTrue(Task.objects.filter(pk=other.pk).exists())
+        self.assertFalse(Task.assigned_to.through.objects.filter(task_id=own.pk).exists())
+
+    def test_assignments_are_the_only_rows_pointing_at_tasks(self):
+        # bulk_delete_tasks and archive_tasks delete tasks without Django's
+        # deletion collector, clearing only the assignment rows by hand. A new
+        # relation to Task needs handling there before this is updated.
+        related = [
+            field.related_model
+            for field in Task._meta.get_fields(include_hidden=True)
+            if field.auto_created and not field.concrete
+        ]
+        self.assertEqual(related, [Task.assigned_to.through])
+
+
+class BulkAssignAPITest(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username='owner')
+        self.other = User.objects.create(username='other')
+        self.users = [User.objects.create(username=f'worker{i}') for i in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.url = reverse('task-bulk-assign')
+        self.tasks = [
+            Task.objects.create(
+                name=f'Task {i}',
+                description='x',
+                task_type='testing' if i % 2 else 'development',
+                created_by=self.owner,
+            )
+            for i in range(4)
+        ]
+        self.tasks[0].assigned_to.set([self.users[0], self.users[1]])
+
+    def assignees(self, task):
+        return sorted(task.assigned_to.values_list('id', flat=True))
+
+    def test_mapping_mode(self):
+        foreign = Task.objects.create(name='Foreign', description='x', created_by=self.other)
+        payload = {
+            'assignments': {
+                str(self.tasks[0].id): [self.users[1].id, self.users[2].id],
+                str(self.tasks[1].id): [self.users[0].id],
+                str(self.tasks[2].id): [],
+                str(foreign.id): [self.users[0].id],
+                '999': [self.users[0].id],
+            }
+        }
+        # Savepoint pair, user check, owner lookup, current rows, delete, insert,
+        # updated_at touch, assignee snapshot read and write, task status read,
+        # per-user counter insert and update, change log insert.
+        with self.assertNumQueries(14):
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {item['id']: item for item in response.data['results']}
+
+        self.assertEqual(results[self.tasks[0].id]['result'], 'updated')
+        self.assertEqual(results[self.tasks[0].id]['added'], [self.users[2].id])
+        self.assertEqual(results[self.tasks[0].id]['removed'], [self.users[0].id])
+        self.assertEqual(results[self.tasks[2].id]['result'], 'unchanged')
+        self.assertEqual(results[foreign.id]['result'], 'forbidden')
+        self.assertEqual(results[999]['result'], 'not_found')
+
+        self.assertEqual(self.assignees(self.tasks[0]), [self.users[1].id, self.users[2].id])
+        self.assertEqual(self.assignees(self.tasks[1]), [self.users[0].id])
+        self.assertEqual(self.assignees(foreign), [])
+
+    def test_filter_mode_only_touches_own_matching_tasks(self):
+        foreign = Task.objects.create(
+            name='Foreign', description='x', task_type='testing', created_by=self.other
+        )
+        payload = {'filter': {'task_type': 'testing'}, 'user_ids': [self.users[2].id]}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(item['id'] for item in response.data['results']),
+            [self.tasks[1].id, self.tasks[3].id],
+        )
+        self.assertEqual(self.assignees(self.tasks[3]), [self.users[2].id])
+        self.assertEqual(self.assignees(self.tasks[0]), [self.users[0].id, self.users[1].id])
+        self.assertEqual(self.assignees(foreign), [])
+
+    def test_unknown_users_reject_whole_request(self):
+        payload = {'assignments': {str(self.tasks[1].id): [self.users[0].id, 999]}}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error']['details'], {'missing_ids': [999]})
+        self.assertEqual(self.assignees(self.tasks[1]), [])
+
+    def test_requires_exactly_one_mode(self):
+        for payload in ({}, {'assignments': {'1': [1]}, 'user_ids': [1]}, {'filter': {}}):
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..cache import cache_stats
+from ..models import Task
+from ..services import bulk_assign_tasks, bulk_delete_tasks
+
+
+@override_settings(TASKS_RESPONSE_CACHE_TIMEOUT=300)
+class UserTaskCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username='owner')
+        self.worker = User.objects.create(username='worker')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.task = Task.objects.create(name='Cached task', description='x', created_by=self.owner)
+        self.task.assigned_to.add(self.worker)
+        self.by_id = reverse('user-tasks-list', kwargs={'user_id': self.worker.id})
+        self.by_name = reverse('user-tasks-by-username', kwargs={'username': 'worker'})
+
+    def names(self, url):
+        data = self.client.get(url).data
+        results = data['results'] if isinstance(data, dict) else data
+        return [item['name'] for item in results]
+
+    def test_repeat_reads_hit_the_cache(self):
+        self.assertEqual(self.names(self.by_id), ['Cached task'])
+        # Only the ETag aggregate touches the database.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names(self.by_id), ['Cached task'])
+        stats = cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_task_update_invalidates(self):
+        self.names(self.by_id)
+        self.names(self.by_name)
+        self.task.name = 'Renamed task'
+        self.task.save()
+        self.assertEqual(self.names(self.by_id), ['Renamed task'])
+        self.assertEqual(self.names(self.by_name), ['Renamed task'])
+
+    def test_assignment_changes_invalidate(self):
+        other = Task.objects.create(name='Other task', description='x', created_by=self.owner)
+        self.names(self.by_id)
+        self.worker.assigned_tasks.add(other)
+        self.assertEqual(sorted(self.names(self.by_id)), ['Cached task', 'Other task'])
+        self.task.assigned_to.clear()
+        self.assertEqual(self.names(self.by_id), ['Other task'])
+
+    def test_delete_and_bulk_paths_invalidate(self):
+        other = Task.objects.create(name='Other task', description='x', created_by=self.owner)
+        self.names(self.by_name)
+        bulk_assign_tasks({other.id: [self.worker.id]}, self.owner)
+        self.assertEqual(sorted(self.names(self.by_name)), ['Cached task', 'Other task'])
+        bulk_delete_tasks([other.id], self.owner)
+        self.assertEqual(self.names(self.by_name), ['Cached task'])
+        self.task.delete()
+        self.assertEqual(self.names(self.by_name), [])
+
+    def test_user_profile_change_invalidates(self):
+        url = self.by_id + '?expand=created_by'
+        self.client.get(url)
+        self.owner.email = 'owner@example.com'
+        self.owner.save()
+        data = self.client.get(url).data['results']
+        self.assertEqual(data[0]['created_by']['email'], 'owner@example.com')
+
+    def test_unknown_username_is_not_cached(self):
+        url = reverse('user-tasks-by-username', kwargs={'username': 'nobody'})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        User.objects.create(username='nobody')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @override_settings(TASKS_RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.names(self.by_id)
+        self.names(self.by_id)
+        self.assertEqual(cache_stats()['hits'], 0)
+
+    def test_stats_endpoint_is_admin_only(self):
+        url = reverse('task-cache-stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.owner.is_staff = True
+        self.owner.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('hit_ratio', response.data)
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..archive import archive_tasks
+from ..changes import compact_changes, read_changes
+from ..models import Task, TaskChange
+from ..services import bulk_assign_tasks, bulk_create_tasks, bulk_delete_tasks, bulk_set_status
+
+
+class TaskChangeFeedTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='syncer')
+        self.other = User.objects.create(username='other')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-changes')
+
+    def logged(self, since=0):
+        return list(TaskChange.objects.filter(id__gt=since).values_list('task_id', 'action'))
+
+    def cursor(self):
+        return TaskChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    def test_every_write_path_is_logged(self):
+        task = Task.objects.create(name='Logged', description='x', created_by=self.user)
+        task.name = 'Renamed'
+        task.save()
+        task.status = 'in_progress'
+        task.save()
+        task.assigned_to.add(self.other)
+        self.other.assigned_tasks.remove(task)
+        self.assertEqual(self.logged(), [
+            (task.pk, 'created'), (task.pk, 'updated'), (task.pk, 'status_changed'),
+            (task.pk, 'assigned'), (task.pk, 'assigned'),
+        ])
+
+        since = self.cursor()
+        tasks = bulk_create_tasks(
+            [{'name': f'Bulk {i}', 'description': 'x'} for i in range(2)], created_by=self.user
+        )
+        bulk_assign_tasks({tasks[0].pk: [self.other.pk]}, self.user)
+        bulk_set_status([tasks[1].pk], 'completed')
+        Task.objects.filter(pk=tasks[1].pk).update(completed_at=timezone.now() - timedelta(days=2))
+        archive_tasks(timedelta(days=1))
+        self.other.delete()
+        bulk_delete_tasks([tasks[0].pk], self.user)
+        task_id = task.pk
+        task.delete()
+        self.assertEqual(self.logged(since), [
+            (tasks[0].pk, 'created'), (tasks[1].pk, 'created'), (tasks[0].pk, 'assigned'),
+            (tasks[1].pk, 'status_changed'), (tasks[1].pk, 'archived'), (tasks[0].pk, 'assigned'),
+            (tasks[0].pk, 'deleted'), (task_id, 'deleted'),
+        ])
+
+    def test_feed_returns_each_task_once_in_batches(self):
+        first = Task.objects.create(name='First', description='x', created_by=self.user)
+        second = Task.objects.create(name='Second', description='x', created_by=self.user)
+        first.assigned_to.add(self.other)
+        second_id = second.pk
+        second.delete()
+
+        response = self.client.get(self.url + '?fields=id,name,assigned_to')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(change['task_id'], change['action']) for change in response.data['changes']],
+            [(first.pk, 'assigned'), (second_id, 'deleted')],
+        )
+        self.assertIsNone(response.data['changes'][1]['task'])
+        self.assertEqual(response.data['changes'][0]['task'],
+                         {'id': first.pk, 'name': 'First', 'assigned_to': [self.other.pk]})
+        self.assertEqual(response.data['cursor'], self.cursor())
+        self.assertFalse(response.data['has_more'])
+
+        response = self.client.get(self.url + '?limit=2')
+        self.assertTrue(response.data['has_more'])
+        # The second task is gone; its deletion comes in a later batch.
+        self.assertEqual([change['task_id'] for change in response.data['changes']], [first.pk])
+        response = self.client.get(self.url + f'?limit=2&since={response.data["cursor"]}')
+        self.assertEqual([change['action'] for change in response.data['changes']],
+                         ['assigned', 'deleted'])
+        response = self.client.get(self.url + f'?since={response.data["cursor"]}')
+        self.assertEqual(response.data['changes'], [])
+        self.assertEqual(response.data['cursor'], self.cursor())
+
+        response = self.client.get(self.url + '?since=-1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', response.data['error']['details'])
+
+    @override_settings(TASKS_CHANGE_FEED_SETTLE_SECONDS=10)
+    def test_unsettled_gaps_hold_the_cursor(self):
+        tasks = [
+            Task.objects.create(name=f'Task {i}', description='x', created_by=self.user)
+            for i in range(3)
+        ]
+        # As if the second entry's transaction had not committed yet.
+        TaskChange.objects.filter(task_id=tasks[1].pk).delete()
+        first = TaskChange.objects.get(task_id=tasks[0].pk)
+
+        entries, cursor, has_more = read_changes(0, 10)
+        self.assertEqual([entry.task_id for entry in entries], [tasks[0].pk])
+        self.assertEqual((cursor, has_more), (first.pk, False))
+        # Once the entry after it has settled, the gap is passed.
+        entries, cursor, _ = read_changes(0, 10, now=timezone.now() + timedelta(seconds=11))
+        self.assertEqual([entry.task_id for entry in entries], [tasks[0].pk, tasks[2].pk])
+
+    def test_compaction_expires_older_cursors(self):
+        old = Task.objects.create(name='Old', description='x', created_by=self.user)
+        old.assigned_to.add(self.other)
+        kept = self.cursor()
+        TaskChange.objects.update(changed_at=timezone.now() - timedelta(days=40))
+        Task.objects.create(name='New', description='x', created_by=self.user)
+
+        with override_settings(TASKS_CHANGE_LOG_RETENTION_DAYS=30):
+            self.assertEqual(compact_changes(batch_size=1), 1)
+            self.assertEqual(compact_changes(), 0)
+        # Reading from 0 starts after the compacted entries.
+        response = self.client.get(self.url + '?since=0')
+        self.assertEqual([change['action'] for change in response.data['changes']], ['created'])
+        self.assertEqual(response.data['cursor'], self.cursor())
+        response = self.client.get(self.url + f'?since={kept - 1}')
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(response.data['error']['code'], 'cursor_expired')
+        self.assertEqual(response.data['error']['details']['cursor'], self.cursor())
+        response = self.client.get(self.url + f'?since={kept}')
+        self.assertEqual([change['action'] for change in response.data['changes']], ['created'])
+        # A cursor the log never reached.
+        response = self.client.get(self.url + f'?since={kept + 100}')
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_compact_command(self):
+        for i in range(3):
+            Task.objects.create(name=f'Task {i}', description='x', created_by=self.user)
+        TaskChange.objects.update(changed_at=timezone.now() - timedelta(days=5))
+        with self.assertRaisesMessage(CommandError, '--batch-size must be positive'):
+            call_command('compact_task_changes', batch_size=0)
+        out = StringIO()
+        call_command('compact_task_changes', older_than_days=1, dry_run=True, stdout=out)
+        self.assertIn('2 change log entr(ies) logged more than 1 day(s) ago.', out.getvalue())
+        call_command('compact_task_changes', older_than_days=1, stdout=out)
+        self.assertIn('Deleted 2 change log entr(ies)', out.getvalue())
+        self.assertEqual(self.logged(), [(0, 'compacted')])
@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Task
+from ..services import bulk_assign_tasks
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username='owner')
+        self.worker = User.objects.create(username='worker')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.task = Task.objects.create(name='Etag task', description='x', created_by=self.owner)
+        self.task.assigned_to.add(self.worker)
+
+    def urls(self):
+        return [
+            reverse('task-list'),
+            reverse('task-list') + '?status=pending',
+            reverse('task-detail', kwargs={'pk': self.task.pk}),
+            reverse('user-tasks-list', kwargs={'user_id': self.worker.id}),
+            reverse('user-tasks-by-username', kwargs={'username': 'worker'}),
+        ]
+
+    def assert_revalidates(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        # One aggregate query and no row fetches for an unchanged resource.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        return etag
+
+    def test_unchanged_resources_return_304(self):
+        for url in self.urls():
+            with self.subTest(url=url):
+                self.assert_revalidates(url)
+
+    def test_changes_produce_new_etags(self):
+        other = Task.objects.create(name='Other', description='x', created_by=self.owner)
+        every_url = self.urls()
+        user_lists = every_url[3:] + every_url[:1]
+        changes = [
+            (lambda: Task.objects.get(pk=self.task.pk).save(), every_url),
+            (lambda: self.task.assigned_to.add(self.owner), every_url),
+            (lambda: bulk_assign_tasks({self.task.pk: [self.worker.id]}, self.owner), every_url),
+            (lambda: self.worker.assigned_tasks.add(other), user_lists),
+            (lambda: self.worker.save(), every_url),
+        ]
+        for index, (change, changed_urls) in enumerate(changes):
+            etags = {url: self.client.get(url)['ETag'] for url in changed_urls}
+            change()
+            for url, etag in etags.items():
+                with self.subTest(url=url, change=index):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_removals_change_list_validators(self):
+        url = reverse('task-list')
+        Task.objects.create(name='Newest', description='x', created_by=self.owner)
+        detail = self.client.get(reverse('task-detail', kwargs={'pk': self.task.pk}))
+        self.assertIn('Last-Modified', detail)
+        response = self.client.get(url)
+        # max(updated_at) stays put when a task is deleted, so lists have no date.
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        Task.objects.filter(pk=self.task.pk).delete()
+        since = detail['Last-Modified']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['name'] for task in response.data['results']], ['Newest'])
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_updated_at_tracks_assignment_changes(self):
+        before = Task.objects.get(pk=self.task.pk).updated_at
+        self.task.assigned_to.remove(self.worker)
+        self.assertGreater(Task.objects.get(pk=self.task.pk).updated_at, before)
+
+    def test_missing_task_has_no_etag(self):
+        response = self.client.get(reverse('task-detail', kwargs={'pk': 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('ETag', response)
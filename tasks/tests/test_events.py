@@ -0,0 +1,189 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..changes import compact_changes
+from ..events import bus
+from ..models import Task, TaskChange
+
+
+def parse_events(text):
+    """``(event, id, data)`` for every message in an event stream body."""
+    events = []
+    for message in text.split('\n\n'):
+        lines = [line for line in message.splitlines() if not line.startswith(':')]
+        fields = dict(line.split(': ', 1) for line in lines)
+        if 'retry' in fields or not fields:
+            continue
+        data = fields.get('data')
+        events.append((fields.get('event'), fields.get('id'), json.loads(data) if data else None))
+    return events
+
+
+class TaskEventStreamTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='listener', password='x')
+        self.other = User.objects.create_user(username='other', password='x')
+        self.client = AsyncClient()
+        self.client.force_login(self.user)
+        self.url = reverse('task-events')
+
+    def create(self, name, status='pending', assignees=()):
+        task = Task.objects.create(name=name, description='x', status=status, created_by=self.user)
+        task.assigned_to.set(assignees)
+        return task
+
+    def cursor(self):
+        return TaskChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    async def read_all(self, url, **headers):
+        response = await self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return parse_events(''.join([chunk.decode() async for chunk in response.streaming_content]))
+
+    @override_settings(TASKS_EVENT_STREAM_MAX_SECONDS=0)
+    async def test_catches_up_with_filters(self):
+        mine = await sync_to_async(self.create)('Mine', assignees=[self.user])
+        theirs = await sync_to_async(self.create)('Theirs', assignees=[self.other])
+        done = await sync_to_async(self.create)('Done', status='completed', assignees=[self.user])
+        gone = await sync_to_async(self.create)('Gone')
+        gone_id = gone.pk
+        await gone.adelete()
+        last = await sync_to_async(self.cursor)()
+        streams = len(bus)
+
+        query = f'?since=0&status=pending&assigned_to={self.user.pk}&fields=id,name'
+        events = await self.read_all(self.url + query)
+        self.assertEqual(events[:2], [
+            ('assigned', events[0][1], {
+                'seq': int(events[0][1]), 'task_id': mine.pk, 'action': 'assigned',
+                'changed_at': events[0][2]['changed_at'], 'task': {'id': mine.pk, 'name': 'Mine'},
+            }),
+            ('left', events[1][1], {
+                'seq': int(events[1][1]), 'task_id': theirs.pk, 'action': 'left',
+                'changed_at': events[1][2]['changed_at'], 'task': None,
+            }),
+        ])
+        self.assertEqual([(event, id, data['task_id']) for event, id, data in events[2:]],
+                         [('left', events[2][1], done.pk), ('deleted', str(last), gone_id)])
+        # A finished stream leaves the bus.
+        self.assertEqual(len(bus), streams)
+
+        query = f'?since={events[0][1]}&assigned_to={self.other.pk}'
+        events = await self.read_all(self.url + query)
+        self.assertEqual([(event, data['task_id']) for event, _, data in events],
+                         [('assigned', theirs.pk), ('left', done.pk), ('deleted', gone_id)])
+        # Without a cursor the stream starts at the end of the log.
+        self.assertEqual(await self.read_all(self.url), [])
+        later = await sync_to_async(self.create)('Later', assignees=[self.other])
+        events = await self.read_all(self.url + f'?since={last}&assigned_to={self.user.pk}')
+        self.assertEqual([(event, id, data['task_id']) for event, id, data in events],
+                         [('left', str(await sync_to_async(self.cursor)()), later.pk)])
+
+    @override_settings(TASKS_EVENT_STREAM_MAX_SECONDS=0)
+    async def test_tasks_leaving_the_filters(self):
+        task = await sync_to_async(self.create)('Pending', assignees=[self.user])
+        since = await sync_to_async(self.cursor)()
+        task.status = 'completed'
+        await task.asave()
+        events = await self.read_all(self.url + f'?since={since}&status=pending&fields=id')
+        self.assertEqual([(event, data['task_id'], data['task']) for event, _, data in events],
+                         [('left', task.pk, None)])
+
+        # Once the entry after it is read, a deleted task is only sent as deleted.
+        since = await sync_to_async(self.cursor)()
+        task.name = 'Renamed'
+        await task.asave()
+        await task.adelete()
+        events = await self.read_all(self.url + f'?since={since}&status=pending')
+        self.assertEqual([event for event, _, _ in events], ['deleted'])
+
+    @override_settings(TASKS_EVENT_STREAM_MAX_SECONDS=30, TASKS_EVENT_STREAM_HEARTBEAT_SECONDS=30)
+    async def test_live_events_and_resume(self):
+        streams = len(bus)
+        response = await self.client.get(self.url + '?fields=id,status')
+        stream = response.streaming_content.__aiter__()
+        self.assertTrue((await anext(stream)).startswith(b'retry: '))
+        # The stream reads the (empty) log and waits to be woken.
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        self.assertFalse(reading.done())
+        self.assertEqual(len(bus), streams + 1)
+
+        def write():
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.create('Live')
+
+        task = await sync_to_async(write)()
+        event, id, data = parse_events((await asyncio.wait_for(reading, 5)).decode())[0]
+        self.assertEqual((event, data['task']), ('created', {'id': task.pk, 'status': 'pending'}))
+        await stream.aclose()
+
+        await Task.objects.filter(pk=task.pk).aupdate(status='completed')
+        await sync_to_async(TaskChange.objects.create)(task_id=task.pk, action='status_changed')
+        with self.settings(TASKS_EVENT_STREAM_MAX_SECONDS=0):
+            events = await self.read_all(self.url + '?fields=status', **{'Last-Event-ID': id})
+        self.assertEqual([(event, data['task']) for event, _, data in events],
+                         [('status_changed', {'status': 'completed'})])
+
+    @override_settings(TASKS_EVENT_STREAM_MAX_SECONDS=30, TASKS_EVENT_STREAM_HEARTBEAT_SECONDS=30)
+    async def test_events_are_sent_before_the_stream_ends(self):
+        task = await sync_to_async(self.create)('Early')
+        response = await self.client.get(self.url + '?since=0&fields=id')
+        stream = response.streaming_content.__aiter__()
+        await anext(stream)
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        event, _, data = parse_events(chunk.decode())[0]
+        self.assertEqual((event, data['task']), ('created', {'id': task.pk}))
+        # The stream is still open, waiting for the next change.
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+    async def test_wsgi_requests_are_refused(self):
+        client = Client()
+        await sync_to_async(client.force_login)(self.user)
+        response = await sync_to_async(client.get)(self.url)
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(json.loads(response.content)['error']['code'], 'asgi_required')
+
+    @override_settings(TASKS_EVENT_BACKEND='database', TASKS_EVENT_POLL_SECONDS=0.01)
+    async def test_database_backend_picks_up_other_writers(self):
+        task = await sync_to_async(self.create)('Polled')
+        response = await self.client.get(self.url)
+        stream = response.streaming_content.__aiter__()
+        await anext(stream)
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        # As if another process had logged it: no commit hook runs here.
+        await sync_to_async(TaskChange.objects.create)(task_id=task.pk, action='updated')
+        event, _, data = parse_events((await asyncio.wait_for(reading, 5)).decode())[0]
+        self.assertEqual((event, data['task_id']), ('updated', task.pk))
+        await stream.aclose()
+
+    @override_settings(TASKS_EVENT_STREAM_MAX_SECONDS=0)
+    async def test_stale_cursors_and_bad_requests(self):
+        await sync_to_async(self.create)('Old', assignees=[self.other])
+        await TaskChange.objects.aupdate(changed_at=timezone.now() - timedelta(days=60))
+        await sync_to_async(self.create)('New')
+        await sync_to_async(compact_changes)()
+        events = await self.read_all(self.url, **{'Last-Event-ID': '1'})
+        self.assertEqual(events, [('resync', None, {'cursor': await sync_to_async(self.cursor)()})])
+
+        response = await self.client.get(self.url, headers={'Last-Event-ID': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Last-Event-ID', json.loads(response.content)['error']['details'])
+        response = await self.client.post(self.url)
+        self.assertEqual(response.status_code, 405)
+        response = await AsyncClient().get(self.url)
+        self.assertIn(response.status_code, (401, 403))
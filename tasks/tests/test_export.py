@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api.representations import serialize_tasks, task_rows
+from ..export import iter_task_records
+from ..models import Task
+
+
+class TaskExportTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='exporter')
+        self.worker = User.objects.create(username='worker')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for i in range(7):
+            task = Task.objects.create(
+                name=f'Export {i}',
+                description='Line one\nline "two"',
+                status='completed' if i % 2 else 'pending',
+                created_by=self.user,
+            )
+            if i % 3 == 0:
+                task.assigned_to.add(self.worker, self.user)
+        self.url = reverse('task-export')
+
+    def test_records_match_list_representation_across_chunks(self):
+        expected = serialize_tasks(task_rows(Task.objects.order_by('id')))
+        # Assignees come from the snapshots: one task query for every chunk.
+        with self.assertNumQueries(1):
+            self.assertEqual(list(iter_task_records(Task.objects.all(), chunk_size=3)), expected)
+
+    def test_ndjson_stream(self):
+        response = self.client.get(self.url + '?status=completed')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(record['status'] == 'completed' for record in records))
+
+    def test_csv_stream(self):
+        response = self.client.get(self.url + '?output=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[0]['description'], 'Line one\nline "two"')
+        self.assertEqual(rows[0]['assigned_to'], 'exporter;worker')
+        self.assertEqual(rows[0]['created_by'], 'exporter')
+
+    def test_invalid_output(self):
+        response = self.client.get(self.url + '?output=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('export_tasks', '--status', 'pending', '--chunk-size', '2', stdout=out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(records), 4)
+        self.assertEqual([r['id'] for r in records], sorted(r['id'] for r in records))
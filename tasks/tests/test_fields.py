@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..api.representations import FULL_SELECTION, serialize_tasks, task_rows
+from ..models import Task
+
+
+class FieldSelectionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com')
+        self.others = [User.objects.create(username=f'worker{i}') for i in range(2)]
+        self.task = Task.objects.create(name='Pick fields', description='x', created_by=self.user)
+        self.task.assigned_to.set(self.others)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.list_url = reverse('task-list')
+        self.detail_url = reverse('task-detail', args=[self.task.pk])
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data, [q['sql'] for q in queries]
+
+    def test_relations_default_to_ids(self):
+        for data in (self.get(self.list_url)[0]['results'][0], self.get(self.detail_url)[0]):
+            self.assertEqual(data['created_by'], self.user.pk)
+            self.assertEqual(data['assigned_to'], [user.pk for user in self.others])
+            self.assertEqual(data['name'], 'Pick fields')
+
+    def test_expand_matches_full_representation(self):
+        rows = task_rows(Task.objects.filter(pk=self.task.pk))
+        expected = serialize_tasks(rows, FULL_SELECTION)[0]
+        query = '?expand=assigned_to,created_by'
+        self.assertEqual(self.get(self.list_url + query)[0]['results'][0], expected)
+        self.assertEqual(self.get(self.detail_url + query)[0], expected)
+
+    def test_sparse_fields_skip_columns_and_assignees(self):
+        for url in (self.list_url, self.detail_url):
+            data, queries = self.get(url + '?fields=id,name,status')
+            if 'results' in data:
+                data = data['results'][0]
+            self.assertEqual(data, {'id': self.task.pk, 'name': 'Pick fields', 'status': 'pending'})
+            self.assertFalse(any('tasks_task_assigned_to' in sql for sql in queries), queries)
+            self.assertFalse(any('"description"' in sql for sql in queries), queries)
+
+    def test_list_and_detail_agree(self):
+        queries = (
+            '', '?fields=name,assigned_to', '?fields=created_by,completed_at&expand=created_by',
+        )
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.get(self.list_url + query)[0]['results'][0],
+                    self.get(self.detail_url + query)[0],
+                )
+
+    def test_per_user_lists(self):
+        for url in (
+            reverse('user-tasks-list', args=[self.others[0].pk]),
+            reverse('user-tasks-by-username', args=['worker0']),
+        ):
+            data = self.get(url + '?fields=id,created_by&expand=created_by')[0]
+            data = data['results'] if 'results' in data else data
+            self.assertEqual(data, [{'id': self.task.pk, 'created_by': {
+                'id': self.user.pk, 'username': 'owner', 'email': 'owner@example.com',
+                'first_name': '', 'last_name': '',
+            }}])
+
+    def test_cursor_pages_without_created_at(self):
+        # The keyset position is read even when created_at is not selected.
+        for i in range(10):
+            task = Task.objects.create(name=f'More {i}', description='x', created_by=self.user)
+            task.assigned_to.add(self.others[0])
+        expected = [{'name': f'More {i}'} for i in reversed(range(10))] + [{'name': 'Pick fields'}]
+        for url in (
+            self.list_url + '?',
+            self.list_url + '?include_archived=true&',
+            reverse('user-tasks-list', args=[self.others[0].pk]) + '?',
+        ):
+            with self.subTest(url=url):
+                data = self.get(url + 'pagination=cursor&fields=name')[0]
+                results = data['results']
+                results += self.get(data['next'])[0]['results']
+                self.assertEqual(results, expected)
+
+    def test_unknown_fields_are_rejected(self):
+        for query, param in (('?fields=name,secret', 'fields'), ('?expand=name', 'expand')):
+            response = self.client.get(self.list_url + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(param, response.data['error']['details'])
+
+    def test_mutation_responses_follow_selection(self):
+        response = self.client.post(
+            self.list_url + '?fields=id,name,created_by',
+            {'name': 'Created', 'description': 'x', 'assigned_to_ids': [self.others[0].pk]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data), {'id', 'name', 'created_by'})
+        self.assertEqual(response.data['created_by'], self.user.pk)
+        task = Task.objects.get(pk=response.data['id'])
+        self.assertEqual(list(task.assigned_to.all()), [self.others[0]])
@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..export import export_lines
+from ..imports import UsernameCache, run_import
+from ..models import Task, TaskImport
+from ..stats import summary_drift
+
+
+def ndjson(*records):
+    return ''.join(json.dumps(record) + '\n' for record in records).encode()
+
+
+class TaskImportTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin', password='x', email='a@example.com'
+        )
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('task-import')
+
+    def upload(self, body, content_type='application/x-ndjson', query=''):
+        response = self.client.post(self.url + query, body, content_type=content_type)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_export_round_trip(self):
+        for i in range(5):
+            task = Task.objects.create(
+                name=f'Exported {i}', description='Line one\nline "two"', status='completed',
+                task_type='testing', created_by=self.alice,
+            )
+            task.assigned_to.set([self.alice, self.bob][:i % 3])
+        originals = list(Task.objects.order_by('id'))
+        exported = Task.objects.filter(pk__lte=originals[-1].pk)
+        formats = (('csv', 'text/csv'), ('ndjson', 'application/x-ndjson'))
+        for export_format, content_type in formats:
+            with self.subTest(export_format):
+                body = ''.join(export_lines(exported, export_format))
+                last_pk = Task.objects.latest('pk').pk
+                events = self.upload(body.encode(), content_type)
+                self.assertEqual(events[-1]['progress']['status'], 'completed')
+                self.assertEqual(events[-1]['progress']['imported'], 5)
+                imported = list(Task.objects.filter(pk__gt=last_pk).order_by('id'))
+                self.assertEqual(len(imported), 5)
+                for original, copy in zip(originals, imported):
+                    self.assertEqual(
+                        (copy.name, copy.description, copy.status, copy.task_type, copy.created_by),
+                        (original.name, original.description, original.status, original.task_type,
+                         original.created_by),
+                    )
+                    self.assertEqual(set(copy.assigned_to.all()), set(original.assigned_to.all()))
+                    self.assertIsNotNone(copy.completed_at)
+        self.assertEqual(summary_drift(), {})
+
+    def test_bad_rows_are_rejected(self):
+        body = ndjson(
+            {'name': 'Good row', 'description': 'x', 'assigned_to': ['bob']},
+            {'name': 'Bad type', 'description': 'x', 'task_type': 'chores'},
+            {
+                'name': 'Unknown users', 'description': 'x',
+                'created_by': 'carol', 'assigned_to': ['bob', 'dave'],
+            },
+            ['not', 'an', 'object'],
+        ) + b'{broken\n' + ndjson({'name': 'Also good', 'description': 'y', 'created_by': 'alice'})
+        events = self.upload(body)
+        self.assertEqual(events[0], {'import': TaskImport.objects.get().pk})
+        rejects = {event['reject']['row']: event['reject'] for event in events if 'reject' in event}
+        self.assertEqual(sorted(rejects), [2, 3, 4, 5])
+        self.assertIn('task_type', rejects[2]['errors'])
+        self.assertEqual(rejects[3]['errors'], {
+            'created_by': ['User "carol" does not exist.'],
+            'assigned_to': ['User "dave" does not exist.'],
+        })
+        self.assertEqual(rejects[5]['record'], '{broken\n')
+
+        self.assertEqual(
+            list(Task.objects.order_by('id').values_list('name', 'created_by__username')),
+            [('Good row', 'admin'), ('Also good', 'alice')],
+        )
+        self.assertEqual(list(Task.objects.get(name='Good row').assigned_to.all()), [self.bob])
+        task_import = TaskImport.objects.get()
+        self.assertEqual(
+            (task_import.position, task_import.imported, task_import.rejected), (6, 2, 4)
+        )
+
+    def test_csv_rows(self):
+        body = (
+            '﻿name,description,status,created_by,assigned_to\n'
+            'Multi line,"one\ntwo",,,alice; bob\n'
+            'Too many,x,pending,alice,bob,extra\n'
+            'Completed,x,completed,bob,\n'
+        ).encode() + b'Bad bytes,\xff,pending,,\n'
+        events = self.upload(body, 'text/csv')
+        rejects = [event['reject'] for event in events if 'reject' in event]
+        self.assertEqual([(reject['row'], reject['line']) for reject in rejects], [(2, 4), (4, 6)])
+        multi = Task.objects.get(name='Multi line')
+        self.assertEqual((multi.description, multi.status), ('one\ntwo', 'pending'))
+        self.assertEqual(set(multi.assigned_to.all()), {self.alice, self.bob})
+        self.assertIsNotNone(Task.objects.get(name='Completed').completed_at)
+
+    def test_resume_after_interruption(self):
+        body = ndjson(*({'name': f'Row {i}', 'description': 'x'} for i in range(10)))
+        task_import = TaskImport.objects.create(source='rows.ndjson', format='ndjson')
+        real = run_import.__globals__['bulk_create_tasks']
+        calls = []
+
+        def failing(items, **kwargs):
+            calls.append(len(items))
+            if len(calls) == 3:
+                raise RuntimeError('connection lost')
+            return real(items, **kwargs)
+
+        with mock.patch('tasks.imports.bulk_create_tasks', failing):
+            with self.assertRaises(RuntimeError):
+                list(run_import(
+                    io.BytesIO(body), task_import, default_creator=self.alice, batch_size=3
+                ))
+        task_import.refresh_from_db()
+        self.assertEqual(
+            (task_import.position, task_import.imported, task_import.status), (6, 6, 'running')
+        )
+
+        events = self.upload(body, query=f'?resume={task_import.pk}')
+        self.assertEqual(events[-1]['progress']['rows'], 10)
+        self.assertEqual(
+            sorted(Task.objects.values_list('name', flat=True)),
+            sorted(f'Row {i}' for i in range(10)),
+        )
+
+    def test_request_errors(self):
+        response = self.client.post(self.url, b'name\n', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        response = self.client.post(self.url + '?resume=999', b'', content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.alice)
+        response = self.client.post(self.url, ndjson({'name': 'Nope', 'description': 'x'}),
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_usernames_are_looked_up_once(self):
+        cache = UsernameCache(max_size=2)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                cache.resolve(['alice', 'nobody']), {'alice': self.alice.pk, 'nobody': None}
+            )
+        with self.assertNumQueries(0):
+            cache.resolve(['nobody', 'alice'])
+        with self.assertNumQueries(1):
+            cache.resolve(['bob'])
+        # nobody was the least recently used entry and has been evicted.
+        with self.assertNumQueries(0):
+            cache.resolve(['alice'])
+        with self.assertNumQueries(1):
+            cache.resolve(['nobody'])
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tasks.csv')
+            with open(path, 'w', encoding='utf-8') as source:
+                source.write('name,description,assigned_to\nFrom file,x,bob\nx,x,\n')
+            out = io.StringIO()
+            call_command('import_tasks', path, created_by='alice', stdout=out)
+            self.assertIn('1 imported, 1 rejected', out.getvalue())
+            with open(path + '.rejects.ndjson', encoding='utf-8') as rejects:
+                self.assertEqual(json.loads(rejects.read())['errors'], {
+                    'name': ['Task name must be at least 3 characters long.'],
+                })
+        task = Task.objects.get()
+        self.assertEqual((task.created_by, list(task.assigned_to.all())), (self.alice, [self.bob]))
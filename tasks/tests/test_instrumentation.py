@@ -0,0 +1,100 @@
+import os
+import re
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from ..instrumentation import metrics_registry
+from ..models import Task
+from .test_async_views import ASYNC_URLCONF
+
+
+def timing(response):
+    return {
+        name: dict(re.findall(r';(\w+)=("[^"]*"|[\d.]+)', rest))
+        for name, rest in re.findall(r'(\w+)((?:;[^,]*)*)', response['Server-Timing'])
+    }
+
+
+class InstrumentationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='timed', password='x')
+        for i in range(3):
+            task = Task.objects.create(name=f'Timed {i}', description='x', created_by=self.user)
+            task.assigned_to.add(self.user)
+        self.client.force_login(self.user)
+
+    def sample(self, name, view, method='GET', status='200'):
+        labels = {'method': method, 'view': view, 'status': status}
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_server_timing_counts_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('task-list'))
+        entries = timing(response)
+        self.assertEqual(entries['db']['desc'], f'"{len(queries)} queries"')
+        self.assertIn('serialize', entries)
+        self.assertIn('render', entries)
+        self.assertGreaterEqual(float(entries['total']['dur']), float(entries['db']['dur']))
+
+    def test_detail_serializer_is_timed(self):
+        response = self.client.get(reverse('task-detail', args=[Task.objects.first().pk]))
+        self.assertIn('serialize', timing(response))
+
+    def test_endpoint_histograms(self):
+        name = 'tasks_http_request_duration_seconds_count'
+        before = self.sample(name, 'task-list')
+        missing_before = self.sample(name, 'task-list', status='404')
+        queries_before = self.sample('tasks_http_request_db_queries_sum', 'task-list')
+        self.client.get(reverse('task-list'))
+        self.client.get(reverse('task-list') + '?page=2')
+        self.assertEqual(self.sample(name, 'task-list'), before + 1)
+        self.assertEqual(self.sample(name, 'task-list', status='404'), missing_before + 1)
+        queries = self.sample('tasks_http_request_db_queries_sum', 'task-list')
+        self.assertGreater(queries, queries_before)
+        self.assertGreater(self.sample('tasks_http_response_size_bytes_sum', 'task-list'), 0)
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('task-list'))
+        # Without a token, only staff can read the metrics.
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'tasks_http_request_duration_seconds_bucket{', response.content)
+        self.assertIn(b'view="task-list"', response.content)
+
+    @override_settings(TASKS_METRICS_TOKEN='scrape')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_multiprocess_registry(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                registry = metrics_registry()
+        self.assertIsInstance(registry, CollectorRegistry)
+        self.assertIsNot(registry, REGISTRY)
+
+    async def test_async_views_are_measured(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.user)
+        with self.settings(ROOT_URLCONF=ASYNC_URLCONF):
+            response = await client.get(reverse('task-list'))
+        entries = timing(response)
+        self.assertNotEqual(entries['db']['desc'], '"0 queries"')
+        self.assertIn('serialize', entries)
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..api.pagination import decode_cursor, encode_cursor
+from ..models import Task
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        # Pairs of tasks share a created_at so the id tie-break is exercised.
+        base = timezone.now()
+        self.tasks = []
+        for i in range(25):
+            task = Task.objects.create(
+                name=f'Task {i:02d}',
+                description='Paged',
+                task_type='testing' if i % 2 else 'development',
+                created_by=self.user,
+            )
+            Task.objects.filter(pk=task.pk).update(created_at=base - timedelta(minutes=i // 2))
+            self.tasks.append(task)
+        self.expected = list(
+            Task.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_cursor_walk_covers_every_task_once(self):
+        ids, pages = self.walk(reverse('task-list') + '?pagination=cursor')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_cursor_with_filters(self):
+        ids, _ = self.walk(reverse('task-list') + '?pagination=cursor&task_type=testing')
+        expected = list(
+            Task.objects.filter(task_type='testing')
+            .order_by('-created_at', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_cursor_is_stable_under_inserts(self):
+        response = self.client.get(reverse('task-list') + '?pagination=cursor')
+        next_url = response.data['next']
+        Task.objects.create(name='Newest task', description='x', created_by=self.user)
+
+        response = self.client.get(next_url)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, self.expected[10:20])
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(reverse('task-list') + '?pagination=cursor')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('task-list') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.data['count'], 25)
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(
+            decode_cursor(encode_cursor(created_at, 7, reverse=True)),
+            ((created_at, 7), True),
+        )
@@ -0,0 +1,232 @@
+"""
+Query-budget regression suite.
+
+Every route in ``tasks.urls`` (plus the admin changelist) is requested with
+1, 10 and 100 tasks, each assigned to as many users, and payloads that grow
+the same way. Each request must run the same number of queries at every
+size, and no more than its budget. A failure lists the SQL of the largest
+run, with repeated statement shapes (the usual N+1 signature) called out.
+
+Seeded tasks share one status and type, so the per-group summary counter
+writes, and the per-user ones (one per status and delta), are the same at
+every size, and so is the change log: one bulk insert per write. Assignment
+payloads move tasks to the owner, who is never assigned yet. Caches are
+cleared before each request so every size is measured cold.
+``TASKS_BULK_BATCH_SIZE`` is raised so the bulk endpoints run one statement
+per step; their batching grows with the payload by design.
+"""
+import json
+import re
+from collections import Counter
+from typing import Callable, NamedTuple, Optional
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework.test import APIClient
+
+from ..services import bulk_create_tasks
+from ..urls import router, urlpatterns
+from ..utils.authentication import auth_cache
+from .test_admin import STATIC_STORAGES
+
+SIZES = (1, 10, 100)
+
+
+class Seed(NamedTuple):
+    owner: User
+    users: list
+    tasks: list
+
+    @property
+    def task(self):
+        return self.tasks[0]
+
+    @property
+    def user_ids(self):
+        return [user.pk for user in self.users]
+
+    @property
+    def task_ids(self):
+        return [task.pk for task in self.tasks]
+
+
+class Case(NamedTuple):
+    name: str
+    method: str
+    url: Callable[[Seed], str]
+    budget: int
+    data: Optional[Callable[[Seed], object]] = None
+    content_type: Optional[str] = None
+
+
+def import_rows(seed):
+    assignees = [seed.owner.username]
+    return ''.join(
+        json.dumps({'name': f'Imported {i}', 'description': 'x', 'assigned_to': assignees}) + '\n'
+        for i in range(len(seed.tasks))
+    ).encode()
+
+
+def new_tasks(seed):
+    return [
+        {'name': f'Bulk {i}', 'description': 'x', 'assigned_to_ids': [seed.owner.pk]}
+        for i in range(len(seed.tasks))
+    ]
+
+
+CASES = [
+    Case('api root', 'get', lambda s: reverse('api-root'), 0),
+    Case('list', 'get', lambda s: reverse('task-list'), 3),
+    Case('list expanded', 'get',
+         lambda s: reverse('task-list') + '?expand=assigned_to,created_by', 3),
+    Case('list sparse', 'get', lambda s: reverse('task-list') + '?fields=id,name', 3),
+    Case('list cursor', 'get', lambda s: reverse('task-list') + '?pagination=cursor', 2),
+    Case('list filtered', 'get',
+         lambda s: reverse('task-list') + '?status=pending&task_type=testing', 3),
+    Case('list search', 'get', lambda s: reverse('task-list') + '?q=budget', 3),
+    Case('list archived', 'get', lambda s: reverse('task-list') + '?include_archived=true', 4),
+    Case('create', 'post', lambda s: reverse('task-list'), 14,
+         lambda s: {'name': 'Created', 'description': 'x', 'assigned_to_ids': s.user_ids}),
+    Case('detail', 'get', lambda s: reverse('task-detail', args=[s.task.pk]), 3),
+    Case('detail expanded', 'get',
+         lambda s: reverse('task-detail', args=[s.task.pk]) + '?expand=assigned_to,created_by', 3),
+    Case('update', 'put', lambda s: reverse('task-detail', args=[s.task.pk]), 23,
+         lambda s: {'name': 'Updated', 'description': 'y', 'assigned_to_ids': [s.owner.pk]}),
+    Case('partial update', 'patch', lambda s: reverse('task-detail', args=[s.task.pk]), 13,
+         lambda s: {'status': 'in_progress'}),
+    Case('delete', 'delete', lambda s: reverse('task-detail', args=[s.task.pk]), 10),
+    Case('assign', 'post', lambda s: reverse('task-assign', args=[s.task.pk]), 20,
+         lambda s: {'user_ids': [s.owner.pk]}),
+    Case('assignments', 'get', lambda s: reverse('task-assignments', args=[s.task.pk]), 2),
+    Case('bulk create', 'post', lambda s: reverse('task-bulk'), 11, new_tasks),
+    Case('bulk delete', 'delete', lambda s: reverse('task-bulk'), 9, lambda s: {'ids': s.task_ids}),
+    Case('bulk assign mapping', 'post', lambda s: reverse('task-bulk-assign'), 15,
+         lambda s: {'assignments': {str(pk): [s.owner.pk] for pk in s.task_ids}}),
+    Case('bulk assign filter', 'post', lambda s: reverse('task-bulk-assign'), 16,
+         lambda s: {'filter': {'status': 'pending'}, 'user_ids': [s.owner.pk]}),
+    Case('import', 'post', lambda s: reverse('task-import'), 16, import_rows,
+         'application/x-ndjson'),
+    Case('durations', 'get', lambda s: reverse('task-durations') + '?group_by=created_by', 1),
+    Case('export ndjson', 'get', lambda s: reverse('task-export'), 1),
+    Case('export csv', 'get', lambda s: reverse('task-export') + '?output=csv', 1),
+    Case('stats', 'get', lambda s: reverse('task-stats'), 1),
+    Case('changes', 'get', lambda s: reverse('task-changes'), 2),
+    Case('user tasks', 'get', lambda s: reverse('user-tasks-list', args=[s.users[0].pk]), 3),
+    Case('user task detail', 'get',
+         lambda s: reverse('user-tasks-detail', args=[s.users[0].pk, s.task.pk]), 2),
+    Case('user task summary', 'get',
+         lambda s: reverse('user-tasks-summary', args=[s.users[0].pk]), 1),
+    Case('tasks by username', 'get',
+         lambda s: reverse('user-tasks-by-username', args=[s.users[0].username]), 3),
+    Case('tasks by username streamed', 'get',
+         lambda s: reverse('user-tasks-by-username', args=[s.users[0].username])
+         + '?stream=true', 1),
+    Case('cache stats', 'get', lambda s: reverse('task-cache-stats'), 0),
+]
+
+ADMIN_CASES = [
+    Case('admin changelist', 'get', lambda s: '/admin/tasks/task/', 6),
+    Case('admin changelist search', 'get', lambda s: '/admin/tasks/task/?q=budget', 5),
+    Case('admin mark completed', 'post', lambda s: '/admin/tasks/task/', 17,
+         lambda s: {'action': 'mark_completed', '_selected_action': s.task_ids}),
+]
+
+
+def _shape(sql):
+    sql = re.sub(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b", '?', sql)
+    return re.sub(r'\((?:\?, )*\?\)', '(...)', sql)
+
+
+def describe(queries):
+    """Numbered SQL, preceded by statement shapes that ran more than once."""
+    shapes = Counter(map(_shape, queries)).most_common()
+    repeated = [f'  {count}x {shape}' for shape, count in shapes if count > 1]
+    lines = [f'  {number:3}. {sql}' for number, sql in enumerate(queries, 1)]
+    if repeated:
+        lines = ['Repeated statements:', *repeated, 'All statements:', *lines]
+    return '\n'.join(lines)
+
+
+@override_settings(TASKS_BULK_BATCH_SIZE=100_000)
+class QueryBudgetTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_superuser(
+            username='owner', password='x', email='o@example.com'
+        )
+
+    def seed(self, size):
+        users = User.objects.bulk_create(User(username=f'budget{i}') for i in range(size))
+        tasks = bulk_create_tasks(
+            [
+                {
+                    'name': f'Budget task {i}', 'description': 'x',
+                    'status': 'pending', 'task_type': 'testing',
+                    'assigned_to': [user.pk for user in users],
+                }
+                for i in range(size)
+            ],
+            created_by=self.owner,
+        )
+        return Seed(self.owner, users, tasks)
+
+    def client_for(self, url):
+        client = APIClient()
+        if url.startswith('/admin/'):
+            client.force_login(self.owner)
+        else:
+            client.force_authenticate(self.owner)
+        return client
+
+    def measure(self, case, size):
+        """Run ``case`` against ``size`` seeded tasks; every change is rolled back."""
+        with transaction.atomic():
+            seed = self.seed(size)
+            url = case.url(seed)
+            client = self.client_for(url)
+            data = case.data(seed) if case.data else None
+            cache.clear()
+            auth_cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                request = getattr(client, case.method)
+                if case.content_type:
+                    response = request(url, data, content_type=case.content_type)
+                else:
+                    response = request(
+                        url, data, format=None if url.startswith('/admin/') else 'json'
+                    )
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertLess(response.status_code, 400, f'{case.name}: {response.status_code}')
+            transaction.set_rollback(True)
+        return [query['sql'] for query in queries]
+
+    def check(self, case):
+        runs = {size: self.measure(case, size) for size in SIZES}
+        counts = {size: len(queries) for size, queries in runs.items()}
+        largest = runs[SIZES[-1]]
+        report = (
+            f'{case.name}: queries per size {counts}, budget {case.budget}\n{describe(largest)}'
+        )
+        self.assertEqual(len(set(counts.values())), 1, report)
+        self.assertLessEqual(counts[SIZES[-1]], case.budget, report)
+
+    def test_api_routes(self):
+        for case in CASES:
+            with self.subTest(case.name):
+                self.check(case)
+
+    @override_settings(STORAGES=STATIC_STORAGES)
+    def test_admin(self):
+        for case in ADMIN_CASES:
+            with self.subTest(case.name):
+                self.check(case)
+
+    def test_every_route_is_covered(self):
+        seed = self.seed(1)
+        covered = {resolve(case.url(seed).split('?')[0]).url_name for case in CASES}
+        routes = {pattern.name for pattern in router.urls + urlpatterns[1:]}
+        self.assertEqual(routes - covered, set())
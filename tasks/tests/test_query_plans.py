@@ -0,0 +1,158 @@
+"""
+Query-plan regression harness.
+
+Seeds a few thousand tasks, builds every queryset shape the task list
+endpoints can produce (through the real ``get_queryset`` implementations)
+and asserts on ``EXPLAIN`` output that each one is answered from an index:
+no plain table scan of ``tasks_task`` and no sort step.
+
+On PostgreSQL the planner is told to avoid sequential scans and sorts, so a
+``Seq Scan`` or ``Sort`` node only shows up when no index can serve the
+shape. The seed size can be raised with ``QUERY_PLAN_ROWS``.
+"""
+import json
+import os
+import random
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ..api.pagination import apply_keyset
+from ..api.representations import task_rows
+from ..api.views import TaskViewSet, UserTaskViewSet
+from ..models import Task
+
+SEED_ROWS = int(os.environ.get('QUERY_PLAN_ROWS', 5000))
+
+FILTER_COMBINATIONS = [
+    {},
+    {'status': 'pending'},
+    {'task_type': 'testing'},
+    {'status': 'in_progress', 'task_type': 'development'},
+]
+
+
+class QueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(1234)
+        users = User.objects.bulk_create(User(username=f'planner{i}') for i in range(50))
+        tasks = Task.objects.bulk_create(
+            (
+                Task(
+                    name=f'Task {i}',
+                    description='Seeded for query plans',
+                    status=rng.choice(Task.Status.values),
+                    task_type=rng.choice(Task.TaskType.values),
+                    created_by=rng.choice(users),
+                )
+                for i in range(SEED_ROWS)
+            ),
+            batch_size=1000,
+        )
+        through = Task.assigned_to.through
+        through.objects.bulk_create(
+            (
+                through(task_id=task.id, user_id=user.id)
+                for task in tasks
+                for user in rng.sample(users, 2)
+            ),
+            batch_size=1000,
+        )
+        cls.user = users[0]
+        cls.position = (tasks[SEED_ROWS // 2].created_at, tasks[SEED_ROWS // 2].id)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+        elif connection.vendor != 'sqlite':
+            self.skipTest(f'No plan checks for {connection.vendor}')
+
+    def view_queryset(self, viewset_class, params, **kwargs):
+        view = viewset_class()
+        view.request = Request(APIRequestFactory().get('/', params))
+        view.kwargs = kwargs
+        view.format_kwarg = None
+        return view.get_queryset()
+
+    def shapes(self, queryset):
+        """The statements a list request issues for ``queryset``."""
+        rows = task_rows(queryset)
+        return {
+            'page': rows[:10],
+            'keyset-first': apply_keyset(rows)[:11],
+            'keyset-next': apply_keyset(rows, self.position)[:11],
+            'keyset-previous': apply_keyset(rows, self.position, reverse=True)[:11],
+            'count': queryset.order_by().values('pk'),
+        }
+
+    def explain(self, queryset, count=False):
+        sql, params = queryset.query.sql_with_params()
+        if count:
+            sql = f'SELECT COUNT(*) FROM ({sql}) subquery'
+        prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN (FORMAT JSON)'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            rows = cursor.fetchall()
+        if connection.vendor == 'sqlite':
+            return [row[-1] for row in rows]
+        plan = rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return self._flatten(plan[0]['Plan'])
+
+    def _flatten(self, node):
+        lines = [f"{node['Node Type']} {node.get('Relation Name', '')}".strip()]
+        for child in node.get('Plans', []):
+            lines.extend(self._flatten(child))
+        return lines
+
+    def problems(self, plan, filtered, sort_allowed=False):
+        found = []
+        for line in plan:
+            if connection.vendor == 'sqlite':
+                if re.match(r'SCAN tasks_task(_assigned_to)?$', line):
+                    found.append(f'full scan: {line}')
+                elif filtered and line.startswith('SCAN tasks_task'):
+                    found.append(f'full index scan for a filtered query: {line}')
+                if 'TEMP B-TREE' in line and not sort_allowed:
+                    found.append(f'sort: {line}')
+            else:
+                if line.startswith('Seq Scan'):
+                    found.append(f'full scan: {line}')
+                if line.startswith(('Sort', 'Incremental Sort')) and not sort_allowed:
+                    found.append(f'sort: {line}')
+        return found
+
+    def assert_indexed(self, label, queryset, filtered, sort_allowed=False):
+        for shape, shaped in self.shapes(queryset).items():
+            plan = self.explain(shaped, count=(shape == 'count'))
+            problems = self.problems(plan, filtered, sort_allowed and shape != 'count')
+            self.assertFalse(
+                problems,
+                f'{label} [{shape}] is not index-backed:\n  '
+                + '\n  '.join(problems)
+                + '\nFull plan:\n  '
+                + '\n  '.join(plan),
+            )
+
+    def test_task_list_filter_shapes(self):
+        for params in FILTER_COMBINATIONS:
+            with self.subTest(params=params):
+                queryset = self.view_queryset(TaskViewSet, params)
+                self.assert_indexed(f'TaskViewSet {params}', queryset, filtered=bool(params))
+
+    def test_user_task_list_shapes(self):
+        # Ordering lives on tasks_task while the filter lives on the assignment
+        # table, so no single index can serve both. The assignment side must be
+        # an index search and the sort is bounded by one user's assignments.
+        queryset = self.view_queryset(UserTaskViewSet, {}, user_id=str(self.user.id))
+        self.assert_indexed('UserTaskViewSet', queryset, filtered=True, sort_allowed=True)
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from ..api.representations import assignees_prefetch, serialize_tasks, task_rows
+from ..api.serializers import TaskSerializer
+from ..models import Task
+
+
+class FastRepresentationParityTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                first_name=f'First{i}',
+                last_name=f'Last{i}',
+            )
+            for i in range(4)
+        ]
+        for i in range(12):
+            task = Task.objects.create(
+                name=f'Task {i}',
+                description=f'Description "{i}" ✓',
+                task_type='development' if i % 2 else 'testing',
+                status='completed' if i % 3 == 0 else 'pending',
+                created_by=self.users[i % 4],
+            )
+            task.assigned_to.set(self.users[: i % 4])
+
+    def test_output_is_byte_identical(self):
+        queryset = Task.objects.select_related('created_by').prefetch_related(
+            assignees_prefetch()
+        )
+        renderer = JSONRenderer()
+        expected = renderer.render(TaskSerializer(queryset, many=True).data)
+        actual = renderer.render(serialize_tasks(task_rows(Task.objects.all())))
+        self.assertEqual(actual, expected)
+
+    def test_uses_one_query(self):
+        with self.assertNumQueries(1):
+            serialize_tasks(task_rows(Task.objects.all()))
+
+    def test_tasks_without_snapshot_read_assignees(self):
+        expected = serialize_tasks(task_rows(Task.objects.all()))
+        first = Task.objects.order_by('id').values('pk')[:5]
+        Task.objects.filter(pk__in=first).update(assignee_snapshot=None)
+        with self.assertNumQueries(2):
+            self.assertEqual(serialize_tasks(task_rows(Task.objects.all())), expected)
+
+    def test_empty_rows(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(serialize_tasks([]), [])
@@ -0,0 +1,113 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Task
+from ..search import install_sqlite_index, search_tasks
+from ..services import bulk_create_tasks, bulk_delete_tasks
+
+
+class TaskSearchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='searcher')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('task-list')
+
+    def create(self, name, description='x', **fields):
+        return Task.objects.create(
+            name=name, description=description, created_by=self.user, **fields
+        )
+
+    def names(self, response):
+        return [task['name'] for task in response.data['results']]
+
+    def matches(self, query):
+        return list(search_tasks(Task.objects.all(), query).values_list('name', flat=True))
+
+    def test_ranked_api_search(self):
+        self.create('Fix login redirect', 'Users land on a blank page', task_type='testing')
+        self.create('Write release notes', 'Mention the login redirect fix')
+        self.create('Upgrade database driver', 'Nothing about authentication')
+        assigned = self.create('Fix login for assigned user')
+        assigned.assigned_to.add(self.user, User.objects.create(username='second'))
+
+        response = self.client.get(self.url, {'q': 'login redirect'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = self.names(response)
+        # Name matches outrank description matches; no duplicates from the M2M.
+        self.assertEqual(names, ['Fix login redirect', 'Write release notes'])
+
+        response = self.client.get(self.url, {'q': 'login', 'task_type': 'testing'})
+        self.assertEqual(self.names(response), ['Fix login redirect'])
+
+        response = self.client.get(self.url, {'q': '"login" OR *'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ranked_search_is_not_cursor_paged(self):
+        self.create('Fix login redirect')
+        for params in ({'pagination': 'cursor'}, {'cursor': 'abc'}):
+            response = self.client.get(self.url, {'q': 'login', **params})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('q', response.data['error']['details'])
+        response = self.client.get(self.url, {'q': ' ', 'pagination': 'cursor'})
+        self.assertEqual(self.names(response), ['Fix login redirect'])
+
+    def test_index_follows_every_write_path(self):
+        task = self.create('Alpha deployment')
+        self.assertEqual(self.matches('alpha'), ['Alpha deployment'])
+
+        task.name = 'Beta deployment'
+        task.save()
+        self.assertEqual(self.matches('alpha'), [])
+        Task.objects.filter(pk=task.pk).update(description='gamma rollout')
+        self.assertEqual(self.matches('gamma'), ['Beta deployment'])
+
+        created = bulk_create_tasks(
+            [
+                {'name': 'Delta import', 'description': 'x'},
+                {'name': 'Epsilon import', 'description': 'x'},
+            ],
+            created_by=self.user,
+        )
+        self.assertEqual(sorted(self.matches('import')), ['Delta import', 'Epsilon import'])
+        bulk_delete_tasks([created[0].id], self.user)
+        self.assertEqual(self.matches('import'), ['Epsilon import'])
+
+        task.delete()
+        self.assertEqual(self.matches('beta'), [])
+
+    def test_sqlite_index_is_reinstalled(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 index is SQLite only')
+        self.create('Rebuilt task')
+        self.assertFalse(install_sqlite_index())
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER tasks_task_fts_insert')
+        self.assertTrue(install_sqlite_index())
+        self.create('After reinstall')
+        self.assertEqual(self.matches('reinstall'), ['After reinstall'])
+        self.assertEqual(self.matches('rebuilt'), ['Rebuilt task'])
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    })
+    def test_admin_search(self):
+        admin = User.objects.create_superuser(username='admin', password='x', email='a@example.com')
+        worker = User.objects.create(username='worker')
+        by_name = self.create('Payment worker outage')
+        by_assignee = self.create('Unrelated')
+        by_assignee.assigned_to.add(worker, admin)
+        self.create('Something else')
+
+        self.client.force_login(admin)
+        response = self.client.get('/admin/tasks/task/', {'q': 'worker'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(task.pk for task in response.context['cl'].result_list),
+            [by_name.pk, by_assignee.pk],
+        )
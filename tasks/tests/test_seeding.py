@@ -0,0 +1,72 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.db.models import Count
+from django.test import TestCase
+
+from ..models import Task
+from ..seeding import seed_tasks
+from ..snapshots import snapshot_drift
+from ..stats import summary_drift, user_summary_drift
+
+
+class SeedTasksTest(TestCase):
+    def snapshot(self, **kwargs):
+        """Seed inside a rolled-back transaction and return the rows without ids."""
+        with transaction.atomic():
+            result = seed_tasks(**kwargs)
+            users = list(User.objects.filter(username__startswith='seed').values_list(
+                'username', 'email', 'last_name').order_by('id'))
+            tasks = list(Task.objects.order_by('id').values_list(
+                'name', 'description', 'status', 'task_type', 'created_at', 'updated_at',
+                'completed_at', 'created_by__username'))
+            assignments = list(
+                Task.assigned_to.through.objects.order_by('task_id', 'user__username')
+                .values_list('task__name', 'user__username')
+            )
+            transaction.set_rollback(True)
+        return result, users, tasks, assignments
+
+    def test_same_seed_same_rows(self):
+        first = self.snapshot(tasks=50, users=10, seed=7, batch_size=7)
+        self.assertEqual(first[1:], self.snapshot(tasks=50, users=10, seed=7, batch_size=50)[1:])
+        self.assertNotEqual(first[2], self.snapshot(tasks=50, users=10, seed=8)[2])
+        result, _, _, assignments = first
+        self.assertEqual((result.users, result.tasks, result.assignments),
+                         (10, 50, len(assignments)))
+
+    def test_rows_follow_model_rules(self):
+        result = seed_tasks(tasks=200, users=20, seed=1, max_assignees=4)
+        self.assertEqual(summary_drift(), {})
+        self.assertEqual(user_summary_drift(), {})
+        self.assertEqual(snapshot_drift(), [])
+        for task in Task.objects.all():
+            self.assertEqual(task.status == Task.Status.COMPLETED, task.completed_at is not None)
+            self.assertLessEqual(task.created_at, task.updated_at)
+            self.assertLessEqual(task.assigned_to.count(), 4)
+        self.assertTrue(User.objects.get(username='seed00').check_password('seed'))
+        # Sequences continue after the explicit ids.
+        task = Task.objects.create(
+            name='After seed', description='x', created_by_id=result.first_user_id
+        )
+        self.assertEqual(task.pk, result.first_task_id + 200)
+
+    def test_skew(self):
+        seed_tasks(tasks=500, users=10, seed=2, skew=1.5)
+        counts = dict(
+            User.objects.filter(username__startswith='seed')
+            .annotate(created=Count('created_tasks')).values_list('username', 'created')
+        )
+        self.assertGreater(counts['seed0'], 5 * counts['seed9'])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('seed_tasks', tasks=30, users=3, stdout=out)
+        self.assertIn('Seeded 3 users, 30 tasks', out.getvalue())
+        self.assertEqual(Task.objects.count(), 30)
+        with self.assertRaisesMessage(CommandError, 'already exist'):
+            call_command('seed_tasks', tasks=30, users=3, stdout=out)
+        with self.assertRaisesMessage(CommandError, '--users must be positive'):
+            call_command('seed_tasks', users=0, prefix='other', stdout=out)
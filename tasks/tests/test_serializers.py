@@ -81,4 +81,24 @@ class SerializerTest(TestCase):
         self.assertEqual(task.status, 'in_progress')
         # Check that other fields remain unchanged
         self.assertEqual(task.description, 'Test Description')
-        self.assertEqual(task.task_type, 'Development') 
\ No newline at end of file
+        self.assertEqual(task.task_type, 'Development')
+
+    def test_assigned_to_ids_are_validated_in_one_query(self):
+        """Assignee ids are checked with a single lookup and keep their order"""
+        data = {'name': 'Batched', 'assigned_to_ids': [self.user2.id, self.user1.id]}
+        serializer = TaskSerializer(data=data, partial=True)
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+        self.assertEqual(serializer.validated_data['assigned_to'], [self.user2, self.user1])
+
+    def test_assigned_to_ids_errors(self):
+        """Unknown and malformed assignee ids are reported like single lookups"""
+        for ids, message in (
+            ([self.user1.id, 999], 'Invalid pk "999" - object does not exist.'),
+            (['abc'], 'Incorrect type. Expected pk value, received str.'),
+        ):
+            serializer = TaskSerializer(
+                data={'name': 'Batched', 'assigned_to_ids': ids}, partial=True
+            )
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(serializer.errors['assigned_to_ids'], [message])
@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from ..models import Task
+from ..services import bulk_assign_tasks, bulk_create_tasks
+from ..snapshots import snapshot_drift
+
+
+class AssigneeSnapshotTest(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create(
+            username='alice', email='alice@example.com', first_name='Alice'
+        )
+        self.bob = User.objects.create(username='bob')
+        self.task = Task.objects.create(name='Snapshot', description='x', created_by=self.alice)
+
+    def snapshot(self, task=None):
+        return Task.objects.get(pk=(task or self.task).pk).assignee_snapshot
+
+    def test_assignment_changes(self):
+        self.assertEqual(self.snapshot(), [])
+        self.task.assigned_to.add(self.bob, self.alice)
+        self.assertEqual(self.snapshot(), [
+            [self.alice.pk, 'alice', 'alice@example.com', 'Alice', ''],
+            [self.bob.pk, 'bob', '', '', ''],
+        ])
+        self.task.assigned_to.remove(self.alice)
+        self.assertEqual([user[0] for user in self.snapshot()], [self.bob.pk])
+        self.alice.assigned_tasks.add(self.task)
+        self.bob.assigned_tasks.clear()
+        self.assertEqual([user[0] for user in self.snapshot()], [self.alice.pk])
+        self.task.assigned_to.clear()
+        self.assertEqual(self.snapshot(), [])
+        self.assertEqual(snapshot_drift(), [])
+
+    def test_stale_instances_do_not_overwrite_it(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        self.task.assigned_to.set([self.bob])
+        self.assertEqual([user[0] for user in self.task.assignee_snapshot], [self.bob.pk])
+        stale.status = 'completed'
+        stale.save()
+        self.assertEqual([user[0] for user in self.snapshot()], [self.bob.pk])
+
+    def test_api_and_bulk_paths(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        client.post(
+            reverse('task-assign', args=[self.task.pk]), {'user_ids': [self.bob.pk]}, format='json'
+        )
+        response = client.post(reverse('task-list'), {
+            'name': 'Created', 'description': 'x', 'assigned_to_ids': [self.alice.pk, self.bob.pk],
+        }, format='json')
+        created = Task.objects.get(pk=response.data['id'])
+        tasks = bulk_create_tasks(
+            [
+                {'name': f'Bulk {i}', 'description': 'x', 'assigned_to': [self.bob.pk]}
+                for i in range(3)
+            ],
+            created_by=self.alice,
+        )
+        bulk_assign_tasks({tasks[0].pk: [self.alice.pk]}, self.alice)
+        self.assertEqual([user[0] for user in self.snapshot(created)], [self.alice.pk, self.bob.pk])
+        self.assertEqual([user[0] for user in self.snapshot(tasks[0])], [self.alice.pk])
+        self.assertEqual([user[0] for user in self.snapshot(tasks[1])], [self.bob.pk])
+        self.assertEqual(snapshot_drift(), [])
+
+        response = client.get(reverse('task-list') + '?expand=assigned_to')
+        self.assertEqual(response.data['results'][-1]['assigned_to'][0]['username'], 'bob')
+
+    def test_user_changes(self):
+        self.task.assigned_to.set([self.alice, self.bob])
+        self.bob.username = 'robert'
+        self.bob.save()
+        self.assertEqual(self.snapshot()[1][1], 'robert')
+        with self.assertNumQueries(1):
+            self.bob.save(update_fields=['last_login'])
+        self.bob.delete()
+        self.assertEqual([user[0] for user in self.snapshot()], [self.alice.pk])
+        self.assertEqual(snapshot_drift(), [])
+
+    def test_command_repairs_drift(self):
+        other = Task.objects.create(name='Other', description='x', created_by=self.alice)
+        self.task.assigned_to.set([self.bob])
+        Task.objects.filter(pk=self.task.pk).update(assignee_snapshot=None)
+        stale = [[self.bob.pk, 'bob', '', '', '']]
+        Task.objects.filter(pk=other.pk).update(assignee_snapshot=stale)
+        message = f'2 task assignee snapshot(s) drifted: {self.task.pk}, {other.pk}'
+        with self.assertRaisesMessage(CommandError, message):
+            call_command('rebuild_assignee_snapshots', verify=True, stdout=StringIO())
+        out = StringIO()
+        call_command('rebuild_assignee_snapshots', batch_size=1, stdout=out)
+        self.assertIn('Rebuilt 2 task assignee snapshot(s).', out.getvalue())
+        call_command('rebuild_assignee_snapshots', verify=True, stdout=out)
+        self.assertEqual(self.snapshot(other), [])
@@ -0,0 +1,198 @@
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..archive import archive_tasks
+from ..models import Task, TaskSummary, UserTaskSummary
+from ..services import bulk_assign_tasks, bulk_create_tasks, bulk_delete_tasks, bulk_set_status
+from ..stats import (
+    compute_summary, compute_user_summary, stored_summary, stored_user_summary, summary_drift,
+    user_summary_drift,
+)
+
+
+class TaskSummaryTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='counter')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def assert_exact(self):
+        self.assertEqual(+stored_summary(), +compute_summary())
+
+    def test_save_paths(self):
+        task = Task.objects.create(
+            name='Counted', description='x', task_type='testing', created_by=self.user
+        )
+        self.assertEqual(stored_summary()[('pending', 'testing')], 1)
+
+        task.status = 'in_progress'
+        task.save()
+        stale = Task.objects.get(pk=task.pk)
+        task.status = 'completed'
+        task.save()
+        # A stale in-memory copy still moves the right bucket.
+        stale.task_type = 'deployment'
+        stale.save()
+        self.assertEqual(stored_summary()[('in_progress', 'deployment')], 1)
+        self.assert_exact()
+
+        Task.objects.create(
+            name='Odd type', description='x', task_type='Development', created_by=self.user
+        )
+        task.delete()
+        self.assert_exact()
+
+    def test_cascading_and_queryset_deletes(self):
+        other = User.objects.create(username='other')
+        for i in range(3):
+            Task.objects.create(name=f'Task {i}', description='x', created_by=other)
+        Task.objects.create(name='Keep', description='x', created_by=self.user)
+        Task.objects.filter(name='Task 0').delete()
+        other.delete()
+        self.assertEqual(stored_summary()[('pending', 'other')], 1)
+        self.assert_exact()
+
+    def test_bulk_paths(self):
+        tasks = bulk_create_tasks(
+            [
+                {
+                    'name': f'Bulk {i}', 'description': 'x', 'status': 'completed',
+                    'task_type': 'testing',
+                }
+                for i in range(5)
+            ],
+            created_by=self.user,
+        )
+        self.assertEqual(stored_summary()[('completed', 'testing')], 5)
+        bulk_delete_tasks([task.id for task in tasks[:2]], self.user)
+        self.assertEqual(stored_summary()[('completed', 'testing')], 3)
+        self.assert_exact()
+
+    def test_endpoint_reads_only_the_summary_table(self):
+        Task.objects.create(name='One', description='x', task_type='testing', created_by=self.user)
+        Task.objects.create(name='Two', description='x', status='completed', created_by=self.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('task-stats'))
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['by_status']['completed'], 1)
+        self.assertEqual(response.data['by_task_type']['testing'], 1)
+        self.assertEqual(len(response.data['counts']), 15)
+
+    def test_rebuild_and_verify_command(self):
+        Task.objects.create(name='One', description='x', created_by=self.user)
+        call_command('rebuild_task_stats', '--verify', stdout=StringIO())
+
+        TaskSummary.objects.filter(status='pending', task_type='other').update(count=42)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_stats', '--verify', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_task_stats', stdout=out)
+        self.assertIn('stored 42, actual 1', out.getvalue())
+        self.assertEqual(summary_drift(), {})
+
+
+class UserTaskSummaryTest(APITestCase):
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.alice)
+
+    def create(self, name, **fields):
+        return Task.objects.create(name=name, description='x', created_by=self.alice, **fields)
+
+    def assert_exact(self):
+        self.assertEqual(+stored_user_summary(), +compute_user_summary())
+
+    def counts(self, user):
+        return +Counter({
+            task_status: count
+            for (user_id, task_status), count in stored_user_summary().items()
+            if user_id == user.pk
+        })
+
+    def test_save_and_assignment_paths(self):
+        task = Task.objects.create(name='Inbox', description='x', created_by=self.alice)
+        other = self.create('Other', status='completed')
+        task.assigned_to.add(self.alice, self.bob)
+        self.bob.assigned_tasks.add(other)
+        self.assertEqual(self.counts(self.bob), {'pending': 1, 'completed': 1})
+
+        stale = Task.objects.get(pk=task.pk)
+        task.status = 'in_progress'
+        task.save()
+        self.assertEqual(self.counts(self.alice), {'in_progress': 1})
+        # Saving a stale copy writes its old status back; the counters follow.
+        stale.save()
+        self.assertEqual(self.counts(self.alice), {'pending': 1})
+
+        task.assigned_to.remove(self.alice)
+        self.bob.assigned_tasks.clear()
+        self.assertEqual(self.counts(self.bob), {})
+        task.assigned_to.set([self.alice, self.bob])
+        task.assigned_to.clear()
+        other.assigned_to.add(self.alice)
+        other.delete()
+        self.assertEqual(self.counts(self.alice), {})
+        self.assert_exact()
+
+    def test_bulk_archive_and_cascade_paths(self):
+        tasks = bulk_create_tasks(
+            [
+                {'name': f'Bulk {i}', 'description': 'x', 'assigned_to': [self.bob.pk]}
+                for i in range(4)
+            ],
+            created_by=self.alice,
+        )
+        ids = [task.pk for task in tasks]
+        bulk_assign_tasks(
+            {ids[0]: [self.alice.pk], ids[1]: [self.alice.pk, self.bob.pk]}, self.alice
+        )
+        bulk_set_status(ids[:3], 'completed')
+        self.assertEqual(self.counts(self.bob), {'completed': 2, 'pending': 1})
+        bulk_delete_tasks([ids[3]], self.alice)
+        self.assertEqual(self.counts(self.alice), {'completed': 2})
+
+        archive_tasks(older_than=timedelta(0))
+        self.assertEqual(self.counts(self.alice), {'completed': 2})
+        self.assert_exact()
+        self.alice.delete()
+        self.assertEqual(self.counts(self.bob), {})
+        self.assertEqual(+stored_user_summary(), {})
+        self.assert_exact()
+
+    def test_endpoint_reads_one_user(self):
+        self.create('One').assigned_to.add(self.bob)
+        done = self.create('Two', status='completed')
+        done.assigned_to.add(self.bob, self.alice)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('user-tasks-summary', args=[self.bob.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'user': self.bob.pk, 'total': 2, 'open': 1,
+            'by_status': {'pending': 1, 'in_progress': 0, 'completed': 1},
+        })
+        response = self.client.get(reverse('user-tasks-summary', args=[0]))
+        self.assertEqual(response.data['total'], 0)
+
+    def test_command_covers_user_counters(self):
+        self.create('One').assigned_to.add(self.bob)
+        UserTaskSummary.objects.filter(user=self.bob).update(count=5)
+        UserTaskSummary.objects.create(user=self.alice, status='completed', count=1)
+        message = '0 task summary bucket(s) and 2 user counter(s) drifted'
+        with self.assertRaisesMessage(CommandError, message):
+            call_command('rebuild_task_stats', '--verify', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_task_stats', stdout=out)
+        self.assertIn(f'user {self.bob.pk} pending: stored 5, actual 1', out.getvalue())
+        self.assertEqual(user_summary_drift(), {})
@@ -0,0 +1,75 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ..models import Task
+
+
+class UserNameTaskListTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(username='owner')
+        self.worker = User.objects.create(username='worker')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.tasks = []
+        for i in range(12):
+            task = Task.objects.create(name=f'Task {i}', description='x', created_by=self.owner)
+            task.assigned_to.add(self.worker)
+            self.tasks.append(task)
+        self.newest_first = [task.pk for task in reversed(self.tasks)]
+        self.url = reverse('user-tasks-by-username', args=['worker'])
+
+    def test_pages_without_a_user_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual([task['id'] for task in response.data['results']], self.newest_first[:10])
+        self.assertIsNotNone(response.data['next'])
+        # ETag aggregate, page count and page rows.
+        self.assertEqual(len(queries), 3)
+        self.assertFalse(any(
+            query['sql'].startswith('SELECT') and 'FROM "auth_user"' in query['sql']
+            and 'tasks_task' not in query['sql'] for query in queries
+        ))
+
+        response = self.client.get(self.url + '?pagination=cursor')
+        self.assertEqual([task['id'] for task in response.data['results']], self.newest_first[:10])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([task['id'] for task in response.data['results']], self.newest_first[10:])
+
+    def test_unknown_and_idle_users(self):
+        response = self.client.get(reverse('user-tasks-by-username', args=['nobody']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error']['code'], 'user_not_found')
+        response = self.client.get(reverse('user-tasks-by-username', args=['owner']))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    @override_settings(TASKS_BULK_BATCH_SIZE=5)
+    def test_stream(self):
+        # One query, read and rendered in chunks of five.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url + '?stream=true&fields=id,assigned_to')
+            self.assertTrue(response.streaming)
+            data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual([task['id'] for task in data], self.newest_first)
+        self.assertEqual(data[0], {'id': self.newest_first[0], 'assigned_to': [self.worker.pk]})
+
+        response = self.client.get(reverse('user-tasks-by-username', args=['owner']) + '?stream=1')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
+        url = reverse('user-tasks-by-username', args=['nobody'])
+        response = self.client.get(url + '?stream=true')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url + '?stream=maybe')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('stream', response.data['error']['details'])
@@ -92,6 +92,9 @@ class TaskAPITest(APITestCase):
         
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['assigned_to'], [self.user2.id])
+
+        response = self.client.post(url + '?expand=assigned_to', data, format='json')
         self.assertEqual(len(response.data['assigned_to']), 1)
         self.assertEqual(response.data['assigned_to'][0]['id'], self.user2.id)
 
@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api.views import TaskViewSet, UserTaskViewSet, UserNameTaskList
+from .api.async_views import async_read_urlpatterns
+from .api.views import TaskCacheStats, TaskViewSet, UserTaskViewSet, UserNameTaskList
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
@@ -10,4 +12,10 @@ urlpatterns = [
     path('', include(router.urls)),
     # Username-based tasks endpoint for convenience: /api/users/<username>/tasks/
     path('users/<str:username>/tasks/', UserNameTaskList.as_view(), name='user-tasks-by-username'),
-] 
\ No newline at end of file
+    path('cache/stats/', TaskCacheStats.as_view(), name='task-cache-stats'),
+]
+
+if settings.TASKS_ASYNC_VIEWS:
+    # ASGI deployments: GET/HEAD on the task read paths are served by native
+    # async views; other methods still reach the views above.
+    urlpatterns = async_read_urlpatterns(router.urls + urlpatterns[1:])
@@ -0,0 +1,208 @@
+"""
+Authentication with an in-process cache of verified credentials.
+
+``TokenAuthentication`` costs a token/user query and ``BasicAuthentication``
+a full password hash on every request; session requests load the user on
+every request too. The classes here remember the user each verified
+credential resolved to, in a bounded LRU with a TTL per entry:
+
+* tokens by key, with the token itself,
+* Basic credentials by an HMAC digest of username and password (the
+  password itself is never kept),
+* session users by primary key, through ``CachedModelBackend``.
+
+Entries are dropped when the user is saved or deleted (password changes and
+deactivation included) or one of their tokens is deleted. Each process has
+its own cache, so the change is also published as a per-user generation in
+the Django cache, which every hit is checked against. Other processes only
+see it if that cache is shared; with a per-process one (the local memory
+default) they keep accepting the old credentials until their entries
+expire. The cache is therefore off unless ``TASKS_AUTH_CACHE_TIMEOUT`` is
+set, which should go with a shared ``CACHE_BACKEND``.
+"""
+import copy
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import BasicAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULT_AUTH_CACHE_SIZE = 10000
+DEFAULT_AUTH_CACHE_TIMEOUT = 0
+
+AUTH_GENERATION_KEY = 'tasks:auth:gen:{}'
+
+
+def _user_generation(user_id):
+    return cache.get(AUTH_GENERATION_KEY.format(user_id))
+
+
+def _bump_user_generation(user_id):
+    key = AUTH_GENERATION_KEY.format(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+class AuthCache:
+    """Thread-safe LRU of ``key -> (user, auth)`` with a TTL per entry."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return getattr(settings, 'TASKS_AUTH_CACHE_SIZE', DEFAULT_AUTH_CACHE_SIZE)
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'TASKS_AUTH_CACHE_TIMEOUT', DEFAULT_AUTH_CACHE_TIMEOUT)
+
+    def get(self, key):
+        """Return copies of the cached ``(user, auth)`` for ``key``, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user, auth, generation = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        if _user_generation(user.pk) != generation:
+            self.invalidate_user(user.pk)
+            return None
+        # Requests may set attributes on these; never share the instances.
+        return copy.copy(user), copy.copy(auth)
+
+    def set(self, key, user, auth, generation):
+        """
+        Remember ``(user, auth)`` under ``key``. ``generation`` is the user's
+        generation read before the credential was verified, so a change
+        committed in between leaves the entry stale instead of current.
+        """
+        timeout = self.timeout
+        if not timeout:
+            return
+        entry = (time.monotonic() + timeout, user, auth, generation)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[1].pk == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+auth_cache = AuthCache()
+
+
+def invalidate_user(user_id):
+    """Forget cached credentials of ``user_id`` in every process, now and on commit."""
+    def invalidate():
+        auth_cache.invalidate_user(user_id)
+        _bump_user_generation(user_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+def _authenticate(key, find_user_id, verify):
+    """
+    Return the cached ``(user, auth)`` for ``key`` or ``verify()`` and cache it.
+    ``find_user_id()`` names the user the credential belongs to without
+    verifying it, so their generation can be read first.
+    """
+    cached = auth_cache.get(key)
+    if cached is not None:
+        return cached
+    if not auth_cache.timeout:
+        return verify()
+    user_id = find_user_id()
+    generation = _user_generation(user_id)
+    user, auth = verify()
+    if user.pk == user_id:
+        auth_cache.set(key, user, auth, generation)
+    return user, auth
+
+
+def _credentials_digest(username, password):
+    message = f'{username}\0{password}'.encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that skips the token query for recently seen keys."""
+
+    def authenticate_credentials(self, key):
+        tokens = self.get_model().objects.filter(key=key)
+        verify = super().authenticate_credentials
+        return _authenticate(
+            ('token', key),
+            lambda: tokens.values_list('user_id', flat=True).first(),
+            lambda: verify(key),
+        )
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """``BasicAuthentication`` that only hashes a password once per cache entry."""
+
+    def authenticate_credentials(self, userid, password, request=None):
+        users = User.objects.filter(**{User.USERNAME_FIELD: userid})
+        verify = super().authenticate_credentials
+        return _authenticate(
+            ('basic', _credentials_digest(userid, password)),
+            lambda: users.values_list('pk', flat=True).first(),
+            lambda: verify(userid, password, request),
+        )
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` whose per-request session user lookup is cached."""
+
+    def get_user(self, user_id):
+        key = ('user', str(user_id))
+        cached = auth_cache.get(key)
+        if cached is not None:
+            return cached[0]
+        generation = _user_generation(user_id) if auth_cache.timeout else None
+        user = super().get_user(user_id)
+        if user is not None:
+            auth_cache.set(key, user, None, generation)
+        return user
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached check depends on.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Token)
+def _credentials_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.pk if sender is User else instance.user_id)
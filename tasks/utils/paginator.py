@@ -0,0 +1,65 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+DEFAULT_ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+def estimated_count(queryset):
+    """
+    Planner row estimate for ``queryset``, or ``None`` when the backend
+    cannot give one cheaply.
+
+    PostgreSQL estimates any query through ``EXPLAIN``. SQLite only knows
+    the size of whole tables, from the ``sqlite_stat1`` data gathered by
+    ``ANALYZE``, so filtered querysets get ``None`` there.
+    """
+    connection = connections[queryset.db]
+    queryset = queryset.order_by().values('pk')
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+    if connection.vendor == 'sqlite' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            try:
+                # The first number of each stat is the row count of the
+                # table (idx NULL) or of one of its indexes.
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s ORDER BY idx IS NOT NULL LIMIT 1',
+                    [queryset.model._meta.db_table],
+                )
+            except DatabaseError:
+                # sqlite_stat1 only exists once ANALYZE has run.
+                return None
+            row = cursor.fetchone()
+        return int(row[0].split()[0]) if row else None
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's estimate for large result sets.
+
+    An exact ``COUNT(*)`` is only run when the estimate is unavailable or at
+    most ``TASKS_ESTIMATED_COUNT_THRESHOLD`` rows, where counting is cheap.
+    Page numbers near the end may then be approximate.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = getattr(
+            settings, 'TASKS_ESTIMATED_COUNT_THRESHOLD', DEFAULT_ESTIMATED_COUNT_THRESHOLD
+        )
+        if hasattr(self.object_list, 'query'):
+            estimate = estimated_count(self.object_list)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count